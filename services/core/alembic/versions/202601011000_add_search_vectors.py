@@ -0,0 +1,49 @@
+"""add full-text search vectors
+
+Revision ID: 202601011000
+Revises: 202601010900
+Create Date: 2026-01-01 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "202601011000"
+down_revision = "202601010900"
+branch_labels = None
+depends_on = None
+
+
+SEARCH_COLUMNS = (
+    ("study_session_notes", "note"),
+    ("study_passage_comments", "comment"),
+    ("study_question_responses", "response"),
+    ("study_passages", "text"),
+)
+
+
+def upgrade() -> None:
+    for table, column in SEARCH_COLUMNS:
+        op.add_column(
+            table,
+            sa.Column(
+                "search_vector",
+                postgresql.TSVECTOR(),
+                sa.Computed(f"to_tsvector('english', coalesce({column}, ''))", persisted=True),
+                nullable=True,
+            ),
+        )
+        op.create_index(
+            f"ix_{table}_search_vector",
+            table,
+            ["search_vector"],
+            postgresql_using="gin",
+        )
+
+
+def downgrade() -> None:
+    for table, _column in reversed(SEARCH_COLUMNS):
+        op.drop_index(f"ix_{table}_search_vector", table_name=table)
+        op.drop_column(table, "search_vector")
@@ -0,0 +1,34 @@
+"""add note listing indexes
+
+Revision ID: 202601011100
+Revises: 202601011000
+Create Date: 2026-01-01 11:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "202601011100"
+down_revision = "202601011000"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Both indexes end in (created_at, id) so newest-first keyset pages are a
+    # backward index scan with no sort.
+    op.create_index(
+        "ix_study_session_notes_group_created",
+        "study_session_notes",
+        ["group_id", "created_at", "id"],
+    )
+    op.create_index(
+        "ix_study_session_notes_session_created",
+        "study_session_notes",
+        ["session_id", "group_id", "created_at", "id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_study_session_notes_session_created", table_name="study_session_notes")
+    op.drop_index("ix_study_session_notes_group_created", table_name="study_session_notes")
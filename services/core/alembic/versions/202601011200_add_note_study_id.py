@@ -0,0 +1,53 @@
+"""denormalize study_id onto session notes
+
+Revision ID: 202601011200
+Revises: 202601011100
+Create Date: 2026-01-01 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "202601011200"
+down_revision = "202601011100"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "study_session_notes",
+        sa.Column("study_id", postgresql.UUID(as_uuid=True), nullable=True),
+    )
+    op.execute(
+        """
+        UPDATE study_session_notes AS n
+        SET study_id = s.study_id
+        FROM study_sessions AS s
+        WHERE s.id = n.session_id
+        """
+    )
+    op.alter_column("study_session_notes", "study_id", nullable=False)
+    op.create_foreign_key(
+        "fk_session_notes_study",
+        "study_session_notes",
+        "studies",
+        ["study_id"],
+        ["id"],
+        ondelete="CASCADE",
+    )
+    # study_sessions.study_id lookups are already served by the leading column
+    # of uq_study_session_position, so only the notes side needs an index.
+    op.create_index(
+        "ix_study_session_notes_study_created",
+        "study_session_notes",
+        ["study_id", "group_id", "created_at", "id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_study_session_notes_study_created", table_name="study_session_notes")
+    op.drop_constraint("fk_session_notes_study", "study_session_notes", type_="foreignkey")
+    op.drop_column("study_session_notes", "study_id")
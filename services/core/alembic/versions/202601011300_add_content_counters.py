@@ -0,0 +1,80 @@
+"""add content counters
+
+Revision ID: 202601011300
+Revises: 202601011200
+Create Date: 2026-01-01 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "202601011300"
+down_revision = "202601011200"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "content_counters",
+        sa.Column(
+            "group_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("groups.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("scope", sa.String(length=16), nullable=False),
+        sa.Column("scope_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("kind", sa.String(length=16), nullable=False),
+        sa.Column("study_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("count", sa.BigInteger(), nullable=False, server_default=sa.text("0")),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("group_id", "scope", "scope_id", "kind"),
+    )
+    op.create_index(
+        "ix_content_counters_group_study",
+        "content_counters",
+        ["group_id", "study_id"],
+    )
+
+    # Initial backfill; jobs.reconcile_counters repeats this on demand.
+    op.execute(
+        """
+        INSERT INTO content_counters (group_id, scope, scope_id, kind, study_id, count)
+        SELECT group_id, 'group', group_id, 'members', NULL, count(*)
+        FROM group_members GROUP BY group_id
+        UNION ALL
+        SELECT group_id, 'session', session_id, 'notes', study_id, count(*)
+        FROM study_session_notes GROUP BY group_id, session_id, study_id
+        UNION ALL
+        SELECT c.group_id, 'passage', c.passage_id, 'comments', s.study_id, count(*)
+        FROM study_passage_comments AS c
+        JOIN study_passages AS p ON p.id = c.passage_id
+        JOIN study_sessions AS s ON s.id = p.session_id
+        GROUP BY c.group_id, c.passage_id, s.study_id
+        UNION ALL
+        SELECT l.group_id, 'passage', l.passage_id, 'likes', s.study_id, count(*)
+        FROM study_passage_likes AS l
+        JOIN study_passages AS p ON p.id = l.passage_id
+        JOIN study_sessions AS s ON s.id = p.session_id
+        GROUP BY l.group_id, l.passage_id, s.study_id
+        UNION ALL
+        SELECT r.group_id, 'question', r.question_id, 'responses', s.study_id, count(*)
+        FROM study_question_responses AS r
+        JOIN study_questions AS q ON q.id = r.question_id
+        JOIN study_sessions AS s ON s.id = q.session_id
+        GROUP BY r.group_id, r.question_id, s.study_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_content_counters_group_study", table_name="content_counters")
+    op.drop_table("content_counters")
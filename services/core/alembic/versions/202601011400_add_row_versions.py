@@ -0,0 +1,36 @@
+"""add row_version for optimistic concurrency
+
+Revision ID: 202601011400
+Revises: 202601011300
+Create Date: 2026-01-01 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "202601011400"
+down_revision = "202601011300"
+branch_labels = None
+depends_on = None
+
+
+VERSIONED_TABLES = (
+    "study_session_notes",
+    "study_passage_comments",
+    "study_question_responses",
+    "study_passages",
+)
+
+
+def upgrade() -> None:
+    for table in VERSIONED_TABLES:
+        op.add_column(
+            table,
+            sa.Column("row_version", sa.Integer(), nullable=False, server_default=sa.text("1")),
+        )
+
+
+def downgrade() -> None:
+    for table in reversed(VERSIONED_TABLES):
+        op.drop_column(table, "row_version")
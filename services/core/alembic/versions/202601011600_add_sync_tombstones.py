@@ -0,0 +1,99 @@
+"""add sync tombstones
+
+Revision ID: 202601011600
+Revises: 202601011500
+Create Date: 2026-01-01 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "202601011600"
+down_revision = "202601011500"
+branch_labels = None
+depends_on = None
+
+# table -> entity name reported to sync clients
+SYNCED_TABLES = {
+    "study_session_notes": "note",
+    "study_passage_comments": "comment",
+    "study_passage_likes": "like",
+    "study_question_responses": "response",
+}
+
+
+def upgrade() -> None:
+    op.create_table(
+        "sync_tombstones",
+        sa.Column("id", sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column("group_session_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("entity", sa.String(length=16), nullable=False),
+        sa.Column("entity_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column(
+            "deleted_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_sync_tombstones_group_session_deleted",
+        "sync_tombstones",
+        ["group_session_id", "deleted_at"],
+    )
+
+    # A trigger rather than application code so cascaded deletes are recorded too.
+    op.execute(
+        """
+        CREATE FUNCTION record_sync_tombstone() RETURNS trigger AS $$
+        BEGIN
+            IF OLD.group_session_id IS NOT NULL THEN
+                INSERT INTO sync_tombstones (group_session_id, entity, entity_id)
+                VALUES (OLD.group_session_id, TG_ARGV[0], OLD.id);
+            END IF;
+            RETURN OLD;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    for table, entity in SYNCED_TABLES.items():
+        op.execute(
+            f"CREATE TRIGGER {table}_sync_tombstone AFTER DELETE ON {table} "
+            f"FOR EACH ROW EXECUTE FUNCTION record_sync_tombstone('{entity}')"
+        )
+
+    op.create_index(
+        "ix_study_session_notes_group_session_updated",
+        "study_session_notes",
+        ["group_session_id", "updated_at"],
+    )
+    op.create_index(
+        "ix_study_passage_comments_group_session_updated",
+        "study_passage_comments",
+        ["group_session_id", "updated_at"],
+    )
+    op.create_index(
+        "ix_study_question_responses_group_session_updated",
+        "study_question_responses",
+        ["group_session_id", "updated_at"],
+    )
+    op.create_index(
+        "ix_study_passage_likes_group_session_created",
+        "study_passage_likes",
+        ["group_session_id", "created_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_study_passage_likes_group_session_created", table_name="study_passage_likes")
+    op.drop_index("ix_study_question_responses_group_session_updated", table_name="study_question_responses")
+    op.drop_index("ix_study_passage_comments_group_session_updated", table_name="study_passage_comments")
+    op.drop_index("ix_study_session_notes_group_session_updated", table_name="study_session_notes")
+    for table in SYNCED_TABLES:
+        op.execute(f"DROP TRIGGER {table}_sync_tombstone ON {table}")
+    op.execute("DROP FUNCTION record_sync_tombstone()")
+    op.drop_index("ix_sync_tombstones_group_session_deleted", table_name="sync_tombstones")
+    op.drop_table("sync_tombstones")
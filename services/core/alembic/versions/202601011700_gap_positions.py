@@ -0,0 +1,67 @@
+"""space session and question positions apart
+
+Revision ID: 202601011700
+Revises: 202601011600
+Create Date: 2026-01-01 17:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "202601011700"
+down_revision = "202601011600"
+branch_labels = None
+depends_on = None
+
+POSITION_GAP = 1024
+
+
+def upgrade() -> None:
+    # Deferrable (checked at the end of each statement) so a single UPDATE
+    # can swap or renumber positions.
+    op.drop_constraint("uq_study_session_position", "study_sessions", type_="unique")
+    op.create_unique_constraint(
+        "uq_study_session_position",
+        "study_sessions",
+        ["study_id", "position"],
+        deferrable=True,
+        initially="IMMEDIATE",
+    )
+    op.execute(
+        f"""
+        UPDATE study_sessions AS s SET position = ranked.position
+        FROM (
+            SELECT id, row_number() OVER (PARTITION BY study_id ORDER BY position, created_at) * {POSITION_GAP}
+                AS position
+            FROM study_sessions
+        ) AS ranked
+        WHERE s.id = ranked.id
+        """
+    )
+    op.execute(
+        f"""
+        UPDATE study_questions AS q SET position = ranked.position
+        FROM (
+            SELECT id, row_number() OVER (PARTITION BY session_id ORDER BY position, created_at) * {POSITION_GAP}
+                AS position
+            FROM study_questions
+        ) AS ranked
+        WHERE q.id = ranked.id
+        """
+    )
+
+
+def downgrade() -> None:
+    for table, parent in (("study_sessions", "study_id"), ("study_questions", "session_id")):
+        op.execute(
+            f"""
+            UPDATE {table} AS t SET position = ranked.position
+            FROM (
+                SELECT id, row_number() OVER (PARTITION BY {parent} ORDER BY position, created_at) AS position
+                FROM {table}
+            ) AS ranked
+            WHERE t.id = ranked.id
+            """
+        )
+    op.drop_constraint("uq_study_session_position", "study_sessions", type_="unique")
+    op.create_unique_constraint("uq_study_session_position", "study_sessions", ["study_id", "position"])
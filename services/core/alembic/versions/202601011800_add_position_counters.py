@@ -0,0 +1,39 @@
+"""add position counters
+
+Revision ID: 202601011800
+Revises: 202601011700
+Create Date: 2026-01-01 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "202601011800"
+down_revision = "202601011700"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Rows are created by the first append under each parent, starting from
+    # its current max(position), so existing data needs no backfill.
+    op.create_table(
+        "position_counters",
+        sa.Column("scope", sa.String(length=32), nullable=False),
+        sa.Column("scope_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("last_position", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("scope", "scope_id"),
+    )
+    # Sessions already have (study_id, position) through uq_study_session_position.
+    op.create_index(
+        "ix_study_questions_session_position",
+        "study_questions",
+        ["session_id", "position"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_study_questions_session_position", table_name="study_questions")
+    op.drop_table("position_counters")
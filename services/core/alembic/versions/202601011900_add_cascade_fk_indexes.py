@@ -0,0 +1,43 @@
+"""index foreign keys followed by cascading deletes
+
+Revision ID: 202601011900
+Revises: 202601011800
+Create Date: 2026-01-01 19:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "202601011900"
+down_revision = "202601011800"
+branch_labels = None
+depends_on = None
+
+# ON DELETE CASCADE finds the child rows of each deleted parent by its
+# foreign key column; without an index leading with that column every
+# parent costs a sequential scan of the child table. Deleting a response
+# with replies is the worst case since the table cascades into itself.
+INDEXES = (
+    ("ix_studies_group", "studies", ["group_id"]),
+    ("ix_study_passages_session", "study_passages", ["session_id"]),
+    ("ix_study_passage_comments_passage", "study_passage_comments", ["passage_id"]),
+    ("ix_group_studies_study", "group_studies", ["study_id"]),
+    ("ix_group_sessions_study_session", "group_sessions", ["study_session_id"]),
+)
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns)
+    op.create_index(
+        "ix_study_question_responses_parent",
+        "study_question_responses",
+        ["parent_response_id"],
+        postgresql_where="parent_response_id IS NOT NULL",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_study_question_responses_parent", table_name="study_question_responses")
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,86 @@
+"""soft delete notes, comments and responses
+
+Revision ID: 202601012000
+Revises: 202601011900
+Create Date: 2026-01-01 20:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "202601012000"
+down_revision = "202601011900"
+branch_labels = None
+depends_on = None
+
+SOFT_DELETED_TABLES = ("study_session_notes", "study_passage_comments", "study_question_responses")
+
+LIVE = "deleted_at IS NULL"
+
+
+def upgrade() -> None:
+    for table in SOFT_DELETED_TABLES:
+        op.add_column(table, sa.Column("deleted_at", sa.DateTime(timezone=True), nullable=True))
+        # Small: only rows waiting for the purge worker are in it.
+        op.create_index(
+            f"ix_{table}_deleted",
+            table,
+            ["deleted_at"],
+            postgresql_where="deleted_at IS NOT NULL",
+        )
+
+    # Hot read paths skip soft-deleted rows. Indexes that foreign key
+    # cascades rely on (session_id, study_id, passage_id, question_id) stay
+    # complete, since a cascade must find deleted rows too.
+    op.drop_index("ix_study_session_notes_group_created", table_name="study_session_notes")
+    op.create_index(
+        "ix_study_session_notes_group_created",
+        "study_session_notes",
+        ["group_id", "created_at", "id"],
+        postgresql_where=LIVE,
+    )
+    op.create_index(
+        "ix_study_passage_comments_passage_live",
+        "study_passage_comments",
+        ["passage_id", "group_id"],
+        postgresql_where=LIVE,
+    )
+
+    # One reply per member and parent among live responses only, so a
+    # deleted reply can be written again. The constraint also served
+    # question_id lookups for the cascade from study_questions.
+    op.create_index("ix_study_question_responses_question", "study_question_responses", ["question_id"])
+    op.drop_constraint("uq_question_response", "study_question_responses", type_="unique")
+    op.create_index(
+        "uq_question_response",
+        "study_question_responses",
+        ["question_id", "group_id", "user_sub", "parent_response_id"],
+        unique=True,
+        postgresql_where=LIVE,
+    )
+
+
+def downgrade() -> None:
+    # Soft-deleted rows would reappear without the column.
+    for table in SOFT_DELETED_TABLES:
+        op.execute(f"DELETE FROM {table} WHERE deleted_at IS NOT NULL")
+
+    op.drop_index("uq_question_response", table_name="study_question_responses")
+    op.create_unique_constraint(
+        "uq_question_response",
+        "study_question_responses",
+        ["question_id", "group_id", "user_sub", "parent_response_id"],
+    )
+    op.drop_index("ix_study_question_responses_question", table_name="study_question_responses")
+    op.drop_index("ix_study_passage_comments_passage_live", table_name="study_passage_comments")
+    op.drop_index("ix_study_session_notes_group_created", table_name="study_session_notes")
+    op.create_index(
+        "ix_study_session_notes_group_created",
+        "study_session_notes",
+        ["group_id", "created_at", "id"],
+    )
+
+    for table in SOFT_DELETED_TABLES:
+        op.drop_index(f"ix_{table}_deleted", table_name=table)
+        op.drop_column(table, "deleted_at")
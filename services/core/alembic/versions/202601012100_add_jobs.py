@@ -0,0 +1,67 @@
+"""add jobs queue
+
+Revision ID: 202601012100
+Revises: 202601012000
+Create Date: 2026-01-01 21:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "202601012100"
+down_revision = "202601012000"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE TYPE job_status AS ENUM ('queued', 'running', 'succeeded', 'failed')")
+    op.create_table(
+        "jobs",
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("kind", sa.String(length=64), nullable=False),
+        sa.Column("payload", postgresql.JSONB(), nullable=False),
+        sa.Column(
+            "status",
+            postgresql.ENUM("queued", "running", "succeeded", "failed", name="job_status", create_type=False),
+            nullable=False,
+        ),
+        sa.Column("user_sub", sa.String(length=128), nullable=True),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("max_attempts", sa.Integer(), nullable=False),
+        sa.Column("run_after", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("locked_by", sa.String(length=128), nullable=True),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("result", postgresql.JSONB(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    # Finished jobs drop out of the index, so claiming stays cheap however
+    # much history the table keeps.
+    op.create_index(
+        "ix_jobs_claimable",
+        "jobs",
+        ["run_after"],
+        postgresql_where="status IN ('queued', 'running')",
+    )
+    op.create_index("ix_jobs_user_created", "jobs", ["user_sub", "created_at"])
+    op.create_index(
+        "ix_jobs_finished",
+        "jobs",
+        ["finished_at"],
+        postgresql_where="finished_at IS NOT NULL",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_jobs_finished", table_name="jobs")
+    op.drop_index("ix_jobs_user_created", table_name="jobs")
+    op.drop_index("ix_jobs_claimable", table_name="jobs")
+    op.drop_table("jobs")
+
+    job_status_enum = sa.Enum("queued", "running", "succeeded", "failed", name="job_status")
+    job_status_enum.drop(op.get_bind(), checkfirst=True)
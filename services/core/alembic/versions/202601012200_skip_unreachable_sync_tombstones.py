@@ -0,0 +1,62 @@
+"""skip unreachable sync tombstones
+
+Revision ID: 202601012200
+Revises: 202601012100
+Create Date: 2026-01-01 22:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "202601012200"
+down_revision = "202601012100"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Only record rows whose group session outlives the delete. A cascade from
+    # a study, session, group or group session has already removed that
+    # ancestor by the time the trigger fires, and no client can sync a group
+    # session that is gone. Batched deletes of a whole container drain the
+    # descendants first, so they set app.skip_sync_tombstones instead.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION record_sync_tombstone() RETURNS trigger AS $$
+        BEGIN
+            IF OLD.group_session_id IS NOT NULL
+                AND current_setting('app.skip_sync_tombstones', true) IS DISTINCT FROM 'on'
+                AND EXISTS (
+                    SELECT 1
+                    FROM group_sessions AS gs
+                    JOIN study_sessions AS ss ON ss.id = gs.study_session_id
+                    JOIN studies AS s ON s.id = ss.study_id
+                    JOIN group_studies AS gst ON gst.id = gs.group_study_id
+                    JOIN groups AS g ON g.id = gst.group_id
+                    WHERE gs.id = OLD.group_session_id
+                )
+            THEN
+                INSERT INTO sync_tombstones (group_session_id, entity, entity_id)
+                VALUES (OLD.group_session_id, TG_ARGV[0], OLD.id);
+            END IF;
+            RETURN OLD;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION record_sync_tombstone() RETURNS trigger AS $$
+        BEGIN
+            IF OLD.group_session_id IS NOT NULL THEN
+                INSERT INTO sync_tombstones (group_session_id, entity, entity_id)
+                VALUES (OLD.group_session_id, TG_ARGV[0], OLD.id);
+            END IF;
+            RETURN OLD;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
@@ -0,0 +1,130 @@
+"""Deleting studies with ~100k descendants.
+
+Seeds a few large studies (about 100k passages, questions, notes, comments,
+likes and responses each with the defaults), shows where the time of a
+cascading DELETE goes with EXPLAIN ANALYZE (one line per foreign key
+trigger; a slow one means an unindexed foreign key), then deletes half the
+studies with delete_study (one statement) and half with
+delete_study_in_batches. Neither may leave sync tombstones behind: the
+deleted rows' group sessions go with them, so no client could read them::
+
+    python -m benchmarks.cascade_delete --reset
+    python -m benchmarks.cascade_delete --reset --studies 6 --batch-size 2000
+"""
+import argparse
+import time
+
+from sqlalchemy import func, select, text
+
+from benchmarks.common import print_summary, summarize
+from benchmarks.seed import SeedConfig, reset_dataset, seed_dataset
+from db import SessionLocal, engine
+from models.group_member import GroupMember, GroupRole
+from models.study import Study
+from services.batched_deletes import DELETE_BATCH_SIZE, delete_study_in_batches
+from services.studies_service import delete_study
+
+DESCENDANT_TABLES = (
+    "study_sessions",
+    "study_passages",
+    "study_questions",
+    "study_session_notes",
+    "study_passage_comments",
+    "study_passage_likes",
+    "study_question_responses",
+    "group_sessions",
+)
+
+
+def _remaining_rows() -> int:
+    with engine.connect() as conn:
+        return sum(conn.execute(text(f"SELECT count(*) FROM {table}")).scalar() for table in DESCENDANT_TABLES)
+
+
+def _tombstones() -> int:
+    with engine.connect() as conn:
+        return conn.execute(text("SELECT count(*) FROM sync_tombstones")).scalar()
+
+
+def explain_delete(study_id) -> None:
+    """EXPLAIN ANALYZE the single-statement delete, then roll it back."""
+    with engine.connect() as conn:
+        with conn.begin() as transaction:
+            plan = conn.execute(
+                text("EXPLAIN (ANALYZE, FORMAT JSON) DELETE FROM studies WHERE id = :id"),
+                {"id": study_id},
+            ).scalar()
+            transaction.rollback()
+    print(f"DELETE FROM studies: {plan[0]['Execution Time']:.1f}ms")
+    for trigger in sorted(plan[0].get("Triggers", []), key=lambda t: t["Time"], reverse=True):
+        print(f"    {trigger['Trigger Name']:<60} calls={trigger['Calls']:>8} time={trigger['Time']:>10.1f}ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Cascading study delete benchmark")
+    parser.add_argument("--studies", type=int, default=4, help="large studies to seed and delete")
+    parser.add_argument("--batch-size", type=int, default=DELETE_BATCH_SIZE)
+    parser.add_argument("--reset", action="store_true", help="truncate benchmark tables first")
+    args = parser.parse_args()
+
+    if args.reset:
+        reset_dataset(engine)
+    config = SeedConfig(
+        groups=args.studies,
+        members_per_group=20,
+        groups_per_user=1,
+        studies_per_group=1,
+        sessions_per_study=25,
+        passages_per_session=4,
+        questions_per_session=8,
+        notes_per_session=400,
+        comments_per_passage=600,
+        likes_per_passage=20,
+        responses_per_question=20,
+        replies_per_response=2,
+        reply_depth=2,
+    )
+    existing = _remaining_rows()
+    seeded = seed_dataset(engine, config)
+    print(f"seeded {args.studies} studies, {(_remaining_rows() - existing) // args.studies} descendants each")
+
+    explain_delete(seeded.study_ids[0])
+
+    tombstones_before = _tombstones()
+
+    half = max(1, len(seeded.study_ids) // 2)
+    single, batched = seeded.study_ids[:half], seeded.study_ids[half:]
+    samples = []
+    for study_id in single:
+        with SessionLocal() as db:
+            leader = db.scalar(
+                select(GroupMember.user_sub)
+                .join(Study, Study.group_id == GroupMember.group_id)
+                .where(Study.id == study_id, GroupMember.role == GroupRole.LEADER)
+            )
+            started = time.perf_counter()
+            delete_study(db, study_id, leader)
+            samples.append((time.perf_counter() - started) * 1000)
+    print_summary("delete_study (one DELETE)", summarize(samples))
+
+    samples = []
+    for study_id in batched:
+        with SessionLocal() as db:
+            started = time.perf_counter()
+            delete_study_in_batches(db, study_id, args.batch_size)
+            samples.append((time.perf_counter() - started) * 1000)
+    print_summary(f"delete_study_in_batches ({args.batch_size})", summarize(samples))
+
+    with SessionLocal() as db:
+        left = db.scalar(select(func.count()).select_from(Study).where(Study.id.in_(seeded.study_ids)))
+    remaining = _remaining_rows() - existing
+    tombstones = _tombstones() - tombstones_before
+    print(f"studies left: {left}, descendant rows left: {remaining}, sync tombstones written: {tombstones}")
+    if left or remaining:
+        raise SystemExit("delete left rows behind")
+    if tombstones:
+        raise SystemExit("deleting whole studies wrote sync tombstones no client can read")
+
+
+if __name__ == "__main__":
+    main()
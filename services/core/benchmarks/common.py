@@ -0,0 +1,43 @@
+import math
+import statistics
+import time
+from collections.abc import Callable
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Nearest-rank percentile of `samples` (pct in 0-100)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def measure(fn: Callable[[], object], iterations: int, warmup: int = 5) -> list[float]:
+    """Call `fn` repeatedly and return the latency of each call in milliseconds."""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def summarize(samples: list[float]) -> dict[str, float]:
+    return {
+        "count": len(samples),
+        "mean_ms": round(statistics.fmean(samples), 3) if samples else 0.0,
+        "p50_ms": round(percentile(samples, 50), 3),
+        "p95_ms": round(percentile(samples, 95), 3),
+        "p99_ms": round(percentile(samples, 99), 3),
+    }
+
+
+def print_summary(name: str, summary: dict[str, float]) -> None:
+    print(
+        f"{name:<40} n={summary['count']:<6} mean={summary['mean_ms']:>9.3f}ms "
+        f"p50={summary['p50_ms']:>9.3f}ms p95={summary['p95_ms']:>9.3f}ms "
+        f"p99={summary['p99_ms']:>9.3f}ms"
+    )
@@ -0,0 +1,163 @@
+"""Bytes on the wire and CPU cost of response compression per route.
+
+Fetches every read endpoint of ``benchmarks.endpoints`` uncompressed for a
+sample of seeded fixtures, then compresses the bodies at several gzip levels
+and brotli qualities, reporting the mean body size and the CPU time per
+response. Each body is also fetched through the middleware with every
+encoding to show what clients actually receive with the configured settings::
+
+    python -m benchmarks.compression --fixtures 50
+    python -m benchmarks.compression --only passages --output compression.json
+"""
+import argparse
+import gzip
+import json
+import os
+import random
+import statistics
+import time
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+
+from fastapi.testclient import TestClient
+
+from benchmarks.endpoints import ENDPOINTS, Endpoint, Fixture, _load_fixtures, _stub_auth
+from main import app
+from middleware.compression import brotli
+
+GZIP_LEVELS = (1, 6, 9)
+BROTLI_QUALITIES = (1, 4, 6, 11)
+
+
+@dataclass
+class Setting:
+    encoding: str
+    level: int
+    mean_bytes: float
+    ratio: float
+    cpu_ms: float
+
+
+@dataclass
+class RouteResult:
+    name: str
+    responses: int
+    mean_raw_bytes: float
+    wire_bytes: dict[str, float]
+    settings: list[Setting]
+
+
+def _cpu_ms(fn: Callable[[bytes], bytes], bodies: list[bytes], rounds: int) -> float:
+    started = time.process_time()
+    for _ in range(rounds):
+        for body in bodies:
+            fn(body)
+    return (time.process_time() - started) * 1000 / (rounds * len(bodies))
+
+
+def _candidates() -> list[tuple[str, int, Callable[[bytes], bytes]]]:
+    candidates = [
+        ("gzip", level, lambda body, level=level: gzip.compress(body, level, mtime=0)) for level in GZIP_LEVELS
+    ]
+    if brotli is not None:
+        candidates += [
+            ("br", quality, lambda body, quality=quality: brotli.compress(body, quality=quality))
+            for quality in BROTLI_QUALITIES
+        ]
+    return candidates
+
+
+def _measure_route(
+    client: TestClient,
+    endpoint: Endpoint,
+    fixtures: list[Fixture],
+    auth_headers: Callable[[Fixture], dict[str, str]],
+    rounds: int,
+) -> RouteResult | None:
+    rng = random.Random(0)
+    bodies = []
+    wire: dict[str, list[int]] = {"identity": [], "gzip": [], "br": []}
+    for fixture in fixtures:
+        call = endpoint.build(fixture, rng)
+        for encoding in wire:
+            if encoding == "br" and brotli is None:
+                continue
+            # Raw reads skip httpx's decoding, so the length is what was sent.
+            with client.stream(
+                call.method,
+                call.url,
+                params=call.params,
+                headers={**auth_headers(fixture), "Accept-Encoding": encoding},
+            ) as response:
+                raw = b"".join(response.iter_raw())
+            if response.status_code >= 400:
+                break
+            wire[encoding].append(len(raw))
+            if encoding == "identity":
+                bodies.append(raw)
+    if not bodies:
+        return None
+
+    mean_raw = statistics.fmean(len(body) for body in bodies)
+    settings = []
+    for encoding, level, fn in _candidates():
+        mean_bytes = statistics.fmean(len(fn(body)) for body in bodies)
+        settings.append(
+            Setting(
+                encoding=encoding,
+                level=level,
+                mean_bytes=round(mean_bytes, 1),
+                ratio=round(mean_bytes / mean_raw, 3) if mean_raw else 1.0,
+                cpu_ms=round(_cpu_ms(fn, bodies, rounds), 4),
+            )
+        )
+    return RouteResult(
+        name=endpoint.name,
+        responses=len(bodies),
+        mean_raw_bytes=round(mean_raw, 1),
+        wire_bytes={encoding: round(statistics.fmean(sizes), 1) for encoding, sizes in wire.items() if sizes},
+        settings=settings,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Response compression benchmark")
+    parser.add_argument("--fixtures", type=int, default=50, help="seeded groups/sessions to sample")
+    parser.add_argument("--rounds", type=int, default=5, help="compression repetitions per body")
+    parser.add_argument("--only", action="append", help="substring of endpoint names to run")
+    parser.add_argument("--output", help="write results to this JSON file")
+    args = parser.parse_args()
+
+    os.environ["RATE_LIMIT_BACKEND"] = "off"
+    fixtures = _load_fixtures(args.fixtures)
+    auth_headers = _stub_auth()
+    endpoints = [
+        endpoint
+        for endpoint in ENDPOINTS
+        if not endpoint.writes and (not args.only or any(part in endpoint.name for part in args.only))
+    ]
+
+    results = []
+    with TestClient(app, raise_server_exceptions=False) as client:
+        for endpoint in endpoints:
+            result = _measure_route(client, endpoint, fixtures, auth_headers, args.rounds)
+            if result is None:
+                print(f"{endpoint.name:<48} no successful responses")
+                continue
+            results.append(result)
+            wire = " ".join(f"{encoding}={size:.0f}B" for encoding, size in result.wire_bytes.items())
+            print(f"{result.name:<48} raw={result.mean_raw_bytes:>9.0f}B wire: {wire}")
+            for setting in result.settings:
+                print(
+                    f"    {setting.encoding:<4} {setting.level:>2}  {setting.mean_bytes:>9.0f}B "
+                    f"ratio={setting.ratio:<6} cpu={setting.cpu_ms:.4f}ms"
+                )
+
+    if args.output:
+        with open(args.output, "w") as handle:
+            json.dump({"routes": [asdict(result) for result in results]}, handle, indent=2)
+        print(f"wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""Parallel appends and moves must never share a position.
+
+Creates a throwaway group, study and session, then has many threads append
+sessions to the study and questions to the session at the same time, each on
+its own connection. Every --move-every'th task instead moves an anchor session
+(or question) to the end, racing the appends for the next slot. Fails if any
+two siblings end up with the same position, and reports the per-task latency::
+
+    python -m benchmarks.concurrent_positions --workers 32 --creates 50
+    python -m benchmarks.concurrent_positions --legacy   # old max() + INSERT, for comparison
+"""
+import argparse
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.exc import IntegrityError
+
+from benchmarks.common import print_summary, summarize
+from db import SessionLocal
+from models.group import Group
+from models.group_member import GroupMember, GroupRole
+from models.position_counter import PositionCounter
+from models.study import Study
+from models.study_question import StudyQuestion
+from models.study_session import StudySession
+from services.positions import POSITION_GAP
+from services.study_questions_service import create_question, move_question
+from services.study_sessions_service import create_session, move_session
+
+LEADER = "bench-positions-leader"
+
+
+def _fixture() -> tuple[uuid.UUID, uuid.UUID, uuid.UUID, uuid.UUID]:
+    with SessionLocal() as db:
+        group = Group(name="position benchmark")
+        db.add(group)
+        db.flush()
+        db.add(GroupMember(group_id=group.id, user_sub=LEADER, role=GroupRole.LEADER))
+        study = Study(group_id=group.id, title="position benchmark")
+        db.add(study)
+        db.flush()
+        session = StudySession(study_id=study.id, title="anchor", position=POSITION_GAP)
+        db.add(session)
+        db.flush()
+        question = StudyQuestion(session_id=session.id, question="anchor", position=POSITION_GAP)
+        db.add(question)
+        db.commit()
+        return group.id, study.id, session.id, question.id
+
+
+def _last_sibling(db, model, parent_column, parent_id: uuid.UUID, item_id: uuid.UUID) -> uuid.UUID | None:
+    return db.scalar(
+        select(model.id)
+        .where(parent_column == parent_id, model.id != item_id)
+        .order_by(model.position.desc())
+        .limit(1)
+    )
+
+
+def _legacy_question(db, session_id: uuid.UUID, index: int) -> None:
+    position = (
+        db.scalar(
+            select(func.coalesce(func.max(StudyQuestion.position), 0)).where(StudyQuestion.session_id == session_id)
+        )
+        or 0
+    ) + POSITION_GAP
+    db.add(StudyQuestion(session_id=session_id, question=f"q{index}", position=position))
+    db.commit()
+
+
+def _run(create, total: int, workers: int) -> tuple[list[float], int]:
+    def one(index: int) -> tuple[float, bool]:
+        started = time.perf_counter()
+        with SessionLocal() as db:
+            try:
+                create(db, index)
+            except IntegrityError:
+                return (time.perf_counter() - started) * 1000, False
+        return (time.perf_counter() - started) * 1000, True
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        outcomes = list(pool.map(one, range(total)))
+    return [ms for ms, _ in outcomes], sum(1 for _, ok in outcomes if not ok)
+
+
+def _duplicates(db, model, parent_column, parent_id: uuid.UUID) -> int:
+    positions = (
+        select(model.position)
+        .where(parent_column == parent_id)
+        .group_by(model.position)
+        .having(func.count() > 1)
+        .subquery()
+    )
+    return db.scalar(select(func.count()).select_from(positions))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Concurrent position allocation check")
+    parser.add_argument("--workers", type=int, default=32, help="threads creating at the same time")
+    parser.add_argument("--creates", type=int, default=50, help="creates per worker and per kind")
+    parser.add_argument("--legacy", action="store_true", help="allocate questions with max() + INSERT instead")
+    parser.add_argument("--move-every", type=int, default=4, help="every Nth task moves an anchor to the end")
+    parser.add_argument("--keep", action="store_true", help="leave the benchmark group in place")
+    args = parser.parse_args()
+
+    group_id, study_id, session_id, question_id = _fixture()
+    total = args.workers * args.creates
+
+    def is_move(index: int) -> bool:
+        return bool(args.move_every) and index % args.move_every == 0
+
+    def session_task(db, index: int) -> None:
+        if is_move(index):
+            last = _last_sibling(db, StudySession, StudySession.study_id, study_id, session_id)
+            move_session(db, study_id, session_id, LEADER, last)
+        else:
+            create_session(db, study_id, f"s{index}", None, None, LEADER)
+
+    def question_task(db, index: int) -> None:
+        if is_move(index):
+            last = _last_sibling(db, StudyQuestion, StudyQuestion.session_id, session_id, question_id)
+            move_question(db, session_id, question_id, LEADER, last)
+        elif args.legacy:
+            _legacy_question(db, session_id, index)
+        else:
+            create_question(db, session_id, LEADER, f"q{index}", None)
+
+    try:
+        samples, failed = _run(session_task, total, args.workers)
+        print_summary("create/move session", summarize(samples))
+        samples, failed_questions = _run(question_task, total, args.workers)
+        print_summary(
+            "create (legacy)/move question" if args.legacy else "create/move question", summarize(samples)
+        )
+
+        with SessionLocal() as db:
+            session_dupes = _duplicates(db, StudySession, StudySession.study_id, study_id)
+            question_dupes = _duplicates(db, StudyQuestion, StudyQuestion.session_id, session_id)
+    finally:
+        if not args.keep:
+            with SessionLocal() as db:
+                db.execute(delete(Group).where(Group.id == group_id))
+                db.execute(delete(PositionCounter).where(PositionCounter.scope_id.in_([study_id, session_id])))
+                db.commit()
+
+    moves = sum(1 for index in range(total) if is_move(index))
+    print(
+        f"sessions:  {total - moves} creates, {moves} moves, {failed} rejected, "
+        f"{session_dupes} duplicated positions"
+    )
+    print(
+        f"questions: {total - moves} creates, {moves} moves, {failed_questions} rejected, "
+        f"{question_dupes} duplicated positions"
+    )
+    if failed or failed_questions or session_dupes or question_dupes:
+        raise SystemExit("position allocation is not safe under concurrency")
+
+
+if __name__ == "__main__":
+    main()
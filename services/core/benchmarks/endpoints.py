@@ -0,0 +1,514 @@
+"""Per-endpoint latency and throughput benchmark for the whole API.
+
+Seeds the synthetic dataset (optional), then drives every router in-process
+with authentication stubbed out: each request runs as the leader of a random
+seeded group against that group's studies, sessions, passages and questions.
+Results can be written as JSON and compared with an earlier run::
+
+    python -m benchmarks.endpoints --reset --groups 2000 --output before.json
+    python -m benchmarks.endpoints --skip-seed --output after.json --compare before.json
+
+With ``--real-auth`` requests carry RS256 tokens from the local Cognito
+stand-in instead, so token verification is part of every measurement.
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import time
+import uuid
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+
+from fastapi import Request
+from fastapi.testclient import TestClient
+from sqlalchemy import func, text
+
+from auth.cognito import cognito_auth_required
+from benchmarks.common import summarize
+from benchmarks.local_cognito import LocalCognito
+from benchmarks.seed import VOCABULARY, SeedConfig, reset_dataset, seed_dataset
+from db import SessionLocal, engine
+from main import app
+from models.job import Job, JobStatus
+from services.study_export import EXPORT_FORMATS, render_export
+
+_FIXTURES_SQL = """
+SELECT gm.user_sub, s.group_id, s.id AS study_id, ss.id AS session_id,
+       p.id AS passage_id, q.id AS question_id
+FROM group_members AS gm
+JOIN studies AS s ON s.group_id = gm.group_id
+JOIN study_sessions AS ss ON ss.study_id = s.id
+JOIN LATERAL (SELECT id FROM study_passages WHERE session_id = ss.id LIMIT 1) AS p ON true
+JOIN LATERAL (SELECT id FROM study_questions WHERE session_id = ss.id LIMIT 1) AS q ON true
+WHERE gm.role = 'leader'
+ORDER BY random()
+LIMIT :limit
+"""
+
+# Header carrying the user the stubbed auth dependency signs each request in as.
+BENCH_SUB_HEADER = "x-bench-sub"
+
+
+@dataclass
+class Fixture:
+    user_sub: str
+    group_id: str
+    study_id: str
+    session_id: str
+    passage_id: str
+    question_id: str
+    job_id: str | None = None
+
+
+@dataclass
+class Call:
+    method: str
+    url: str
+    params: dict | None = None
+    json: dict | list | None = None
+    content: bytes | None = None
+
+
+@dataclass
+class Endpoint:
+    name: str
+    build: Callable[[Fixture, random.Random], Call]
+    writes: bool = False
+
+
+def _word(rng: random.Random) -> str:
+    return rng.choice(VOCABULARY)
+
+
+def _import_archive(sessions: int = 4, passages: int = 3, questions: int = 5) -> bytes:
+    """A small study in the format=csv export layout, for POST /groups/{id}/studies/import."""
+
+    def records():
+        yield "study", {"id": uuid.uuid4(), "title": "Bench import", "description": None, "created_at": None}
+        for session in range(1, sessions + 1):
+            yield "session", {
+                "id": uuid.uuid4(),
+                "position": session,
+                "title": f"Week {session}",
+                "description": None,
+            }
+            for chapter in range(1, passages + 1):
+                yield "passage", {
+                    "id": uuid.uuid4(),
+                    "book": "John",
+                    "chapter": chapter,
+                    "start_verse": 1,
+                    "end_verse": 10,
+                    "version": "ESV",
+                    "text": " ".join(VOCABULARY[:40]),
+                }
+            for question in range(1, questions + 1):
+                yield "question", {"id": uuid.uuid4(), "position": question, "question": f"Question {question}?"}
+
+    return "".join(render_export(records(), "csv")).encode()
+
+
+IMPORT_ARCHIVE = _import_archive()
+
+ENDPOINTS = [
+    Endpoint("GET /", lambda f, r: Call("GET", "/")),
+    Endpoint("GET /healthz", lambda f, r: Call("GET", "/healthz")),
+    Endpoint("GET /groups", lambda f, r: Call("GET", "/groups")),
+    Endpoint("GET /groups/me", lambda f, r: Call("GET", "/groups/me")),
+    Endpoint("GET /groups/notes", lambda f, r: Call("GET", "/groups/notes")),
+    Endpoint(
+        "GET /groups/notes?study_id",
+        lambda f, r: Call("GET", "/groups/notes", params={"study_id": f.study_id}),
+    ),
+    Endpoint("POST /groups", lambda f, r: Call("POST", "/groups", json={"name": f"Bench {_word(r)}"}), True),
+    Endpoint("POST /groups/{id}/join", lambda f, r: Call("POST", f"/groups/{f.group_id}/join"), True),
+    Endpoint(
+        "POST /invites/groups/{id}",
+        lambda f, r: Call("POST", f"/invites/groups/{f.group_id}", json={"expires_in_days": 7}),
+        True,
+    ),
+    Endpoint("GET /invites/groups/{id}", lambda f, r: Call("GET", f"/invites/groups/{f.group_id}")),
+    Endpoint("GET /search", lambda f, r: Call("GET", "/search", params={"q": _word(r)})),
+    Endpoint("GET /groups/{id}/studies", lambda f, r: Call("GET", f"/groups/{f.group_id}/studies")),
+    Endpoint(
+        "GET /groups/{id}/studies/{id}/notes",
+        lambda f, r: Call("GET", f"/groups/{f.group_id}/studies/{f.study_id}/notes"),
+    ),
+    Endpoint(
+        "GET /groups/{id}/studies/{id}/notes/by-session",
+        lambda f, r: Call("GET", f"/groups/{f.group_id}/studies/{f.study_id}/notes/by-session"),
+    ),
+    Endpoint(
+        "GET /groups/{id}/studies/{id}/counters",
+        lambda f, r: Call("GET", f"/groups/{f.group_id}/studies/{f.study_id}/counters"),
+    ),
+    Endpoint(
+        "POST /groups/{id}/studies/import",
+        lambda f, r: Call("POST", f"/groups/{f.group_id}/studies/import", content=IMPORT_ARCHIVE),
+        True,
+    ),
+    *(
+        Endpoint(
+            f"GET /groups/{{id}}/studies/{{id}}/export?format={export_format}",
+            lambda f, r, export_format=export_format: Call(
+                "GET", f"/groups/{f.group_id}/studies/{f.study_id}/export", params={"format": export_format}
+            ),
+        )
+        for export_format in EXPORT_FORMATS
+    ),
+    Endpoint(
+        "POST /groups/{id}/studies",
+        lambda f, r: Call("POST", f"/groups/{f.group_id}/studies", json={"title": f"Bench {_word(r)}"}),
+        True,
+    ),
+    Endpoint(
+        "PATCH /groups/{id}/studies/{id}",
+        lambda f, r: Call("PATCH", f"/groups/{f.group_id}/studies/{f.study_id}", json={"description": _word(r)}),
+        True,
+    ),
+    Endpoint("GET /studies/{id}/sessions", lambda f, r: Call("GET", f"/studies/{f.study_id}/sessions")),
+    Endpoint(
+        "GET /studies/{id}/sessions?fields",
+        lambda f, r: Call("GET", f"/studies/{f.study_id}/sessions", params={"fields": "id,title,position"}),
+    ),
+    Endpoint(
+        "POST /studies/{id}/sessions",
+        lambda f, r: Call("POST", f"/studies/{f.study_id}/sessions", json={"title": f"Bench {_word(r)}"}),
+        True,
+    ),
+    Endpoint(
+        "PUT /studies/{id}/sessions/reorder",
+        lambda f, r: Call(
+            "PUT",
+            f"/studies/{f.study_id}/sessions/reorder",
+            json=[{"id": f.session_id, "position": r.randrange(1, 2**30)}],
+        ),
+        True,
+    ),
+    Endpoint(
+        "POST /studies/{id}/sessions/{id}/move",
+        lambda f, r: Call("POST", f"/studies/{f.study_id}/sessions/{f.session_id}/move", json={"after_id": None}),
+        True,
+    ),
+    Endpoint(
+        "GET /sessions/{id}/notes",
+        lambda f, r: Call("GET", f"/sessions/{f.session_id}/notes", params={"group_id": f.group_id}),
+    ),
+    Endpoint(
+        "POST /sessions/{id}/notes",
+        lambda f, r: Call(
+            "POST", f"/sessions/{f.session_id}/notes", params={"group_id": f.group_id}, json={"note": _word(r)}
+        ),
+        True,
+    ),
+    Endpoint("GET /sessions/{id}/passages", lambda f, r: Call("GET", f"/sessions/{f.session_id}/passages")),
+    Endpoint(
+        "GET /sessions/{id}/passages?fields",
+        lambda f, r: Call("GET", f"/sessions/{f.session_id}/passages", params={"fields": "id,book,chapter"}),
+    ),
+    Endpoint(
+        "GET /sessions/{id}/passages/{id}/likes",
+        lambda f, r: Call(
+            "GET", f"/sessions/{f.session_id}/passages/{f.passage_id}/likes", params={"group_id": f.group_id}
+        ),
+    ),
+    Endpoint(
+        "POST /sessions/{id}/passages/{id}/likes",
+        lambda f, r: Call(
+            "POST", f"/sessions/{f.session_id}/passages/{f.passage_id}/likes", params={"group_id": f.group_id}
+        ),
+        True,
+    ),
+    Endpoint(
+        "GET /sessions/{id}/passages/{id}/comments",
+        lambda f, r: Call(
+            "GET", f"/sessions/{f.session_id}/passages/{f.passage_id}/comments", params={"group_id": f.group_id}
+        ),
+    ),
+    Endpoint(
+        "POST /sessions/{id}/passages/{id}/comments",
+        lambda f, r: Call(
+            "POST",
+            f"/sessions/{f.session_id}/passages/{f.passage_id}/comments",
+            params={"group_id": f.group_id},
+            json={"comment": _word(r)},
+        ),
+        True,
+    ),
+    Endpoint("GET /sessions/{id}/questions", lambda f, r: Call("GET", f"/sessions/{f.session_id}/questions")),
+    Endpoint(
+        "PUT /sessions/{id}/questions/reorder",
+        lambda f, r: Call(
+            "PUT",
+            f"/sessions/{f.session_id}/questions/reorder",
+            json=[{"id": f.question_id, "position": r.randrange(1, 2**30)}],
+        ),
+        True,
+    ),
+    Endpoint(
+        "POST /sessions/{id}/questions/{id}/move",
+        lambda f, r: Call(
+            "POST", f"/sessions/{f.session_id}/questions/{f.question_id}/move", json={"after_id": None}
+        ),
+        True,
+    ),
+    Endpoint(
+        "GET /sessions/{id}/questions/{id}/responses",
+        lambda f, r: Call(
+            "GET", f"/sessions/{f.session_id}/questions/{f.question_id}/responses", params={"group_id": f.group_id}
+        ),
+    ),
+    Endpoint(
+        "POST /sessions/{id}/questions/{id}/responses",
+        lambda f, r: Call(
+            "POST",
+            f"/sessions/{f.session_id}/questions/{f.question_id}/responses",
+            params={"group_id": f.group_id},
+            json={"response": _word(r)},
+        ),
+        True,
+    ),
+    Endpoint(
+        "POST /sessions/{id}/actions:batch",
+        lambda f, r: Call(
+            "POST",
+            f"/sessions/{f.session_id}/actions:batch",
+            params={"group_id": f.group_id},
+            json={
+                "actions": [
+                    {"op": "create_note", "note": _word(r)},
+                    {"op": "create_comment", "passage_id": f.passage_id, "comment": _word(r)},
+                    {"op": "like_passage", "passage_id": f.passage_id},
+                    {"op": "create_response", "question_id": f.question_id, "response": _word(r)},
+                ]
+            },
+        ),
+        True,
+    ),
+    Endpoint(
+        "POST /sessions/{id}/sync",
+        lambda f, r: Call(
+            "POST",
+            f"/sessions/{f.session_id}/sync",
+            params={"group_id": f.group_id},
+            json={
+                "changes": [
+                    {
+                        "entity": "note",
+                        "action": "create",
+                        "id": str(uuid.UUID(int=r.getrandbits(128), version=4)),
+                        "text": _word(r),
+                        "changed_at": datetime.now(timezone.utc).isoformat(),
+                    }
+                ]
+            },
+        ),
+        True,
+    ),
+    Endpoint("GET /jobs", lambda f, r: Call("GET", "/jobs")),
+    Endpoint("GET /jobs/{id}", lambda f, r: Call("GET", f"/jobs/{f.job_id}")),
+    Endpoint("GET /profile", lambda f, r: Call("GET", "/profile")),
+    Endpoint("PUT /profile", lambda f, r: Call("PUT", "/profile", json={"display_name": _word(r)}), True),
+]
+
+
+@dataclass
+class EndpointResult:
+    name: str
+    requests: int
+    errors: int
+    throughput_rps: float
+    mean_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+
+
+def _stub_auth() -> Callable[[Fixture], dict[str, str]]:
+    def claims(request: Request) -> dict[str, object]:
+        return {"sub": request.headers[BENCH_SUB_HEADER], "token_use": "access"}
+
+    app.dependency_overrides[cognito_auth_required] = claims
+    return lambda fixture: {BENCH_SUB_HEADER: fixture.user_sub}
+
+
+def _local_cognito_auth(fixtures: list[Fixture]) -> Callable[[Fixture], dict[str, str]]:
+    cognito = LocalCognito().start()
+    os.environ.update(cognito.environment())
+    tokens = {fixture.user_sub: cognito.mint(fixture.user_sub) for fixture in fixtures}
+    return lambda fixture: {"Authorization": f"Bearer {tokens[fixture.user_sub]}"}
+
+
+def _load_fixtures(count: int) -> list[Fixture]:
+    with SessionLocal() as db:
+        rows = db.execute(text(_FIXTURES_SQL), {"limit": count}).mappings().all()
+    if not rows:
+        raise SystemExit("no seeded data found; run without --skip-seed")
+    return [Fixture(**{key: str(value) for key, value in row.items()}) for row in rows]
+
+
+def _add_jobs(fixtures: list[Fixture]) -> None:
+    """Give every fixture user a finished job for the job status endpoints to read."""
+    with SessionLocal() as db:
+        for fixture in fixtures:
+            job_id = uuid.uuid4()
+            db.add(
+                Job(
+                    id=job_id,
+                    kind="benchmark",
+                    payload={},
+                    user_sub=fixture.user_sub,
+                    status=JobStatus.SUCCEEDED,
+                    attempts=1,
+                    max_attempts=1,
+                    finished_at=func.now(),
+                )
+            )
+            fixture.job_id = str(job_id)
+        db.commit()
+
+
+def _run_endpoint(
+    endpoint: Endpoint,
+    fixtures: list[Fixture],
+    requests: int,
+    concurrency: int,
+    seed: int,
+    auth_headers: Callable[[Fixture], dict[str, str]],
+) -> EndpointResult:
+    per_worker = max(requests // concurrency, 1)
+
+    def worker(index: int) -> tuple[list[float], int]:
+        rng = random.Random(seed + index)
+        samples: list[float] = []
+        errors = 0
+        with TestClient(app, raise_server_exceptions=False) as client:
+            for _ in range(per_worker):
+                fixture = rng.choice(fixtures)
+                call = endpoint.build(fixture, rng)
+                started = time.perf_counter()
+                response = client.request(
+                    call.method,
+                    call.url,
+                    params=call.params,
+                    json=call.json,
+                    content=call.content,
+                    headers=auth_headers(fixture),
+                )
+                samples.append((time.perf_counter() - started) * 1000)
+                if response.status_code >= 400:
+                    errors += 1
+        return samples, errors
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        outcomes = list(pool.map(worker, range(concurrency)))
+    wall = time.perf_counter() - started
+
+    samples = [sample for worker_samples, _ in outcomes for sample in worker_samples]
+    summary = summarize(samples)
+    return EndpointResult(
+        name=endpoint.name,
+        requests=len(samples),
+        errors=sum(errors for _, errors in outcomes),
+        throughput_rps=round(len(samples) / wall, 1) if wall else 0.0,
+        mean_ms=summary["mean_ms"],
+        p50_ms=summary["p50_ms"],
+        p95_ms=summary["p95_ms"],
+        p99_ms=summary["p99_ms"],
+    )
+
+
+def _git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _print_results(results: list[EndpointResult], baseline: dict[str, dict] | None) -> None:
+    for result in results:
+        line = (
+            f"{result.name:<48} rps={result.throughput_rps:>8.1f} p50={result.p50_ms:>8.3f}ms "
+            f"p95={result.p95_ms:>8.3f}ms p99={result.p99_ms:>8.3f}ms errors={result.errors}"
+        )
+        previous = (baseline or {}).get(result.name)
+        if previous and previous["p95_ms"]:
+            change = (result.p95_ms - previous["p95_ms"]) / previous["p95_ms"] * 100
+            line += f" p95 {change:+.1f}%"
+        print(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Per-endpoint API benchmark")
+    parser.add_argument("--groups", type=int, default=2000)
+    parser.add_argument("--requests", type=int, default=500, help="requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--fixtures", type=int, default=500, help="distinct groups/sessions to sample")
+    parser.add_argument("--only", action="append", help="substring of endpoint names to run")
+    parser.add_argument("--read-only", action="store_true", help="skip endpoints that write")
+    parser.add_argument("--rate-limits", action="store_true", help="keep the write rate limits enabled")
+    parser.add_argument("--real-auth", action="store_true", help="verify tokens from the local Cognito stand-in")
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--compare", help="earlier JSON results to compare p95 against")
+    parser.add_argument("--reset", action="store_true", help="truncate benchmark tables first")
+    parser.add_argument("--skip-seed", action="store_true")
+    args = parser.parse_args()
+
+    if not args.rate_limits:
+        os.environ["RATE_LIMIT_BACKEND"] = "off"
+    if args.reset:
+        reset_dataset(engine)
+    seed_config = SeedConfig(groups=args.groups)
+    if not args.skip_seed:
+        seeded = seed_dataset(engine, seed_config)
+        print(json.dumps(seeded.row_counts))
+
+    fixtures = _load_fixtures(args.fixtures)
+    _add_jobs(fixtures)
+    auth_headers = _local_cognito_auth(fixtures) if args.real_auth else _stub_auth()
+    endpoints = [
+        endpoint
+        for endpoint in ENDPOINTS
+        if (not args.read_only or not endpoint.writes)
+        and (not args.only or any(part in endpoint.name for part in args.only))
+    ]
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as handle:
+            baseline = {item["name"]: item for item in json.load(handle)["endpoints"]}
+
+    results = [
+        _run_endpoint(endpoint, fixtures, args.requests, args.concurrency, index * 1000, auth_headers)
+        for index, endpoint in enumerate(endpoints)
+    ]
+    _print_results(results, baseline)
+
+    if args.output:
+        report = {
+            "run_id": str(uuid.uuid4()),
+            "finished_at": datetime.now(timezone.utc).isoformat(),
+            "git_revision": _git_revision(),
+            "settings": {
+                "requests": args.requests,
+                "concurrency": args.concurrency,
+                "fixtures": len(fixtures),
+                "real_auth": args.real_auth,
+                "seed": asdict(seed_config) if not args.skip_seed else None,
+            },
+            "endpoints": [asdict(result) for result in results],
+        }
+        with open(args.output, "w") as handle:
+            json.dump(report, handle, indent=2)
+        print(f"wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Benchmark and plan check for GET /groups/notes.
+
+Seeds 100k+ notes, prints the EXPLAIN plan of the bounded query and fails if
+it does not use the note listing indexes, then compares its latency with the
+previous unbounded four-way join::
+
+    python -m benchmarks.group_notes --reset
+"""
+import argparse
+import itertools
+import json
+import random
+
+from sqlalchemy import select, text
+
+from benchmarks.common import measure, print_summary, summarize
+from benchmarks.seed import SeedConfig, reset_dataset, seed_dataset
+from db import SessionLocal, engine
+from models.group_member import GroupMember
+from models.study import Study
+from models.study_session import StudySession
+from models.study_session_note import StudySessionNote
+from services.groups_service import list_group_ids
+from services.study_session_notes_service import group_notes_query, list_group_notes
+
+EXPECTED_INDEXES = {"ix_study_session_notes_group_created", "ix_study_session_notes_session_created"}
+
+
+def _legacy_query(user_sub: str):
+    return (
+        select(StudySessionNote)
+        .join(StudySession, StudySessionNote.session_id == StudySession.id)
+        .join(Study, StudySession.study_id == Study.id)
+        .join(GroupMember, GroupMember.group_id == Study.group_id)
+        .where(
+            GroupMember.user_sub == user_sub,
+            StudySessionNote.group_id == GroupMember.group_id,
+        )
+    )
+
+
+def _plan_nodes(node: dict):
+    yield node
+    for child in node.get("Plans", []):
+        yield from _plan_nodes(child)
+
+
+def check_plan(db, user_sub: str, limit: int) -> None:
+    statement = group_notes_query(list_group_ids(db, user_sub), None, None, limit + 1, None)
+    compiled = statement.compile(dialect=engine.dialect)
+    plan = (
+        db.connection()
+        .exec_driver_sql(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {compiled.string}", compiled.params)
+        .scalar()
+    )
+    root = plan[0]["Plan"]
+    print(json.dumps(plan, indent=2))
+
+    nodes = list(_plan_nodes(root))
+    used = {node.get("Index Name") for node in nodes} & EXPECTED_INDEXES
+    seq_scans = [
+        node
+        for node in nodes
+        if node["Node Type"] == "Seq Scan" and node.get("Relation Name") == "study_session_notes"
+    ]
+    if not used or seq_scans:
+        raise SystemExit("plan does not use the note listing indexes")
+    print(f"plan ok: {sorted(used)}, {plan[0]['Execution Time']:.3f}ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="GET /groups/notes benchmark")
+    parser.add_argument("--groups", type=int, default=1000)
+    parser.add_argument("--notes-per-session", type=int, default=10)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--reset", action="store_true", help="truncate benchmark tables first")
+    parser.add_argument("--skip-seed", action="store_true")
+    args = parser.parse_args()
+
+    if args.reset:
+        reset_dataset(engine)
+    if not args.skip_seed:
+        result = seed_dataset(
+            engine,
+            SeedConfig(groups=args.groups, notes_per_session=args.notes_per_session),
+        )
+        print(f"seeded {result.row_counts['study_session_notes']} notes")
+
+    rng = random.Random(11)
+    with SessionLocal() as db:
+        user_subs = list(db.scalars(text("SELECT DISTINCT user_sub FROM group_members LIMIT 1000")))
+        check_plan(db, rng.choice(user_subs), args.limit)
+
+        users = itertools.cycle(rng.sample(user_subs, min(len(user_subs), args.iterations)))
+
+        def legacy() -> None:
+            list(db.scalars(_legacy_query(next(users))))
+
+        def first_page() -> None:
+            list_group_notes(db, next(users), None, None, args.limit, None)
+
+        def third_page() -> None:
+            user_sub = next(users)
+            cursor = None
+            for _ in range(3):
+                _notes, cursor = list_group_notes(db, user_sub, None, None, args.limit, cursor)
+                if cursor is None:
+                    break
+
+        print_summary("legacy join (unbounded)", summarize(measure(legacy, args.iterations)))
+        print_summary("bounded first page", summarize(measure(first_page, args.iterations)))
+        print_summary("bounded pages 1-3", summarize(measure(third_page, args.iterations)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Job queue throughput, and no job run twice.
+
+Queues many no-op jobs, then drains them with several worker threads, each
+claiming with ``FOR UPDATE SKIP LOCKED`` on its own connection. Fails if a
+job ran more than once or was left unfinished. With --fail-every N, every
+Nth job fails its first attempt and must succeed on the retry (set
+JOB_RETRY_DELAY_SECONDS=0 so retries are not held back)::
+
+    python -m benchmarks.job_queue --jobs 5000 --workers 8
+    JOB_RETRY_DELAY_SECONDS=0 python -m benchmarks.job_queue --fail-every 10
+"""
+import argparse
+import threading
+import time
+from collections import Counter
+
+from sqlalchemy import delete, func, select
+
+from db import SessionLocal
+from jobs.worker import run_forever
+from models.job import Job, JobStatus
+from services.job_queue import enqueue, job_handler
+
+KIND = "benchmark_noop"
+
+_runs: Counter[int] = Counter()
+_runs_lock = threading.Lock()
+
+
+def _handler(fail_every: int):
+    @job_handler(KIND)
+    def run(_db, payload):
+        number = payload["n"]
+        with _runs_lock:
+            _runs[number] += 1
+            first_attempt = _runs[number] == 1
+        if fail_every and number % fail_every == 0 and first_attempt:
+            raise RuntimeError("injected failure")
+        return {"n": number}
+
+    return run
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Job queue benchmark")
+    parser.add_argument("--jobs", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--fail-every", type=int, default=0, help="fail the first attempt of every Nth job")
+    args = parser.parse_args()
+    _handler(args.fail_every)
+
+    with SessionLocal() as db:
+        db.execute(delete(Job).where(Job.kind == KIND))
+        db.commit()
+        started = time.perf_counter()
+        for number in range(args.jobs):
+            enqueue(db, KIND, {"n": number})
+        enqueued = time.perf_counter() - started
+    print(f"enqueued {args.jobs} jobs in {enqueued:.2f}s ({args.jobs / enqueued:.0f}/s)")
+
+    stop = threading.Event()
+    threads = [threading.Thread(target=run_forever, args=(stop, True)) for _ in range(args.workers)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    drained = time.perf_counter() - started
+    print(f"{args.workers} workers ran {sum(_runs.values())} attempts in {drained:.2f}s ({args.jobs / drained:.0f} jobs/s)")
+
+    with SessionLocal() as db:
+        statuses = dict(
+            db.execute(select(Job.status, func.count()).where(Job.kind == KIND).group_by(Job.status)).all()
+        )
+        db.execute(delete(Job).where(Job.kind == KIND))
+        db.commit()
+    print("statuses:", {status.value: count for status, count in statuses.items()})
+
+    def allowed_runs(number: int) -> int:
+        return 2 if args.fail_every and number % args.fail_every == 0 else 1
+
+    duplicates = [number for number, runs in _runs.items() if runs > allowed_runs(number)]
+    if duplicates:
+        raise SystemExit(f"{len(duplicates)} jobs ran more often than expected")
+    if statuses.get(JobStatus.SUCCEEDED, 0) != args.jobs:
+        raise SystemExit("not every job succeeded (retries may still be waiting on JOB_RETRY_DELAY_SECONDS)")
+
+
+if __name__ == "__main__":
+    main()
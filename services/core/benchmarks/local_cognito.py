@@ -0,0 +1,135 @@
+"""Local stand-in for a Cognito user pool.
+
+Serves a JWKS at ``/{user_pool_id}/.well-known/jwks.json`` and signs RS256
+tokens with Cognito-shaped claims, so benchmarks can exercise the real
+verification path in ``auth/cognito.py`` without any network access::
+
+    python -m benchmarks.local_cognito --port 9229 --mint bench-user-000001
+
+Point the service at it with the environment printed on startup
+(``COGNITO_ISSUER_BASE_URL``, ``COGNITO_REGION``, ``COGNITO_USER_POOL_ID``
+and ``COGNITO_APP_CLIENT_ID``).
+"""
+import argparse
+import json
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import jwt
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jwt.algorithms import RSAAlgorithm
+
+DEFAULT_REGION = "local-1"
+DEFAULT_USER_POOL_ID = "local-1_benchpool"
+DEFAULT_CLIENT_ID = "bench-client"
+
+
+class LocalCognito:
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        region: str = DEFAULT_REGION,
+        user_pool_id: str = DEFAULT_USER_POOL_ID,
+        client_id: str = DEFAULT_CLIENT_ID,
+    ) -> None:
+        self.region = region
+        self.user_pool_id = user_pool_id
+        self.client_id = client_id
+        self.kid = uuid.uuid4().hex
+        self._private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+        jwk = RSAAlgorithm.to_jwk(self._private_key.public_key(), as_dict=True)
+        jwk.update({"kid": self.kid, "alg": "RS256", "use": "sig"})
+        jwks = json.dumps({"keys": [jwk]}).encode()
+        jwks_path = f"/{user_pool_id}/.well-known/jwks.json"
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path != jwks_path:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(jwks)))
+                self.end_headers()
+                self.wfile.write(jwks)
+
+            def log_message(self, format: str, *args) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def issuer(self) -> str:
+        return f"{self.base_url}/{self.user_pool_id}"
+
+    def environment(self) -> dict[str, str]:
+        """Settings that make auth/cognito.py trust this stand-in."""
+        return {
+            "COGNITO_ISSUER_BASE_URL": self.base_url,
+            "COGNITO_REGION": self.region,
+            "COGNITO_USER_POOL_ID": self.user_pool_id,
+            "COGNITO_APP_CLIENT_ID": self.client_id,
+        }
+
+    def start(self) -> "LocalCognito":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def mint(self, sub: str, token_use: str = "access", ttl_seconds: int = 3600) -> str:
+        """Sign a token shaped like the ones Cognito issues for `sub`."""
+        now = int(time.time())
+        claims: dict[str, object] = {
+            "sub": sub,
+            "iss": self.issuer,
+            "token_use": token_use,
+            "auth_time": now,
+            "iat": now,
+            "exp": now + ttl_seconds,
+            "jti": str(uuid.uuid4()),
+            "origin_jti": str(uuid.uuid4()),
+            "event_id": str(uuid.uuid4()),
+        }
+        if token_use == "access":
+            claims.update({"client_id": self.client_id, "scope": "aws.cognito.signin.user.admin", "username": sub})
+        else:
+            claims.update({"aud": self.client_id, "cognito:username": sub, "email_verified": True})
+        return jwt.encode(claims, self._private_key, algorithm="RS256", headers={"kid": self.kid})
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local Cognito stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9229)
+    parser.add_argument("--mint", action="append", default=[], help="print an access token for this sub")
+    args = parser.parse_args()
+
+    cognito = LocalCognito(host=args.host, port=args.port).start()
+    for key, value in cognito.environment().items():
+        print(f"export {key}={value}")
+    for sub in args.mint:
+        print(f"# {sub}\n{cognito.mint(sub)}")
+    print(f"serving {cognito.issuer}/.well-known/jwks.json (tokens are lost on restart)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        cognito.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""Search latency benchmark.
+
+Seeds roughly one million searchable rows (notes, comments, responses and
+passages) and reports p50/p99 latency of the first and second result pages.
+Then checks pagination: walking a query's results a few rows per page must
+return exactly the rows of one unpaged search, including rows tied on rank
+across a page boundary::
+
+    python -m benchmarks.search --reset --groups 2700
+    python -m benchmarks.search --skip-seed
+"""
+import argparse
+import itertools
+import random
+
+from sqlalchemy import text
+
+from benchmarks.common import measure, print_summary, summarize
+from benchmarks.seed import VOCABULARY, SeedConfig, reset_dataset, seed_dataset
+from db import SessionLocal, engine
+from services.search_service import search_content
+
+SEARCHABLE_TABLES = (
+    "study_session_notes",
+    "study_passage_comments",
+    "study_question_responses",
+    "study_passages",
+)
+
+
+def _queries(rng: random.Random, count: int) -> list[str]:
+    rare = VOCABULARY[len(VOCABULARY) // 2 :]
+    queries = []
+    for index in range(count):
+        if index % 3 == 0:
+            queries.append(rng.choice(VOCABULARY))
+        elif index % 3 == 1:
+            queries.append(f"{rng.choice(VOCABULARY)} {rng.choice(rare)}")
+        else:
+            queries.append(f'"{rng.choice(VOCABULARY)} {rng.choice(VOCABULARY)}"')
+    return queries
+
+
+def check_pagination(db, user_sub: str, query: str, page_size: int) -> int:
+    """Page through the top 1000 hits of `query`; fail unless they match one unpaged search.
+
+    Returns how many page boundaries fell between rows tied on rank.
+    """
+    everything, _ = search_content(db, user_sub, query, None, 1000, None)
+    paged = []
+    tied_boundaries = 0
+    cursor = None
+    while len(paged) < len(everything):
+        rows, cursor = search_content(db, user_sub, query, None, page_size, cursor)
+        if paged and rows and rows[0].rank == paged[-1].rank:
+            tied_boundaries += 1
+        paged.extend(rows)
+        if cursor is None:
+            break
+    expected = [(row.kind, row.id) for row in everything]
+    actual = [(row.kind, row.id) for row in paged[: len(expected)]]
+    if actual != expected:
+        missing = len(set(expected) - set(actual))
+        raise SystemExit(f"pagination of {query!r} returned {len(actual)} rows, expected {len(expected)} ({missing} missing)")
+    return tied_boundaries
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Search latency benchmark")
+    parser.add_argument("--groups", type=int, default=2700)
+    parser.add_argument("--queries", type=int, default=300)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--page-checks", type=int, default=20, help="queries whose pages are checked for gaps")
+    parser.add_argument("--reset", action="store_true", help="truncate benchmark tables first")
+    parser.add_argument("--skip-seed", action="store_true")
+    args = parser.parse_args()
+
+    if args.reset:
+        reset_dataset(engine)
+    if not args.skip_seed:
+        result = seed_dataset(engine, SeedConfig(groups=args.groups))
+        searchable = sum(result.row_counts[table] for table in SEARCHABLE_TABLES)
+        print(f"seeded {searchable} searchable rows")
+
+    rng = random.Random(7)
+    with SessionLocal() as db:
+        total = sum(db.scalar(text(f"SELECT count(*) FROM {table}")) for table in SEARCHABLE_TABLES)
+        print(f"searching {total} rows")
+        user_subs = list(db.scalars(text("SELECT DISTINCT user_sub FROM group_members LIMIT 1000")))
+        calls = itertools.cycle(
+            [(rng.choice(user_subs), query) for query in _queries(rng, args.queries)]
+        )
+
+        def first_page() -> None:
+            user_sub, query = next(calls)
+            search_content(db, user_sub, query, None, args.limit, None)
+
+        def second_page() -> None:
+            user_sub, query = next(calls)
+            _rows, cursor = search_content(db, user_sub, query, None, args.limit, None)
+            if cursor:
+                search_content(db, user_sub, query, None, args.limit, cursor)
+
+        print_summary("search first page", summarize(measure(first_page, args.queries)))
+        print_summary("search first + second page", summarize(measure(second_page, args.queries)))
+
+        # Single common words over small pages give many ties on rank.
+        tied = sum(
+            check_pagination(db, rng.choice(user_subs), rng.choice(VOCABULARY), 3)
+            for _ in range(args.page_checks)
+        )
+        print(f"pagination matched unpaged results for {args.page_checks} queries ({tied} page boundaries tied on rank)")
+
+
+if __name__ == "__main__":
+    main()
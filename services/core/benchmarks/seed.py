@@ -0,0 +1,340 @@
+"""Synthetic dataset generator for the benchmarks.
+
+Rows are generated in Python and streamed into PostgreSQL with ``COPY`` so a
+realistic volume can be loaded in seconds rather than through ORM inserts.
+"""
+import random
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from services.counters_service import reconcile_counters
+from services.positions import POSITION_GAP
+
+VOCABULARY = (
+    "grace faith hope love mercy peace joy patience kindness goodness gentleness "
+    "prayer psalm gospel covenant kingdom shepherd lamb vine branch fruit light "
+    "darkness truth spirit wisdom forgiveness repentance redemption salvation "
+    "resurrection cross servant disciple apostle prophet temple sabbath promise "
+    "blessing wilderness river mountain harvest seed bread water wine fishermen "
+    "parable neighbor stranger widow orphan king priest judge law commandment "
+    "trust doubt fear courage comfort sorrow healing miracle journey return "
+    "humility pride generosity thanksgiving worship community family friendship "
+    "encouragement question answer story chapter verse reading reflection week"
+).split()
+
+BENCH_TABLES = (
+    "groups",
+    "group_members",
+    "studies",
+    "study_sessions",
+    "group_studies",
+    "group_sessions",
+    "study_passages",
+    "study_questions",
+    "study_session_notes",
+    "study_passage_comments",
+    "study_passage_likes",
+    "study_question_responses",
+    "content_counters",
+    "position_counters",
+)
+
+
+@dataclass
+class SeedConfig:
+    groups: int = 1000
+    members_per_group: int = 8
+    groups_per_user: int = 10
+    studies_per_group: int = 2
+    sessions_per_study: int = 6
+    passages_per_session: int = 2
+    questions_per_session: int = 4
+    notes_per_session: int = 5
+    comments_per_passage: int = 4
+    likes_per_passage: int = 3
+    responses_per_question: int = 4
+    # Each response gets this many replies, nested down to reply_depth levels.
+    replies_per_response: int = 1
+    reply_depth: int = 2
+    seed: int = 2026
+
+
+@dataclass
+class SeedResult:
+    user_subs: list[str] = field(default_factory=list)
+    group_ids: list[uuid.UUID] = field(default_factory=list)
+    study_ids: list[uuid.UUID] = field(default_factory=list)
+    session_ids: list[uuid.UUID] = field(default_factory=list)
+    row_counts: dict[str, int] = field(default_factory=dict)
+
+
+class _TextGenerator:
+    """Zipf-weighted word salad so term frequencies look like real prose."""
+
+    def __init__(self, rng: random.Random) -> None:
+        self._rng = rng
+        self._weights = [1 / (rank + 1) for rank in range(len(VOCABULARY))]
+
+    def __call__(self, min_words: int, max_words: int) -> str:
+        size = self._rng.randint(min_words, max_words)
+        return " ".join(self._rng.choices(VOCABULARY, weights=self._weights, k=size))
+
+
+def _copy(raw_conn, table: str, columns: tuple[str, ...], rows) -> int:
+    count = 0
+    with raw_conn.cursor() as cursor:
+        with cursor.copy(f"COPY {table} ({', '.join(columns)}) FROM STDIN") as copy:
+            for row in rows:
+                copy.write_row(row)
+                count += 1
+    return count
+
+
+def reset_dataset(engine: Engine) -> None:
+    """Remove every benchmark table's rows. Only use against a dedicated database."""
+    with engine.begin() as conn:
+        conn.execute(text(f"TRUNCATE {', '.join(BENCH_TABLES)} CASCADE"))
+
+
+def seed_dataset(engine: Engine, config: SeedConfig) -> SeedResult:
+    rng = random.Random(config.seed)
+    words = _TextGenerator(rng)
+    now = datetime.now(timezone.utc)
+    result = SeedResult()
+
+    def timestamp() -> datetime:
+        return now - timedelta(seconds=rng.randint(0, 365 * 24 * 3600))
+
+    user_count = max(
+        config.members_per_group,
+        config.groups * config.members_per_group // max(config.groups_per_user, 1),
+    )
+    result.user_subs = [f"bench-user-{index:06d}" for index in range(user_count)]
+    result.group_ids = [uuid.uuid4() for _ in range(config.groups)]
+
+    members = {
+        group_id: [
+            result.user_subs[(index * config.members_per_group + offset) % user_count]
+            for offset in range(config.members_per_group)
+        ]
+        for index, group_id in enumerate(result.group_ids)
+    }
+
+    studies: list[tuple[uuid.UUID, uuid.UUID]] = []
+    sessions: list[tuple[uuid.UUID, uuid.UUID, uuid.UUID, uuid.UUID]] = []
+    passages: list[tuple[uuid.UUID, uuid.UUID, uuid.UUID]] = []
+    questions: list[tuple[uuid.UUID, uuid.UUID, uuid.UUID]] = []
+
+    raw = engine.raw_connection()
+    try:
+        driver = raw.driver_connection
+        counts = result.row_counts
+        counts["groups"] = _copy(
+            driver,
+            "groups",
+            ("id", "name", "description", "created_at"),
+            ((group_id, f"Group {index}", words(5, 15), timestamp()) for index, group_id in enumerate(result.group_ids)),
+        )
+        counts["group_members"] = _copy(
+            driver,
+            "group_members",
+            ("id", "group_id", "user_sub", "role", "created_at"),
+            (
+                (uuid.uuid4(), group_id, sub, "leader" if offset == 0 else "member", timestamp())
+                for group_id, subs in members.items()
+                for offset, sub in enumerate(subs)
+            ),
+        )
+
+        for group_id in result.group_ids:
+            for _ in range(config.studies_per_group):
+                studies.append((uuid.uuid4(), group_id))
+        result.study_ids = [study_id for study_id, _ in studies]
+        counts["studies"] = _copy(
+            driver,
+            "studies",
+            ("id", "group_id", "title", "description", "is_archived", "created_at", "updated_at"),
+            ((study_id, group_id, words(2, 5), words(10, 30), False, timestamp(), now) for study_id, group_id in studies),
+        )
+
+        session_rows = []
+        group_study_rows = []
+        group_session_rows = []
+        for study_id, group_id in studies:
+            group_study_id = uuid.uuid4()
+            group_study_rows.append((group_study_id, group_id, study_id, timestamp()))
+            for position in range(1, config.sessions_per_study + 1):
+                session_id = uuid.uuid4()
+                group_session_id = uuid.uuid4()
+                sessions.append((session_id, study_id, group_id, group_session_id))
+                session_rows.append(
+                    (session_id, study_id, words(2, 6), words(10, 40), position * POSITION_GAP, timestamp(), now)
+                )
+                group_session_rows.append((group_session_id, group_study_id, session_id, timestamp()))
+        result.session_ids = [session[0] for session in sessions]
+        counts["study_sessions"] = _copy(
+            driver,
+            "study_sessions",
+            ("id", "study_id", "title", "description", "position", "created_at", "updated_at"),
+            session_rows,
+        )
+        counts["group_studies"] = _copy(
+            driver,
+            "group_studies",
+            ("id", "group_id", "study_id", "created_at"),
+            group_study_rows,
+        )
+        counts["group_sessions"] = _copy(
+            driver,
+            "group_sessions",
+            ("id", "group_study_id", "study_session_id", "created_at"),
+            group_session_rows,
+        )
+
+        passage_rows = []
+        question_rows = []
+        for session_id, _study_id, group_id, group_session_id in sessions:
+            for _ in range(config.passages_per_session):
+                passage_id = uuid.uuid4()
+                passages.append((passage_id, group_id, group_session_id))
+                passage_rows.append(
+                    (passage_id, session_id, "Psalms", rng.randint(1, 150), 1, 12, "ESV", words(80, 250), timestamp())
+                )
+            for position in range(1, config.questions_per_session + 1):
+                question_id = uuid.uuid4()
+                questions.append((question_id, group_id, group_session_id))
+                question_rows.append((question_id, session_id, words(8, 20) + "?", position * POSITION_GAP, timestamp()))
+        counts["study_passages"] = _copy(
+            driver,
+            "study_passages",
+            ("id", "session_id", "book", "chapter", "start_verse", "end_verse", "version", "text", "created_at"),
+            passage_rows,
+        )
+        counts["study_questions"] = _copy(
+            driver,
+            "study_questions",
+            ("id", "session_id", "question", "position", "created_at"),
+            question_rows,
+        )
+
+        def note_rows():
+            for session_id, study_id, group_id, group_session_id in sessions:
+                for _ in range(config.notes_per_session):
+                    created = timestamp()
+                    author = rng.choice(members[group_id])
+                    yield (
+                        uuid.uuid4(),
+                        session_id,
+                        study_id,
+                        group_id,
+                        group_session_id,
+                        author,
+                        words(10, 80),
+                        created,
+                        created,
+                    )
+
+        counts["study_session_notes"] = _copy(
+            driver,
+            "study_session_notes",
+            (
+                "id",
+                "session_id",
+                "study_id",
+                "group_id",
+                "group_session_id",
+                "user_sub",
+                "note",
+                "created_at",
+                "updated_at",
+            ),
+            note_rows(),
+        )
+
+        def comment_rows():
+            for passage_id, group_id, group_session_id in passages:
+                for _ in range(config.comments_per_passage):
+                    created = timestamp()
+                    author = rng.choice(members[group_id])
+                    yield (uuid.uuid4(), passage_id, group_id, group_session_id, author, words(5, 40), created, created)
+
+        counts["study_passage_comments"] = _copy(
+            driver,
+            "study_passage_comments",
+            ("id", "passage_id", "group_id", "group_session_id", "user_sub", "comment", "created_at", "updated_at"),
+            comment_rows(),
+        )
+
+        def like_rows():
+            for passage_id, group_id, group_session_id in passages:
+                likers = rng.sample(members[group_id], min(config.likes_per_passage, len(members[group_id])))
+                for author in likers:
+                    yield (uuid.uuid4(), passage_id, group_id, group_session_id, author, timestamp())
+
+        counts["study_passage_likes"] = _copy(
+            driver,
+            "study_passage_likes",
+            ("id", "passage_id", "group_id", "group_session_id", "user_sub", "created_at"),
+            like_rows(),
+        )
+
+        def response_rows():
+            for question_id, group_id, group_session_id in questions:
+                group_members = members[group_id]
+                authors = rng.sample(group_members, min(config.responses_per_question, len(group_members)))
+                # Parents are always yielded before their replies so the FK holds during COPY.
+                level = [(None, author) for author in authors]
+                for depth in range(config.reply_depth + 1):
+                    next_level = []
+                    for parent_id, author in level:
+                        response_id = uuid.uuid4()
+                        created = timestamp()
+                        yield (
+                            response_id,
+                            question_id,
+                            parent_id,
+                            group_id,
+                            group_session_id,
+                            author,
+                            words(5, 60),
+                            created,
+                            created,
+                        )
+                        if depth < config.reply_depth:
+                            repliers = rng.sample(
+                                group_members, min(config.replies_per_response, len(group_members))
+                            )
+                            next_level.extend((response_id, replier) for replier in repliers)
+                    level = next_level
+
+        counts["study_question_responses"] = _copy(
+            driver,
+            "study_question_responses",
+            (
+                "id",
+                "question_id",
+                "parent_response_id",
+                "group_id",
+                "group_session_id",
+                "user_sub",
+                "response",
+                "created_at",
+                "updated_at",
+            ),
+            response_rows(),
+        )
+        raw.commit()
+    finally:
+        raw.close()
+
+    with Session(engine) as db:
+        reconcile_counters(db)
+    with engine.begin() as conn:
+        for table in BENCH_TABLES:
+            conn.execute(text(f"ANALYZE {table}"))
+    return result
@@ -0,0 +1,130 @@
+"""SQL statements issued per create endpoint, and by the invite preview and join.
+
+Drives every create route through the ASGI app with authentication stubbed
+out and counts the statements (and commits) each request sends to the
+database, so round-trip savings show up as exact numbers::
+
+    python -m benchmarks.statement_counts
+    python -m benchmarks.statement_counts --rounds 20 --verbose
+"""
+import argparse
+import json
+import uuid
+from collections import defaultdict
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from auth.cognito import cognito_auth_required
+from db import engine
+from main import app
+
+
+class StatementCounter:
+    def __init__(self) -> None:
+        self.statements: list[str] = []
+        self.commits = 0
+
+    def reset(self) -> None:
+        self.statements = []
+        self.commits = 0
+
+    def before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        self.statements.append(statement)
+
+    def commit(self, conn) -> None:
+        self.commits += 1
+
+    def install(self) -> None:
+        event.listen(engine, "before_cursor_execute", self.before_cursor_execute)
+        event.listen(engine, "commit", self.commit)
+
+
+def _scenario(client: TestClient, counter: StatementCounter, results: dict, verbose: bool) -> None:
+    def call(name: str, method: str, url: str, **kwargs) -> dict:
+        counter.reset()
+        response = client.request(method, url, **kwargs)
+        if response.status_code >= 400:
+            raise SystemExit(f"{name}: {response.status_code} {response.text}")
+        results[name]["statements"].append(len(counter.statements))
+        results[name]["commits"].append(counter.commits)
+        if verbose:
+            print(f"-- {name}")
+            for statement in counter.statements:
+                print("   " + " ".join(statement.split())[:160])
+        return response.json()
+
+    call("create_user", "GET", "/profile")
+    group = call("create_group", "POST", "/groups", json={"name": "Bench group"})
+    group_id = group["id"]
+    invite = call("create_invite", "POST", f"/invites/groups/{group_id}", json={"expires_in_days": 7})
+    # The second preview should be answered from the invite cache; the join
+    # always reads the invite row.
+    call("preview_invite", "GET", f"/invites/preview/{invite['code']}")
+    call("preview_invite_again", "GET", f"/invites/preview/{invite['code']}")
+    call("join_by_invite", "POST", "/invites/join", json={"code": invite["code"]})
+    study = call("create_study", "POST", f"/groups/{group_id}/studies", json={"title": "Bench study"})
+    session = call("create_session", "POST", f"/studies/{study['id']}/sessions", json={"title": "Week 1"})
+    session_id = session["id"]
+    passage = call(
+        "create_passage",
+        "POST",
+        f"/sessions/{session_id}/passages",
+        json={"book": "John", "chapter": 3, "start_verse": 16, "end_verse": 21},
+    )
+    question = call(
+        "create_question",
+        "POST",
+        f"/sessions/{session_id}/questions",
+        json={"question": "What stands out?"},
+    )
+    params = {"group_id": group_id}
+    call("post_note", "POST", f"/sessions/{session_id}/notes", params=params, json={"note": "Bench note"})
+    call(
+        "post_comment",
+        "POST",
+        f"/sessions/{session_id}/passages/{passage['id']}/comments",
+        params=params,
+        json={"comment": "Bench comment"},
+    )
+    call("post_like", "POST", f"/sessions/{session_id}/passages/{passage['id']}/likes", params=params)
+    call(
+        "post_response",
+        "POST",
+        f"/sessions/{session_id}/questions/{question['id']}/responses",
+        params=params,
+        json={"response": "Bench response"},
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Statements per create endpoint")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--verbose", action="store_true", help="print every statement of the first round")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    counter = StatementCounter()
+    counter.install()
+    results: dict = defaultdict(lambda: {"statements": [], "commits": []})
+
+    client = TestClient(app)
+    for round_index in range(args.rounds):
+        user_sub = f"bench-{uuid.uuid4()}"
+        app.dependency_overrides[cognito_auth_required] = lambda: {"sub": user_sub}
+        _scenario(client, counter, results, args.verbose and round_index == 0)
+    app.dependency_overrides.clear()
+
+    summary = {
+        name: {"statements": max(values["statements"]), "commits": max(values["commits"])}
+        for name, values in results.items()
+    }
+    if args.json:
+        print(json.dumps(summary, indent=2))
+        return
+    for name, values in summary.items():
+        print(f"{name:<20} statements={values['statements']:<3} commits={values['commits']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Streaming a study export of about 1M rows.
+
+Seeds one study with roughly a million passages, questions, responses and
+notes (with the defaults), then streams it in every format through the same
+generators GET /groups/{group_id}/studies/{study_id}/export uses, discarding
+the output. Reports rows and bytes per second and how much the process grew
+while exporting; with --memory, the peak of Python allocations instead
+(tracemalloc, which slows the run down)::
+
+    python -m benchmarks.study_export --reset
+    python -m benchmarks.study_export --reset --memory --formats json
+"""
+import argparse
+import resource
+import time
+import tracemalloc
+
+from sqlalchemy import select
+
+from benchmarks.seed import SeedConfig, reset_dataset, seed_dataset
+from db import SessionLocal, engine
+from models.study import Study
+from services.study_export import EXPORT_FORMATS, export_records, render_export
+
+
+def _max_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _count_rows(records):
+    counts: dict[str, int] = {}
+
+    def counted():
+        for kind, fields in records:
+            counts[kind] = counts.get(kind, 0) + 1
+            yield kind, fields
+
+    return counts, counted()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Study export benchmark")
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--questions", type=int, default=20, help="per session")
+    # Each response gets one reply; responses per question are capped by the
+    # group's members (one each per question).
+    parser.add_argument("--responses", type=int, default=200, help="per question, plus a reply each")
+    parser.add_argument("--notes", type=int, default=12000, help="per session")
+    parser.add_argument("--formats", nargs="+", choices=list(EXPORT_FORMATS), default=list(EXPORT_FORMATS))
+    parser.add_argument("--memory", action="store_true", help="report peak Python allocations")
+    parser.add_argument("--reset", action="store_true", help="truncate benchmark tables first")
+    args = parser.parse_args()
+
+    if args.reset:
+        reset_dataset(engine)
+    config = SeedConfig(
+        groups=1,
+        members_per_group=max(args.responses, 8),
+        groups_per_user=1,
+        studies_per_group=1,
+        sessions_per_study=args.sessions,
+        passages_per_session=4,
+        questions_per_session=args.questions,
+        notes_per_session=args.notes,
+        comments_per_passage=0,
+        likes_per_passage=0,
+        responses_per_question=args.responses,
+        replies_per_response=1,
+        reply_depth=1,
+    )
+    seeded = seed_dataset(engine, config)
+    study_id, group_id = seeded.study_ids[0], seeded.group_ids[0]
+
+    for export_format in args.formats:
+        with SessionLocal() as db:
+            study = db.scalar(select(Study).where(Study.id == study_id))
+            counts, records = _count_rows(export_records(db, study, group_id))
+            if args.memory:
+                tracemalloc.start()
+            rss_before = _max_rss_mb()
+            started = time.perf_counter()
+            size = 0
+            for chunk in render_export(records, export_format):
+                size += len(chunk.encode())
+            elapsed = time.perf_counter() - started
+            if args.memory:
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                memory = f"peak allocations {peak / 2**20:.1f}MB"
+            else:
+                memory = f"max RSS +{_max_rss_mb() - rss_before:.1f}MB"
+        rows = sum(counts.values())
+        print(
+            f"{export_format:<9} {rows:>9} rows {size / 2**20:>8.1f}MB {elapsed:>7.1f}s "
+            f"{rows / elapsed:>9.0f} rows/s {size / 2**20 / elapsed:>6.1f}MB/s  {memory}"
+        )
+    print("rows by kind:", counts)
+
+
+if __name__ == "__main__":
+    main()
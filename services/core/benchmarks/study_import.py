@@ -0,0 +1,164 @@
+"""Importing a large study archive: COPY + set-based moves vs ORM inserts.
+
+Writes a synthetic archive with the format=csv export writer to a temporary file,
+imports it into a throwaway group with import_study_archive, then loads the
+same archive the old way, one ORM object per row, for comparison. Checks
+that every session, passage and question arrived and that passages list in
+archive order, then drops the group::
+
+    python -m benchmarks.study_import
+    python -m benchmarks.study_import --sessions 5000 --skip-orm
+"""
+import argparse
+import csv
+import tempfile
+import time
+import uuid
+
+from sqlalchemy import delete, select
+
+from db import SessionLocal
+from models.group import Group
+from models.group_member import GroupMember, GroupRole
+from models.study import Study
+from models.study_passage import StudyPassage
+from models.study_question import StudyQuestion
+from models.study_session import StudySession
+from services.positions import POSITION_GAP
+from services.study_export import render_export
+from services.study_import import import_study_archive
+
+LEADER = "bench-import-leader"
+
+
+def archive_records(sessions: int, passages: int, questions: int):
+    """Export records of a synthetic study, as export_records would yield them."""
+    yield "study", {"id": uuid.uuid4(), "title": "Imported curriculum", "description": "benchmark", "created_at": None}
+    for session_number in range(1, sessions + 1):
+        yield "session", {
+            "id": uuid.uuid4(),
+            "position": session_number * POSITION_GAP,
+            "title": f"Session {session_number}",
+            "description": "Read, discuss and pray through the passage together.",
+        }
+        for chapter in range(1, passages + 1):
+            yield "passage", {
+                "id": uuid.uuid4(),
+                "book": "Psalms",
+                "chapter": chapter,
+                "start_verse": 1,
+                "end_verse": 12,
+                "version": "ESV",
+                "text": "Blessed is the one who does not walk in step with the wicked. " * 8,
+            }
+        for question_number in range(1, questions + 1):
+            yield "question", {
+                "id": uuid.uuid4(),
+                "position": question_number * POSITION_GAP,
+                "question": f"What does verse {question_number} teach about trust?",
+            }
+
+
+def orm_import(db, group_id: uuid.UUID, archive) -> Study:
+    """The baseline: one ORM object per archived row."""
+    reader = csv.DictReader(archive)
+    first = next(reader)
+    study = Study(group_id=group_id, title=first["title"], description=first["description"], is_archived=False)
+    db.add(study)
+    db.flush()
+    sessions: dict[str, uuid.UUID] = {}
+    for row in reader:
+        if row["entity"] == "session":
+            session = StudySession(
+                study_id=study.id, title=row["title"], description=row["description"], position=int(row["position"])
+            )
+            db.add(session)
+            db.flush()
+            sessions[row["id"]] = session.id
+        elif row["entity"] == "passage":
+            db.add(
+                StudyPassage(
+                    session_id=sessions[row["parent_id"]],
+                    book=row["book"],
+                    chapter=int(row["chapter"]),
+                    start_verse=int(row["start_verse"]),
+                    end_verse=int(row["end_verse"]),
+                    version=row["version"],
+                    text=row["text"],
+                )
+            )
+        elif row["entity"] == "question":
+            db.add(
+                StudyQuestion(session_id=sessions[row["parent_id"]], question=row["text"], position=int(row["position"]))
+            )
+    db.commit()
+    return study
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Study import benchmark")
+    parser.add_argument("--sessions", type=int, default=2000)
+    parser.add_argument("--passages", type=int, default=25, help="per session")
+    parser.add_argument("--questions", type=int, default=75, help="per session")
+    parser.add_argument("--skip-orm", action="store_true", help="only time the COPY import")
+    args = parser.parse_args()
+
+    with SessionLocal() as db:
+        group = Group(name="import benchmark")
+        db.add(group)
+        db.flush()
+        db.add(GroupMember(group_id=group.id, user_sub=LEADER, role=GroupRole.LEADER))
+        db.commit()
+        group_id = group.id
+
+    try:
+        with tempfile.TemporaryFile("w+", encoding="utf-8", newline="") as archive:
+            for chunk in render_export(archive_records(args.sessions, args.passages, args.questions), "csv"):
+                archive.write(chunk)
+            rows = 1 + args.sessions * (1 + args.passages + args.questions)
+            expected = {
+                "study_sessions": args.sessions,
+                "study_passages": args.sessions * args.passages,
+                "study_questions": args.sessions * args.questions,
+            }
+
+            archive.seek(0)
+            with SessionLocal() as db:
+                started = time.perf_counter()
+                study, counts = import_study_archive(db, group_id, LEADER, archive)
+                elapsed = time.perf_counter() - started
+            print(f"COPY import   {rows:>8} rows {elapsed:>7.2f}s {rows / elapsed:>9.0f} rows/s")
+            if counts != expected:
+                raise SystemExit(f"imported {counts}, expected {expected}")
+            with SessionLocal() as db:
+                first_session = db.scalar(
+                    select(StudySession.id)
+                    .where(StudySession.study_id == study.id)
+                    .order_by(StudySession.position)
+                    .limit(1)
+                )
+                chapters = list(
+                    db.scalars(
+                        select(StudyPassage.chapter)
+                        .where(StudyPassage.session_id == first_session)
+                        .order_by(StudyPassage.created_at, StudyPassage.id)
+                    )
+                )
+            if chapters != list(range(1, args.passages + 1)):
+                raise SystemExit(f"passages of the first session list out of archive order: {chapters}")
+
+            if not args.skip_orm:
+                archive.seek(0)
+                with SessionLocal() as db:
+                    started = time.perf_counter()
+                    orm_import(db, group_id, archive)
+                    elapsed = time.perf_counter() - started
+                print(f"ORM inserts   {rows:>8} rows {elapsed:>7.2f}s {rows / elapsed:>9.0f} rows/s")
+    finally:
+        with SessionLocal() as db:
+            db.execute(delete(Group).where(Group.id == group_id))
+            db.commit()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,31 @@
 import os
+import time
+from functools import lru_cache
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from jwt import PyJWKClient, decode
-from jwt.exceptions import InvalidTokenError
+from jwt.exceptions import InvalidTokenError, PyJWKClientError
+
+from metrics import CACHE_LOOKUPS, CACHE_MISSES, Histogram
 
 security = HTTPBearer()
 
+# Readiness refreshes the key set when the last download is older than this.
+JWKS_MAX_AGE_SECONDS = float(os.getenv("JWKS_MAX_AGE_SECONDS", "3600"))
+
+JWKS_FETCH_SECONDS = Histogram("auth_jwks_fetch_seconds", "Time spent downloading the Cognito JWKS.")
+TOKEN_VERIFY_SECONDS = Histogram(
+    "auth_token_verify_seconds",
+    "Time spent verifying bearer tokens.",
+    ["result"],
+)
+_jwks_fetch = JWKS_FETCH_SECONDS.labels()
+_jwks_lookups = CACHE_LOOKUPS.labels("jwks")
+_jwks_misses = CACHE_MISSES.labels("jwks")
+_verify_ok = TOKEN_VERIFY_SECONDS.labels("ok")
+_verify_rejected = TOKEN_VERIFY_SECONDS.labels("rejected")
+
 
 def _get_cognito_region() -> str:
     region = os.getenv("COGNITO_REGION")
@@ -32,25 +51,68 @@ def _get_app_client_id() -> str | None:
     return os.getenv("COGNITO_APP_CLIENT_ID")
 
 
+def _get_issuer(region: str, user_pool_id: str) -> str:
+    # COGNITO_ISSUER_BASE_URL points verification at another issuer, e.g. the
+    # local stand-in used by the benchmarks.
+    base_url = os.getenv("COGNITO_ISSUER_BASE_URL") or f"https://cognito-idp.{region}.amazonaws.com"
+    return f"{base_url.rstrip('/')}/{user_pool_id}"
+
+
 def _get_jwks_url(region: str, user_pool_id: str) -> str:
-    return (
-        f"https://cognito-idp.{region}.amazonaws.com/"
-        f"{user_pool_id}/.well-known/jwks.json"
-    )
+    return f"{_get_issuer(region, user_pool_id)}/.well-known/jwks.json"
+
+
+class _TimedJWKClient(PyJWKClient):
+    """PyJWKClient that records every JWKS download (i.e. every cache miss)."""
+
+    fetched_at: float | None = None
+
+    def fetch_data(self):
+        _jwks_misses.inc()
+        started = time.perf_counter()
+        try:
+            data = super().fetch_data()
+        finally:
+            _jwks_fetch.observe(time.perf_counter() - started)
+        self.fetched_at = time.time()
+        return data
+
+
+@lru_cache(maxsize=8)
+def _jwks_client_for(url: str) -> PyJWKClient:
+    # One client per JWKS URL so its key cache survives across requests.
+    return _TimedJWKClient(url)
 
 
 def _get_jwks_client(region: str, user_pool_id: str) -> PyJWKClient:
-    url = _get_jwks_url(region, user_pool_id)
-    return PyJWKClient(url)
+    return _jwks_client_for(_get_jwks_url(region, user_pool_id))
+
+
+def check_jwks() -> dict[str, object]:
+    """Readiness view of the signing keys, refreshing them when stale."""
+    region = os.getenv("COGNITO_REGION")
+    user_pool_id = os.getenv("COGNITO_USER_POOL_ID")
+    if not region or not user_pool_id:
+        return {"ok": False, "error": "cognito_not_configured"}
+
+    jwks_client = _get_jwks_client(region, user_pool_id)
+    fetched_at = jwks_client.fetched_at
+    if fetched_at is None or time.time() - fetched_at > JWKS_MAX_AGE_SECONDS:
+        try:
+            jwks_client.get_jwk_set(refresh=True)
+        except PyJWKClientError as exc:
+            return {"ok": False, "error": str(exc)}
+    return {"ok": True, "age_seconds": round(time.time() - jwks_client.fetched_at, 1)}
 
 
 def _verify_token(token: str) -> dict[str, object]:
     region = _get_cognito_region()
     user_pool_id = _get_user_pool_id()
     app_client_id = _get_app_client_id()
-    issuer = f"https://cognito-idp.{region}.amazonaws.com/{user_pool_id}"
+    issuer = _get_issuer(region, user_pool_id)
 
     jwks_client = _get_jwks_client(region, user_pool_id)
+    _jwks_lookups.inc()
     try:
         signing_key = jwks_client.get_signing_key_from_jwt(token).key
     except InvalidTokenError as exc:
@@ -60,22 +122,15 @@ def _verify_token(token: str) -> dict[str, object]:
         ) from exc
 
     try:
-        if app_client_id:
-            decoded = decode(
-                token,
-                signing_key,
-                algorithms=["RS256"],
-                audience=app_client_id,
-                issuer=issuer,
-            )
-        else:
-            decoded = decode(
-                token,
-                signing_key,
-                algorithms=["RS256"],
-                issuer=issuer,
-                options={"verify_aud": False},
-            )
+        # Cognito access tokens carry no `aud`; the client is checked per
+        # token type below instead.
+        decoded = decode(
+            token,
+            signing_key,
+            algorithms=["RS256"],
+            issuer=issuer,
+            options={"verify_aud": False},
+        )
     except InvalidTokenError as exc:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -89,8 +144,9 @@ def _verify_token(token: str) -> dict[str, object]:
             detail="Unsupported token",
         )
 
-    if token_use == "access" and app_client_id:
-        if decoded.get("client_id") != app_client_id:
+    if app_client_id:
+        token_client = decoded.get("client_id") if token_use == "access" else decoded.get("aud")
+        if token_client != app_client_id:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Token client_id mismatch",
@@ -102,4 +158,11 @@ def _verify_token(token: str) -> dict[str, object]:
 def cognito_auth_required(
     credentials: HTTPAuthorizationCredentials = Depends(security),
 ) -> dict[str, object]:
-    return _verify_token(credentials.credentials)
+    started = time.perf_counter()
+    try:
+        claims = _verify_token(credentials.credentials)
+    except HTTPException:
+        _verify_rejected.observe(time.perf_counter() - started)
+        raise
+    _verify_ok.observe(time.perf_counter() - started)
+    return claims
@@ -1,19 +1,14 @@
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 
 from auth.cognito import cognito_auth_required
 from db import get_db
 from schemas.groups import GroupCreate, GroupMemberOut, GroupOut
-from sqlalchemy import select
-
-from models.group_member import GroupMember
-from models.study import Study
-from models.study_session import StudySession
-from models.study_session_note import StudySessionNote
 from services.groups_service import create_group, join_group, leave_group, list_groups
-from schemas.study_session_notes import StudySessionNoteOut
+from services.study_session_notes_service import list_group_notes
+from schemas.study_session_notes import StudySessionNotePageOut
 
 router = APIRouter(prefix="/groups", tags=["groups"])
 
@@ -46,24 +41,26 @@ def get_my_groups(
     return list_groups(db, user_sub)
 
 
-@router.get("/notes", response_model=list[StudySessionNoteOut])
+@router.get("/notes", response_model=StudySessionNotePageOut)
 def get_group_notes(
+    study_id: UUID | None = None,
+    session_id: UUID | None = None,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: str | None = None,
     claims: dict[str, object] = Depends(cognito_auth_required),
     db: Session = Depends(get_db),
-) -> list[StudySessionNoteOut]:
+) -> StudySessionNotePageOut:
     user_sub = _get_user_sub(claims)
-    return list(
-        db.scalars(
-            select(StudySessionNote)
-            .join(StudySession, StudySessionNote.session_id == StudySession.id)
-            .join(Study, StudySession.study_id == Study.id)
-            .join(GroupMember, GroupMember.group_id == Study.group_id)
-            .where(
-                GroupMember.user_sub == user_sub,
-                StudySessionNote.group_id == GroupMember.group_id,
-            )
-        )
-    )
+    try:
+        notes, next_cursor = list_group_notes(db, user_sub, study_id, session_id, limit, cursor)
+    except ValueError as exc:
+        if str(exc) == "invalid_cursor":
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor",
+            ) from exc
+        raise
+    return StudySessionNotePageOut(items=notes, next_cursor=next_cursor)
 
 
 @router.post("", response_model=GroupOut, status_code=status.HTTP_201_CREATED)
@@ -1,7 +1,9 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response, status
+from fastapi.responses import JSONResponse
 
 from auth.cognito import cognito_auth_required
-from services.health_service import get_status
+from metrics import CONTENT_TYPE, REGISTRY
+from services.health_service import get_readiness, get_status
 
 router = APIRouter()
 
@@ -11,6 +13,25 @@ def read_root() -> dict[str, str]:
     return get_status()
 
 
+@router.get("/healthz")
+def read_liveness() -> dict[str, str]:
+    return get_status()
+
+
+@router.get("/readyz")
+def read_readiness() -> JSONResponse:
+    ready, checks = get_readiness()
+    return JSONResponse(
+        status_code=status.HTTP_200_OK if ready else status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"status": "ready" if ready else "unavailable", "checks": checks},
+    )
+
+
 @router.get("/protected")
 def read_protected(_claims: dict[str, object] = Depends(cognito_auth_required)) -> dict[str, str]:
     return {"status": "authorized"}
+
+
+@router.get("/metrics", include_in_schema=False)
+def read_metrics() -> Response:
+    return Response(content=REGISTRY.render(), media_type=CONTENT_TYPE)
@@ -0,0 +1,47 @@
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from auth.cognito import cognito_auth_required
+from db import get_db
+from schemas.jobs import JobOut
+from services.job_queue import MAX_JOBS_LIST, get_job, list_jobs
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+
+def _get_user_sub(claims: dict[str, object]) -> str:
+    user_sub = claims.get("sub")
+    if not isinstance(user_sub, str):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Missing user sub",
+        )
+    return user_sub
+
+
+@router.get("", response_model=list[JobOut])
+def get_jobs(
+    limit: int = Query(20, ge=1, le=MAX_JOBS_LIST),
+    claims: dict[str, object] = Depends(cognito_auth_required),
+    db: Session = Depends(get_db),
+) -> list[JobOut]:
+    return list_jobs(db, _get_user_sub(claims), limit)
+
+
+@router.get("/{job_id}", response_model=JobOut)
+def get_job_route(
+    job_id: UUID,
+    claims: dict[str, object] = Depends(cognito_auth_required),
+    db: Session = Depends(get_db),
+) -> JobOut:
+    try:
+        return get_job(db, job_id, _get_user_sub(claims))
+    except ValueError as exc:
+        if str(exc) == "job_not_found":
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Job not found",
+            ) from exc
+        raise
@@ -0,0 +1,43 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from auth.cognito import cognito_auth_required
+from db import get_db
+from schemas.search import SearchKind, SearchPageOut
+from services.search_service import search_content
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+
+def _get_user_sub(claims: dict[str, object]) -> str:
+    user_sub = claims.get("sub")
+    if not isinstance(user_sub, str):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Missing user sub",
+        )
+    return user_sub
+
+
+@router.get("", response_model=SearchPageOut)
+def get_search(
+    q: str = Query(..., min_length=1, max_length=200),
+    kind: list[SearchKind] | None = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: str | None = None,
+    claims: dict[str, object] = Depends(cognito_auth_required),
+    db: Session = Depends(get_db),
+) -> SearchPageOut:
+    """Search notes, comments, responses and passages in the caller's groups."""
+    user_sub = _get_user_sub(claims)
+    kinds = [item.value for item in kind] if kind else None
+    try:
+        rows, next_cursor = search_content(db, user_sub, q, kinds, limit, cursor)
+    except ValueError as exc:
+        if str(exc) == "invalid_cursor":
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor",
+            ) from exc
+        raise
+    return SearchPageOut(items=rows, next_cursor=next_cursor)
@@ -0,0 +1,87 @@
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+
+from auth.cognito import cognito_auth_required
+from db import get_db
+from ratelimit.limiter import rate_limit
+from services.session_actions_service import apply_session_actions
+from schemas.session_actions import SessionActionBatch, SessionActionBatchOut, SessionActionResult
+from schemas.study_passage_comments import StudyPassageCommentOut
+from schemas.study_passage_likes import StudyPassageLikeOut
+from schemas.study_question_responses import StudyQuestionResponseOut
+from schemas.study_session_notes import StudySessionNoteOut
+
+router = APIRouter(prefix="/sessions/{session_id}", tags=["session-actions"])
+
+# Each op's item is validated against its own schema: the rows share most
+# columns, so letting the union pick would be ambiguous.
+_ITEM_SCHEMAS = {
+    "create_note": StudySessionNoteOut,
+    "create_comment": StudyPassageCommentOut,
+    "create_response": StudyQuestionResponseOut,
+    "like_passage": StudyPassageLikeOut,
+}
+
+
+def _get_user_sub(claims: dict[str, object]) -> str:
+    user_sub = claims.get("sub")
+    if not isinstance(user_sub, str):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Missing user sub",
+        )
+    return user_sub
+
+
+@router.post(
+    "/actions:batch",
+    response_model=SessionActionBatchOut,
+    dependencies=[Depends(rate_limit("batch"))],
+)
+def post_actions_batch(
+    session_id: UUID,
+    group_id: UUID,
+    payload: SessionActionBatch,
+    claims: dict[str, object] = Depends(cognito_auth_required),
+    db: Session = Depends(get_db),
+) -> SessionActionBatchOut:
+    user_sub = _get_user_sub(claims)
+    try:
+        results = apply_session_actions(
+            db,
+            session_id,
+            group_id,
+            user_sub,
+            [action.model_dump() for action in payload.actions],
+        )
+    except ValueError as exc:
+        if str(exc) == "session_not_found":
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Session not found",
+            ) from exc
+        if str(exc) == "forbidden":
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Only group members can act in this session",
+            ) from exc
+        raise
+
+    return SessionActionBatchOut(
+        results=[
+            SessionActionResult(
+                index=result["index"],
+                op=result["op"],
+                status=result["status"],
+                item=(
+                    _ITEM_SCHEMAS[result["op"]].model_validate(result["item"])
+                    if result["item"] is not None
+                    else None
+                ),
+                detail=result["detail"],
+            )
+            for result in results
+        ]
+    )
@@ -1,21 +1,44 @@
+import io
+import os
+import tempfile
+from typing import Literal
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from auth.cognito import cognito_auth_required
 from db import get_db
-from schemas.studies import StudyCreate, StudyOut, StudyUpdate
-from schemas.study_session_notes import StudySessionNoteOut
-from sqlalchemy import select
-
-from models.study import Study
-from models.study_session import StudySession
+from models.job import Job
 from models.study_session_note import StudySessionNote
-from services.studies_service import create_study, delete_study, list_studies, update_study
+from ratelimit.limiter import rate_limit
+from schemas.counters import ContentCounterOut
+from schemas.jobs import JobOut
+from schemas.studies import StudyCreate, StudyImportOut, StudyOut, StudyUpdate
+from schemas.study_session_notes import StudySessionNoteOut, StudySessionNotePageOut, StudySessionNotesGroupOut
+from services.counters_service import list_study_counters
+from services.fields import fields_param
+from services.job_queue import enqueue
+from services.studies_service import (
+    create_study,
+    delete_study,
+    get_deletable_study,
+    list_studies,
+    update_study,
+)
+from services.study_export import EXPORT_FORMATS, export_records, get_exportable_study, render_export
+from services.study_import import ensure_can_import, import_study_archive
+from services.study_session_notes_service import list_study_notes, list_study_notes_by_session
 
 router = APIRouter(prefix="/groups/{group_id}/studies", tags=["studies"])
 
+IMPORT_MAX_BYTES = int(os.getenv("STUDY_IMPORT_MAX_BYTES", str(256 * 1024 * 1024)))
+# Uploads larger than this are spooled to a temporary file instead of memory.
+IMPORT_SPOOL_BYTES = 8 * 1024 * 1024
+
 
 def _get_user_sub(claims: dict[str, object]) -> str:
     user_sub = claims.get("sub")
@@ -27,36 +50,135 @@ def _get_user_sub(claims: dict[str, object]) -> str:
     return user_sub
 
 
+def _accepted(job: Job) -> JSONResponse:
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content=jsonable_encoder(JobOut.model_validate(job)),
+        headers={"Location": f"/jobs/{job.id}"},
+    )
+
+
 @router.get("", response_model=list[StudyOut])
 def get_studies(
     group_id: UUID,
     _claims: dict[str, object] = Depends(cognito_auth_required),
+    selected: tuple[str, ...] | None = Depends(fields_param(StudyOut)),
     db: Session = Depends(get_db),
 ) -> list[StudyOut]:
-    return list_studies(db, group_id)
+    studies = list_studies(db, group_id, selected)
+    if selected is not None:
+        return JSONResponse(jsonable_encoder(studies))
+    return studies
 
 
-@router.get("/notes", response_model=list[StudySessionNoteOut])
+@router.get("/notes", response_model=list[StudySessionNoteOut], deprecated=True)
 def get_study_notes(
     group_id: UUID,
     study_id: UUID,
     _claims: dict[str, object] = Depends(cognito_auth_required),
     db: Session = Depends(get_db),
 ) -> list[StudySessionNoteOut]:
-    return list(
-        db.scalars(
-            select(StudySessionNote)
-            .join(StudySession, StudySessionNote.session_id == StudySession.id)
-            .join(Study, StudySession.study_id == Study.id)
-            .where(
-                Study.id == study_id,
-                Study.group_id == group_id,
-                StudySessionNote.group_id == group_id,
-            )
-        )
+    """Every note as one list, as before; use the paged GET /{study_id}/notes instead."""
+    notes: list[StudySessionNote] = []
+    cursor = None
+    while True:
+        page, cursor = list_study_notes(db, group_id, study_id, None, 200, cursor)
+        notes.extend(page)
+        if cursor is None:
+            return notes
+
+
+@router.get("/{study_id}/notes", response_model=StudySessionNotePageOut)
+def get_study_notes_page(
+    group_id: UUID,
+    study_id: UUID,
+    session_id: UUID | None = None,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: str | None = None,
+    _claims: dict[str, object] = Depends(cognito_auth_required),
+    db: Session = Depends(get_db),
+) -> StudySessionNotePageOut:
+    return _study_notes_page(db, group_id, study_id, session_id, limit, cursor)
+
+
+@router.get("/{study_id}/notes/by-session", response_model=list[StudySessionNotesGroupOut])
+def get_study_notes_by_session(
+    group_id: UUID,
+    study_id: UUID,
+    per_session: int = Query(5, ge=1, le=50),
+    _claims: dict[str, object] = Depends(cognito_auth_required),
+    db: Session = Depends(get_db),
+) -> list[StudySessionNotesGroupOut]:
+    return list_study_notes_by_session(db, group_id, study_id, per_session)
+
+
+@router.get("/{study_id}/counters", response_model=list[ContentCounterOut])
+def get_study_counters(
+    group_id: UUID,
+    study_id: UUID,
+    _claims: dict[str, object] = Depends(cognito_auth_required),
+    db: Session = Depends(get_db),
+) -> list[ContentCounterOut]:
+    """Member, note, comment, like and response counts for a study in one read."""
+    return list_study_counters(db, group_id, study_id)
+
+
+@router.get(
+    "/{study_id}/export",
+    response_class=StreamingResponse,
+    dependencies=[Depends(rate_limit("export"))],
+)
+def export_study(
+    group_id: UUID,
+    study_id: UUID,
+    export_format: Literal["json", "csv", "markdown"] = Query("json", alias="format"),
+    claims: dict[str, object] = Depends(cognito_auth_required),
+    db: Session = Depends(get_db),
+) -> StreamingResponse:
+    """The whole study with this group's responses and notes, streamed as it is read."""
+    user_sub = _get_user_sub(claims)
+    try:
+        study = get_exportable_study(db, group_id, study_id, user_sub)
+    except ValueError as exc:
+        if str(exc) == "study_not_found":
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Study not found",
+            ) from exc
+        if str(exc) == "forbidden":
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Only leaders can export studies",
+            ) from exc
+        raise
+    media_type, extension = EXPORT_FORMATS[export_format]
+    return StreamingResponse(
+        render_export(export_records(db, study, group_id), export_format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="study-{study_id}.{extension}"'},
     )
 
 
+def _study_notes_page(
+    db: Session,
+    group_id: UUID,
+    study_id: UUID,
+    session_id: UUID | None,
+    limit: int,
+    cursor: str | None,
+) -> StudySessionNotePageOut:
+    try:
+        notes, next_cursor = list_study_notes(db, group_id, study_id, session_id, limit, cursor)
+    except ValueError as exc:
+        if str(exc) == "invalid_cursor":
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor",
+            ) from exc
+        raise
+    return StudySessionNotePageOut(items=notes, next_cursor=next_cursor)
+
+
 @router.post("", response_model=StudyOut, status_code=status.HTTP_201_CREATED)
 def post_study(
     group_id: UUID,
@@ -76,6 +198,52 @@ def post_study(
         raise
 
 
+@router.post(
+    "/import",
+    response_model=StudyImportOut,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(rate_limit("import"))],
+    openapi_extra={"requestBody": {"content": {"text/csv": {"schema": {"type": "string"}}}, "required": True}},
+)
+async def import_study(
+    group_id: UUID,
+    request: Request,
+    title: str | None = Query(None, min_length=1, max_length=150, description="Defaults to the archived title."),
+    claims: dict[str, object] = Depends(cognito_auth_required),
+    db: Session = Depends(get_db),
+) -> StudyImportOut:
+    """Create a study from a CSV export (format=csv), sent as the request body."""
+    user_sub = _get_user_sub(claims)
+    try:
+        await run_in_threadpool(ensure_can_import, db, group_id, user_sub)
+        with tempfile.SpooledTemporaryFile(max_size=IMPORT_SPOOL_BYTES) as archive:
+            received = 0
+            async for chunk in request.stream():
+                received += len(chunk)
+                if received > IMPORT_MAX_BYTES:
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail=f"Archives are limited to {IMPORT_MAX_BYTES} bytes",
+                    )
+                archive.write(chunk)
+            archive.seek(0)
+            lines = io.TextIOWrapper(archive, encoding="utf-8-sig", newline="")
+            study, counts = await run_in_threadpool(import_study_archive, db, group_id, user_sub, lines, title)
+    except ValueError as exc:
+        if str(exc) == "forbidden":
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Only leaders can import studies",
+            ) from exc
+        if str(exc) == "invalid_archive":
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Not a valid study archive",
+            ) from exc
+        raise
+    return StudyImportOut(study=StudyOut.model_validate(study), counts=counts)
+
+
 @router.patch("/{study_id}", response_model=StudyOut)
 def patch_study(
     group_id: UUID,
@@ -108,15 +276,23 @@ def patch_study(
         raise
 
 
-@router.delete("/{study_id}", status_code=status.HTTP_204_NO_CONTENT)
+@router.delete("/{study_id}", status_code=status.HTTP_204_NO_CONTENT, response_model=None)
 def delete_study_route(
     group_id: UUID,
     study_id: UUID,
+    background: bool = Query(
+        False,
+        description="Answer 202 with a job and delete in batches from a worker; for very large studies.",
+    ),
     claims: dict[str, object] = Depends(cognito_auth_required),
     db: Session = Depends(get_db),
-) -> None:
+) -> Response | None:
     user_sub = _get_user_sub(claims)
     try:
+        if background:
+            get_deletable_study(db, study_id, user_sub)
+            job = enqueue(db, "delete_study", {"study_id": str(study_id)}, user_sub)
+            return _accepted(job)
         delete_study(db, study_id, user_sub)
     except ValueError as exc:
         if str(exc) == "study_not_found":
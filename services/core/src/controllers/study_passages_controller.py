@@ -1,11 +1,14 @@
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from auth.cognito import cognito_auth_required
 from db import get_db
+from middleware.compression import cache_compressed
 from models.group_member import GroupMember
 from models.group_session import GroupSession
 from models.group_study import GroupStudy
@@ -14,6 +17,7 @@ from models.study_passage import StudyPassage
 from models.study_passage_comment import StudyPassageComment
 from models.study_passage_like import StudyPassageLike
 from models.study_session import StudySession
+from ratelimit.limiter import rate_limit
 from schemas.study_passage_comments import (
     StudyPassageCommentCreate,
     StudyPassageCommentOut,
@@ -21,6 +25,17 @@ from schemas.study_passage_comments import (
 )
 from schemas.study_passage_likes import StudyPassageLikeOut
 from schemas.study_passages import StudyPassageCreate, StudyPassageOut, StudyPassageUpdate
+from services.counters_service import KIND_COMMENTS, KIND_LIKES, SCOPE_PASSAGE, bump_counter
+from services.fields import fetch_all, fields_param, select_fields
+from services.versioning import format_etag, parse_if_match, update_authored
+from services.idempotency_service import (
+    find_stored_response,
+    replay_response,
+    request_fingerprint,
+    save_response,
+)
+from services.soft_delete import soft_delete
+from services.writes import commit_created
 from services.study_passages_service import (
     create_passage,
     delete_passage,
@@ -97,13 +112,17 @@ def _is_group_member(db: Session, group_id: UUID, user_sub: str) -> bool:
     return membership is not None
 
 
-@router.get("", response_model=list[StudyPassageOut])
+@router.get("", response_model=list[StudyPassageOut], dependencies=[Depends(cache_compressed)])
 def get_passages(
     session_id: UUID,
     _claims: dict[str, object] = Depends(cognito_auth_required),
+    selected: tuple[str, ...] | None = Depends(fields_param(StudyPassageOut)),
     db: Session = Depends(get_db),
 ) -> list[StudyPassageOut]:
-    return list_passages(db, session_id)
+    passages = list_passages(db, session_id, selected)
+    if selected is not None:
+        return JSONResponse(jsonable_encoder(passages))
+    return passages
 
 
 @router.post("", response_model=StudyPassageOut, status_code=status.HTTP_201_CREATED)
@@ -175,12 +194,14 @@ def patch_passage(
     session_id: UUID,
     passage_id: UUID,
     payload: StudyPassageUpdate,
+    http_response: Response,
+    if_match: str | None = Header(None),
     claims: dict[str, object] = Depends(cognito_auth_required),
     db: Session = Depends(get_db),
 ) -> StudyPassageOut:
     user_sub = _get_user_sub(claims)
     try:
-        return update_passage(
+        passage = update_passage(
             db,
             passage_id,
             user_sub,
@@ -190,8 +211,14 @@ def patch_passage(
             payload.end_verse,
             payload.version,
             payload.text,
+            parse_if_match(if_match),
         )
     except ValueError as exc:
+        if str(exc) == "invalid_if_match":
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid If-Match header",
+            ) from exc
         if str(exc) == "passage_not_found":
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -207,8 +234,16 @@ def patch_passage(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Only leaders can update passages",
             ) from exc
+        if str(exc) == "version_conflict":
+            raise HTTPException(
+                status_code=status.HTTP_412_PRECONDITION_FAILED,
+                detail="Passage was modified by another request",
+            ) from exc
         raise
 
+    http_response.headers["ETag"] = format_etag(passage.row_version)
+    return passage
+
 
 @router.get("/{passage_id}/likes", response_model=list[StudyPassageLikeOut])
 def get_likes(
@@ -228,7 +263,12 @@ def get_likes(
     )
 
 
-@router.post("/{passage_id}/likes", response_model=StudyPassageLikeOut, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/{passage_id}/likes",
+    response_model=StudyPassageLikeOut,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(rate_limit("likes"))],
+)
 def post_like(
     session_id: UUID,
     passage_id: UUID,
@@ -277,12 +317,16 @@ def post_like(
         user_sub=user_sub,
     )
     db.add(item)
-    db.commit()
-    db.refresh(item)
+    bump_counter(db, group_id, SCOPE_PASSAGE, passage_id, KIND_LIKES, 1)
+    commit_created(db, item)
     return item
 
 
-@router.delete("/{passage_id}/likes/{like_id}", status_code=status.HTTP_204_NO_CONTENT)
+@router.delete(
+    "/{passage_id}/likes/{like_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    dependencies=[Depends(rate_limit("likes"))],
+)
 def delete_like_route(
     session_id: UUID,
     passage_id: UUID,
@@ -304,6 +348,7 @@ def delete_like_route(
             detail="Only the author can remove this like",
         )
 
+    bump_counter(db, item.group_id, SCOPE_PASSAGE, item.passage_id, KIND_LIKES, -1)
     db.delete(item)
     db.commit()
     return None
@@ -315,28 +360,45 @@ def get_comments(
     passage_id: UUID,
     group_id: UUID,
     _claims: dict[str, object] = Depends(cognito_auth_required),
+    selected: tuple[str, ...] | None = Depends(fields_param(StudyPassageCommentOut)),
     db: Session = Depends(get_db),
 ) -> list[StudyPassageCommentOut]:
-    return list(
-        db.scalars(
-            select(StudyPassageComment).where(
-                StudyPassageComment.passage_id == passage_id,
-                StudyPassageComment.group_id == group_id,
-            )
-        )
+    comments = fetch_all(
+        db,
+        select_fields(StudyPassageComment, selected).where(
+            StudyPassageComment.passage_id == passage_id,
+            StudyPassageComment.group_id == group_id,
+            StudyPassageComment.deleted_at.is_(None),
+        ),
+        selected,
     )
+    if selected is not None:
+        return JSONResponse(jsonable_encoder(comments))
+    return comments
 
 
-@router.post("/{passage_id}/comments", response_model=StudyPassageCommentOut, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/{passage_id}/comments",
+    response_model=StudyPassageCommentOut,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(rate_limit("comments"))],
+)
 def post_comment(
     session_id: UUID,
     passage_id: UUID,
     group_id: UUID,
     payload: StudyPassageCommentCreate,
+    idempotency_key: str | None = Header(None),
     claims: dict[str, object] = Depends(cognito_auth_required),
     db: Session = Depends(get_db),
 ) -> StudyPassageCommentOut:
     user_sub = _get_user_sub(claims)
+    request_hash = request_fingerprint("post_comment", session_id, passage_id, group_id, payload.model_dump())
+    if idempotency_key is not None:
+        stored = find_stored_response(db, user_sub, idempotency_key, request_hash)
+        if stored is not None:
+            return replay_response(stored)
+
     passage = db.get(StudyPassage, passage_id)
     if not passage:
         raise HTTPException(
@@ -368,41 +430,75 @@ def post_comment(
         comment=payload.comment,
     )
     db.add(item)
-    db.commit()
-    db.refresh(item)
+    bump_counter(db, group_id, SCOPE_PASSAGE, passage_id, KIND_COMMENTS, 1)
+    if idempotency_key is not None:
+        db.flush()
+        body = jsonable_encoder(StudyPassageCommentOut.model_validate(item))
+        if not save_response(db, user_sub, idempotency_key, request_hash, status.HTTP_201_CREATED, body):
+            # A concurrent retry with the same key won; keep its row, not ours.
+            db.rollback()
+            return replay_response(find_stored_response(db, user_sub, idempotency_key, request_hash))
+    commit_created(db, item)
     return item
 
 
-@router.patch("/{passage_id}/comments/{comment_id}", response_model=StudyPassageCommentOut)
+@router.patch(
+    "/{passage_id}/comments/{comment_id}",
+    response_model=StudyPassageCommentOut,
+    dependencies=[Depends(rate_limit("comments"))],
+)
 def patch_comment(
     session_id: UUID,
     passage_id: UUID,
     comment_id: UUID,
     payload: StudyPassageCommentUpdate,
+    http_response: Response,
+    if_match: str | None = Header(None),
     claims: dict[str, object] = Depends(cognito_auth_required),
     db: Session = Depends(get_db),
 ) -> StudyPassageCommentOut:
     user_sub = _get_user_sub(claims)
-    item = db.get(StudyPassageComment, comment_id)
-    if not item:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Comment not found",
-        )
-
-    if item.user_sub != user_sub:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only the author can update this comment",
+    try:
+        item = update_authored(
+            db,
+            StudyPassageComment,
+            comment_id,
+            user_sub,
+            parse_if_match(if_match),
+            {"comment": payload.comment},
         )
+    except ValueError as exc:
+        if str(exc) == "invalid_if_match":
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid If-Match header",
+            ) from exc
+        if str(exc) == "not_found":
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Comment not found",
+            ) from exc
+        if str(exc) == "forbidden":
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Only the author can update this comment",
+            ) from exc
+        if str(exc) == "version_conflict":
+            raise HTTPException(
+                status_code=status.HTTP_412_PRECONDITION_FAILED,
+                detail="Comment was modified by another request",
+            ) from exc
+        raise
 
-    item.comment = payload.comment
-    db.commit()
-    db.refresh(item)
+    http_response.headers["ETag"] = format_etag(item.row_version)
     return item
 
 
-@router.delete("/{passage_id}/comments/{comment_id}", status_code=status.HTTP_204_NO_CONTENT)
+@router.delete(
+    "/{passage_id}/comments/{comment_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    dependencies=[Depends(rate_limit("comments"))],
+)
 def delete_comment_route(
     session_id: UUID,
     passage_id: UUID,
@@ -412,7 +508,7 @@ def delete_comment_route(
 ) -> None:
     user_sub = _get_user_sub(claims)
     item = db.get(StudyPassageComment, comment_id)
-    if not item:
+    if not item or item.deleted_at is not None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Comment not found",
@@ -424,6 +520,8 @@ def delete_comment_route(
             detail="Only the author can delete this comment",
         )
 
-    db.delete(item)
+    # Only marked here; jobs.purge_deleted_content removes the row later.
+    if soft_delete(db, StudyPassageComment, StudyPassageComment.passage_id, StudyPassageComment.id == item.id):
+        bump_counter(db, item.group_id, SCOPE_PASSAGE, item.passage_id, KIND_COMMENTS, -1)
     db.commit()
     return None
@@ -1,11 +1,14 @@
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from auth.cognito import cognito_auth_required
 from db import get_db
+from middleware.compression import cache_compressed
 from models.group_member import GroupMember
 from models.study import Study
 from models.study_question import StudyQuestion
@@ -13,6 +16,7 @@ from models.group_session import GroupSession
 from models.group_study import GroupStudy
 from models.study_question_response import StudyQuestionResponse
 from models.study_session import StudySession
+from ratelimit.limiter import rate_limit
 from schemas.study_question_responses import (
     StudyQuestionResponseCreate,
     StudyQuestionResponseOut,
@@ -20,13 +24,28 @@ from schemas.study_question_responses import (
 )
 from schemas.study_questions import (
     StudyQuestionCreate,
+    StudyQuestionMove,
     StudyQuestionOut,
+    StudyQuestionReorderItem,
     StudyQuestionUpdate,
 )
+from services.counters_service import KIND_RESPONSES, SCOPE_QUESTION, bump_counter
+from services.versioning import format_etag, parse_if_match, update_authored
+from services.fields import fetch_all, fields_param, select_fields
+from services.idempotency_service import (
+    find_stored_response,
+    replay_response,
+    request_fingerprint,
+    save_response,
+)
+from services.soft_delete import response_thread, soft_delete
+from services.writes import commit_created
 from services.study_questions_service import (
     create_question,
     delete_question,
     list_questions,
+    move_question,
+    reorder_questions,
     update_question,
 )
 
@@ -99,13 +118,17 @@ def _is_group_member(db: Session, group_id: UUID, user_sub: str) -> bool:
     return membership is not None
 
 
-@router.get("", response_model=list[StudyQuestionOut])
+@router.get("", response_model=list[StudyQuestionOut], dependencies=[Depends(cache_compressed)])
 def get_questions(
     session_id: UUID,
     _claims: dict[str, object] = Depends(cognito_auth_required),
+    selected: tuple[str, ...] | None = Depends(fields_param(StudyQuestionOut)),
     db: Session = Depends(get_db),
 ) -> list[StudyQuestionOut]:
-    return list_questions(db, session_id)
+    questions = list_questions(db, session_id, selected)
+    if selected is not None:
+        return JSONResponse(jsonable_encoder(questions))
+    return questions
 
 
 @router.post("", response_model=StudyQuestionOut, status_code=status.HTTP_201_CREATED)
@@ -138,6 +161,66 @@ def post_question(
         raise
 
 
+@router.put("/reorder", response_model=list[StudyQuestionOut])
+def put_reorder_questions(
+    session_id: UUID,
+    payload: list[StudyQuestionReorderItem],
+    claims: dict[str, object] = Depends(cognito_auth_required),
+    db: Session = Depends(get_db),
+) -> list[StudyQuestionOut]:
+    user_sub = _get_user_sub(claims)
+    try:
+        updates = [(item.id, item.position) for item in payload]
+        return reorder_questions(db, session_id, user_sub, updates)
+    except ValueError as exc:
+        if str(exc) == "session_not_found":
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Session not found",
+            ) from exc
+        if str(exc) == "forbidden":
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Only leaders can reorder questions",
+            ) from exc
+        raise
+
+
+@router.post("/{question_id}/move", response_model=StudyQuestionOut)
+def post_move_question(
+    session_id: UUID,
+    question_id: UUID,
+    payload: StudyQuestionMove,
+    claims: dict[str, object] = Depends(cognito_auth_required),
+    db: Session = Depends(get_db),
+) -> StudyQuestionOut:
+    user_sub = _get_user_sub(claims)
+    try:
+        return move_question(db, session_id, question_id, user_sub, payload.after_id)
+    except ValueError as exc:
+        if str(exc) == "session_not_found":
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Session not found",
+            ) from exc
+        if str(exc) == "question_not_found":
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Question not found",
+            ) from exc
+        if str(exc) == "anchor_not_found":
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="after_id is not a question of this session",
+            ) from exc
+        if str(exc) == "forbidden":
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Only leaders can reorder questions",
+            ) from exc
+        raise
+
+
 @router.delete("/{question_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_question_route(
     session_id: UUID,
@@ -211,31 +294,44 @@ def get_responses(
     group_id: UUID,
     parent_response_id: UUID | None = None,
     _claims: dict[str, object] = Depends(cognito_auth_required),
+    selected: tuple[str, ...] | None = Depends(fields_param(StudyQuestionResponseOut)),
     db: Session = Depends(get_db),
 ) -> list[StudyQuestionResponseOut]:
-    query = select(StudyQuestionResponse).where(
+    query = select_fields(StudyQuestionResponse, selected).where(
         StudyQuestionResponse.question_id == question_id,
         StudyQuestionResponse.group_id == group_id,
+        StudyQuestionResponse.deleted_at.is_(None),
     )
     if parent_response_id is not None:
         query = query.where(StudyQuestionResponse.parent_response_id == parent_response_id)
-    return list(db.scalars(query))
+    responses = fetch_all(db, query, selected)
+    if selected is not None:
+        return JSONResponse(jsonable_encoder(responses))
+    return responses
 
 
 @router.post(
     "/{question_id}/responses",
     response_model=StudyQuestionResponseOut,
     status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(rate_limit("responses"))],
 )
 def post_response(
     session_id: UUID,
     question_id: UUID,
     group_id: UUID,
     payload: StudyQuestionResponseCreate,
+    idempotency_key: str | None = Header(None),
     claims: dict[str, object] = Depends(cognito_auth_required),
     db: Session = Depends(get_db),
 ) -> StudyQuestionResponseOut:
     user_sub = _get_user_sub(claims)
+    request_hash = request_fingerprint("post_response", session_id, question_id, group_id, payload.model_dump())
+    if idempotency_key is not None:
+        stored = find_stored_response(db, user_sub, idempotency_key, request_hash)
+        if stored is not None:
+            return replay_response(stored)
+
     question = db.get(StudyQuestion, question_id)
     if not question:
         raise HTTPException(
@@ -251,7 +347,12 @@ def post_response(
 
     if payload.parent_response_id is not None:
         parent = db.get(StudyQuestionResponse, payload.parent_response_id)
-        if not parent or parent.question_id != question_id or parent.group_id != group_id:
+        if (
+            not parent
+            or parent.deleted_at is not None
+            or parent.question_id != question_id
+            or parent.group_id != group_id
+        ):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Invalid parent response",
@@ -267,41 +368,75 @@ def post_response(
         response=payload.response,
     )
     db.add(item)
-    db.commit()
-    db.refresh(item)
+    bump_counter(db, group_id, SCOPE_QUESTION, question_id, KIND_RESPONSES, 1)
+    if idempotency_key is not None:
+        db.flush()
+        body = jsonable_encoder(StudyQuestionResponseOut.model_validate(item))
+        if not save_response(db, user_sub, idempotency_key, request_hash, status.HTTP_201_CREATED, body):
+            # A concurrent retry with the same key won; keep its row, not ours.
+            db.rollback()
+            return replay_response(find_stored_response(db, user_sub, idempotency_key, request_hash))
+    commit_created(db, item)
     return item
 
 
-@router.patch("/{question_id}/responses/{response_id}", response_model=StudyQuestionResponseOut)
+@router.patch(
+    "/{question_id}/responses/{response_id}",
+    response_model=StudyQuestionResponseOut,
+    dependencies=[Depends(rate_limit("responses"))],
+)
 def patch_response(
     session_id: UUID,
     question_id: UUID,
     response_id: UUID,
     payload: StudyQuestionResponseUpdate,
+    http_response: Response,
+    if_match: str | None = Header(None),
     claims: dict[str, object] = Depends(cognito_auth_required),
     db: Session = Depends(get_db),
 ) -> StudyQuestionResponseOut:
     user_sub = _get_user_sub(claims)
-    item = db.get(StudyQuestionResponse, response_id)
-    if not item:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Response not found",
-        )
-
-    if item.user_sub != user_sub:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only the author can update this response",
+    try:
+        item = update_authored(
+            db,
+            StudyQuestionResponse,
+            response_id,
+            user_sub,
+            parse_if_match(if_match),
+            {"response": payload.response},
         )
+    except ValueError as exc:
+        if str(exc) == "invalid_if_match":
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid If-Match header",
+            ) from exc
+        if str(exc) == "not_found":
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Response not found",
+            ) from exc
+        if str(exc) == "forbidden":
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Only the author can update this response",
+            ) from exc
+        if str(exc) == "version_conflict":
+            raise HTTPException(
+                status_code=status.HTTP_412_PRECONDITION_FAILED,
+                detail="Response was modified by another request",
+            ) from exc
+        raise
 
-    item.response = payload.response
-    db.commit()
-    db.refresh(item)
+    http_response.headers["ETag"] = format_etag(item.row_version)
     return item
 
 
-@router.delete("/{question_id}/responses/{response_id}", status_code=status.HTTP_204_NO_CONTENT)
+@router.delete(
+    "/{question_id}/responses/{response_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    dependencies=[Depends(rate_limit("responses"))],
+)
 def delete_response_route(
     session_id: UUID,
     question_id: UUID,
@@ -311,7 +446,7 @@ def delete_response_route(
 ) -> None:
     user_sub = _get_user_sub(claims)
     item = db.get(StudyQuestionResponse, response_id)
-    if not item:
+    if not item or item.deleted_at is not None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Response not found",
@@ -323,6 +458,13 @@ def delete_response_route(
             detail="Only the author can delete this response",
         )
 
-    db.delete(item)
+    # Replies are marked with their parent; jobs.purge_deleted_content removes the rows later.
+    removed = soft_delete(
+        db,
+        StudyQuestionResponse,
+        StudyQuestionResponse.question_id,
+        StudyQuestionResponse.id.in_(response_thread(StudyQuestionResponse.id == item.id)),
+    )
+    bump_counter(db, item.group_id, SCOPE_QUESTION, item.question_id, KIND_RESPONSES, -sum(removed.values()))
     db.commit()
     return None
@@ -1,6 +1,8 @@
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
@@ -11,6 +13,18 @@ from models.group_session import GroupSession
 from models.group_study import GroupStudy
 from models.study_session import StudySession
 from models.study_session_note import StudySessionNote
+from ratelimit.limiter import rate_limit
+from services.counters_service import KIND_NOTES, SCOPE_SESSION, bump_counter
+from services.fields import fetch_all, fields_param, select_fields
+from services.versioning import format_etag, parse_if_match, update_authored
+from services.idempotency_service import (
+    find_stored_response,
+    replay_response,
+    request_fingerprint,
+    save_response,
+)
+from services.soft_delete import soft_delete
+from services.writes import commit_created
 from schemas.study_session_notes import (
     StudySessionNoteCreate,
     StudySessionNoteOut,
@@ -78,27 +92,44 @@ def get_notes(
     session_id: UUID,
     group_id: UUID,
     _claims: dict[str, object] = Depends(cognito_auth_required),
+    selected: tuple[str, ...] | None = Depends(fields_param(StudySessionNoteOut)),
     db: Session = Depends(get_db),
 ) -> list[StudySessionNoteOut]:
-    return list(
-        db.scalars(
-            select(StudySessionNote).where(
-                StudySessionNote.session_id == session_id,
-                StudySessionNote.group_id == group_id,
-            )
-        )
+    notes = fetch_all(
+        db,
+        select_fields(StudySessionNote, selected).where(
+            StudySessionNote.session_id == session_id,
+            StudySessionNote.group_id == group_id,
+            StudySessionNote.deleted_at.is_(None),
+        ),
+        selected,
     )
+    if selected is not None:
+        return JSONResponse(jsonable_encoder(notes))
+    return notes
 
 
-@router.post("", response_model=StudySessionNoteOut, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "",
+    response_model=StudySessionNoteOut,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(rate_limit("notes"))],
+)
 def post_note(
     session_id: UUID,
     group_id: UUID,
     payload: StudySessionNoteCreate,
+    idempotency_key: str | None = Header(None),
     claims: dict[str, object] = Depends(cognito_auth_required),
     db: Session = Depends(get_db),
 ) -> StudySessionNoteOut:
     user_sub = _get_user_sub(claims)
+    request_hash = request_fingerprint("post_note", session_id, group_id, payload.model_dump())
+    if idempotency_key is not None:
+        stored = find_stored_response(db, user_sub, idempotency_key, request_hash)
+        if stored is not None:
+            return replay_response(stored)
+
     if not _is_group_member(db, group_id, user_sub):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -114,48 +145,84 @@ def post_note(
                 detail="Session not found",
             ) from exc
         raise
+    session = db.get(StudySession, session_id)
     item = StudySessionNote(
         session_id=session_id,
+        study_id=session.study_id,
         group_session_id=group_session.id,
         group_id=group_id,
         user_sub=user_sub,
         note=payload.note,
     )
     db.add(item)
-    db.commit()
-    db.refresh(item)
+    bump_counter(db, group_id, SCOPE_SESSION, session_id, KIND_NOTES, 1)
+    if idempotency_key is not None:
+        db.flush()
+        body = jsonable_encoder(StudySessionNoteOut.model_validate(item))
+        if not save_response(db, user_sub, idempotency_key, request_hash, status.HTTP_201_CREATED, body):
+            # A concurrent retry with the same key won; keep its row, not ours.
+            db.rollback()
+            return replay_response(find_stored_response(db, user_sub, idempotency_key, request_hash))
+    commit_created(db, item)
     return item
 
 
-@router.patch("/{note_id}", response_model=StudySessionNoteOut)
+@router.patch(
+    "/{note_id}",
+    response_model=StudySessionNoteOut,
+    dependencies=[Depends(rate_limit("notes"))],
+)
 def patch_note(
     session_id: UUID,
     note_id: UUID,
     payload: StudySessionNoteUpdate,
+    http_response: Response,
+    if_match: str | None = Header(None),
     claims: dict[str, object] = Depends(cognito_auth_required),
     db: Session = Depends(get_db),
 ) -> StudySessionNoteOut:
     user_sub = _get_user_sub(claims)
-    item = db.get(StudySessionNote, note_id)
-    if not item:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Note not found",
-        )
-
-    if item.user_sub != user_sub:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only the author can update this note",
+    try:
+        item = update_authored(
+            db,
+            StudySessionNote,
+            note_id,
+            user_sub,
+            parse_if_match(if_match),
+            {"note": payload.note},
         )
+    except ValueError as exc:
+        if str(exc) == "invalid_if_match":
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid If-Match header",
+            ) from exc
+        if str(exc) == "not_found":
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Note not found",
+            ) from exc
+        if str(exc) == "forbidden":
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Only the author can update this note",
+            ) from exc
+        if str(exc) == "version_conflict":
+            raise HTTPException(
+                status_code=status.HTTP_412_PRECONDITION_FAILED,
+                detail="Note was modified by another request",
+            ) from exc
+        raise
 
-    item.note = payload.note
-    db.commit()
-    db.refresh(item)
+    http_response.headers["ETag"] = format_etag(item.row_version)
     return item
 
 
-@router.delete("/{note_id}", status_code=status.HTTP_204_NO_CONTENT)
+@router.delete(
+    "/{note_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    dependencies=[Depends(rate_limit("notes"))],
+)
 def delete_note_route(
     session_id: UUID,
     note_id: UUID,
@@ -164,7 +231,7 @@ def delete_note_route(
 ) -> None:
     user_sub = _get_user_sub(claims)
     item = db.get(StudySessionNote, note_id)
-    if not item:
+    if not item or item.deleted_at is not None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Note not found",
@@ -176,6 +243,8 @@ def delete_note_route(
             detail="Only the author can delete this note",
         )
 
-    db.delete(item)
+    # Only marked here; jobs.purge_deleted_content removes the row later.
+    if soft_delete(db, StudySessionNote, StudySessionNote.session_id, StudySessionNote.id == item.id):
+        bump_counter(db, item.group_id, SCOPE_SESSION, item.session_id, KIND_NOTES, -1)
     db.commit()
     return None
@@ -1,20 +1,29 @@
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 
 from auth.cognito import cognito_auth_required
 from db import get_db
+from models.job import Job
+from schemas.jobs import JobOut
 from schemas.study_sessions import (
     StudySessionCreate,
+    StudySessionMove,
     StudySessionOut,
     StudySessionReorderItem,
     StudySessionUpdate,
 )
+from services.fields import fields_param
+from services.job_queue import enqueue
 from services.study_sessions_service import (
     create_session,
     delete_session,
+    get_deletable_session,
     list_sessions,
+    move_session,
     reorder_sessions,
     update_session,
 )
@@ -32,13 +41,25 @@ def _get_user_sub(claims: dict[str, object]) -> str:
     return user_sub
 
 
+def _accepted(job: Job) -> JSONResponse:
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content=jsonable_encoder(JobOut.model_validate(job)),
+        headers={"Location": f"/jobs/{job.id}"},
+    )
+
+
 @router.get("", response_model=list[StudySessionOut])
 def get_sessions(
     study_id: UUID,
     _claims: dict[str, object] = Depends(cognito_auth_required),
+    selected: tuple[str, ...] | None = Depends(fields_param(StudySessionOut)),
     db: Session = Depends(get_db),
 ) -> list[StudySessionOut]:
-    return list_sessions(db, study_id)
+    sessions = list_sessions(db, study_id, selected)
+    if selected is not None:
+        return JSONResponse(jsonable_encoder(sessions))
+    return sessions
 
 
 @router.post("", response_model=StudySessionOut, status_code=status.HTTP_201_CREATED)
@@ -134,15 +155,58 @@ def put_reorder_sessions(
         raise
 
 
-@router.delete("/{session_id}", status_code=status.HTTP_204_NO_CONTENT)
+@router.post("/{session_id}/move", response_model=StudySessionOut)
+def post_move_session(
+    study_id: UUID,
+    session_id: UUID,
+    payload: StudySessionMove,
+    claims: dict[str, object] = Depends(cognito_auth_required),
+    db: Session = Depends(get_db),
+) -> StudySessionOut:
+    user_sub = _get_user_sub(claims)
+    try:
+        return move_session(db, study_id, session_id, user_sub, payload.after_id)
+    except ValueError as exc:
+        if str(exc) == "study_not_found":
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Study not found",
+            ) from exc
+        if str(exc) == "session_not_found":
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Session not found",
+            ) from exc
+        if str(exc) == "anchor_not_found":
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="after_id is not a session of this study",
+            ) from exc
+        if str(exc) == "forbidden":
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Only leaders can reorder sessions",
+            ) from exc
+        raise
+
+
+@router.delete("/{session_id}", status_code=status.HTTP_204_NO_CONTENT, response_model=None)
 def delete_session_route(
     study_id: UUID,
     session_id: UUID,
+    background: bool = Query(
+        False,
+        description="Answer 202 with a job and delete in batches from a worker; for very large sessions.",
+    ),
     claims: dict[str, object] = Depends(cognito_auth_required),
     db: Session = Depends(get_db),
-) -> None:
+) -> Response | None:
     user_sub = _get_user_sub(claims)
     try:
+        if background:
+            get_deletable_session(db, session_id, user_sub)
+            job = enqueue(db, "delete_session", {"session_id": str(session_id)}, user_sub)
+            return _accepted(job)
         delete_session(db, session_id, user_sub)
     except ValueError as exc:
         if str(exc) == "session_not_found":
@@ -0,0 +1,59 @@
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+
+from auth.cognito import cognito_auth_required
+from db import get_db
+from ratelimit.limiter import rate_limit
+from services.sync_service import sync_session
+from schemas.sync import SyncOut, SyncRequest
+
+router = APIRouter(prefix="/sessions/{session_id}/sync", tags=["sync"])
+
+
+def _get_user_sub(claims: dict[str, object]) -> str:
+    user_sub = claims.get("sub")
+    if not isinstance(user_sub, str):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Missing user sub",
+        )
+    return user_sub
+
+
+@router.post("", response_model=SyncOut, dependencies=[Depends(rate_limit("sync"))])
+def post_sync(
+    session_id: UUID,
+    group_id: UUID,
+    payload: SyncRequest,
+    claims: dict[str, object] = Depends(cognito_auth_required),
+    db: Session = Depends(get_db),
+) -> SyncOut:
+    user_sub = _get_user_sub(claims)
+    try:
+        return sync_session(
+            db,
+            session_id,
+            group_id,
+            user_sub,
+            payload.since,
+            [change.model_dump() for change in payload.changes],
+        )
+    except ValueError as exc:
+        if str(exc) == "session_not_found":
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Session not found",
+            ) from exc
+        if str(exc) == "forbidden":
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Only group members can sync this session",
+            ) from exc
+        if str(exc) == "invalid_sync_token":
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid sync token",
+            ) from exc
+        raise
@@ -11,7 +11,15 @@ DATABASE_URL = os.getenv(
 
 engine = create_engine(DATABASE_URL, pool_pre_ping=True)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-Base = declarative_base()
+
+
+class _ModelBase:
+    # Fetch server-generated columns (created_at, updated_at, ...) with
+    # INSERT/UPDATE ... RETURNING instead of a follow-up SELECT.
+    __mapper_args__ = {"eager_defaults": True}
+
+
+Base = declarative_base(cls=_ModelBase)
 
 
 def get_db() -> Generator[Session, None, None]:
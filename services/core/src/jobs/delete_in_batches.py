@@ -0,0 +1,53 @@
+"""Delete a large study or session in batches.
+
+``DELETE ...?background=true`` answers 202 and queues a delete_study or
+delete_session job, which jobs.worker runs. They can also be run (or
+resumed) from ``src``::
+
+    python -m jobs.delete_in_batches study 6f1c...
+    python -m jobs.delete_in_batches session 0b7e... --batch-size 2000
+"""
+import argparse
+import logging
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from db import SessionLocal
+from services.batched_deletes import DELETE_BATCH_SIZE, delete_session_in_batches, delete_study_in_batches
+from services.job_queue import job_handler
+
+logger = logging.getLogger("core.jobs")
+
+
+@job_handler("delete_study")
+def run_delete_study(db: Session, payload: dict[str, Any]) -> dict[str, int]:
+    study_id = UUID(payload["study_id"])
+    deleted = delete_study_in_batches(db, study_id)
+    logger.info("deleted study %s (%s rows)", study_id, deleted)
+    return {"deleted": deleted}
+
+
+@job_handler("delete_session")
+def run_delete_session(db: Session, payload: dict[str, Any]) -> dict[str, int]:
+    session_id = UUID(payload["session_id"])
+    deleted = delete_session_in_batches(db, session_id)
+    logger.info("deleted session %s (%s rows)", session_id, deleted)
+    return {"deleted": deleted}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Delete a study or session in batches")
+    parser.add_argument("kind", choices=["study", "session"])
+    parser.add_argument("id", type=UUID)
+    parser.add_argument("--batch-size", type=int, default=DELETE_BATCH_SIZE)
+    args = parser.parse_args()
+
+    delete = delete_study_in_batches if args.kind == "study" else delete_session_in_batches
+    with SessionLocal() as db:
+        print(f"deleted {delete(db, args.id, args.batch_size)} rows")
+
+
+if __name__ == "__main__":
+    main()
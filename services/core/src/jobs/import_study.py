@@ -0,0 +1,36 @@
+"""Import a study archive (a CSV export) into a group from ``src``::
+
+    python -m jobs.import_study curriculum.csv --group-id 6f1c... --user-sub <leader sub>
+    python -m jobs.import_study - --group-id 6f1c... --user-sub <leader sub> --title "Romans" < romans.csv
+"""
+import argparse
+import sys
+import time
+from uuid import UUID
+
+from db import SessionLocal
+from services.study_import import import_study_archive
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Import a study archive")
+    parser.add_argument("archive", help="CSV file, or - for stdin")
+    parser.add_argument("--group-id", type=UUID, required=True)
+    parser.add_argument("--user-sub", required=True, help="a leader of the group")
+    parser.add_argument("--title", help="defaults to the archived title")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    with SessionLocal() as db:
+        if args.archive == "-":
+            study, counts = import_study_archive(db, args.group_id, args.user_sub, sys.stdin, args.title)
+        else:
+            with open(args.archive, encoding="utf-8-sig", newline="") as archive:
+                study, counts = import_study_archive(db, args.group_id, args.user_sub, archive, args.title)
+    print(f"imported study {study.id} in {time.perf_counter() - started:.1f}s")
+    for table, rows in counts.items():
+        print(f"    {table}: {rows}")
+
+
+if __name__ == "__main__":
+    main()
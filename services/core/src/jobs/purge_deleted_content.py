@@ -0,0 +1,121 @@
+"""Remove soft-deleted notes, comments and responses.
+
+The API runs this periodically in the background and only while it is
+quiet: each batch waits until few requests are in flight, and a busy round
+is cut short and resumed next time. It can also be run once from ``src``::
+
+    python -m jobs.purge_deleted_content --batch-size 1000
+"""
+import argparse
+import asyncio
+import logging
+import os
+from collections.abc import Callable, Iterable
+from typing import Any
+
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from db import SessionLocal
+from metrics import CallbackGauge, Counter
+from middleware.metrics import IN_FLIGHT
+from services.soft_delete import SOFT_DELETED_MODELS, purge_backlog, purge_deleted
+
+logger = logging.getLogger("core.jobs")
+
+PURGE_INTERVAL_SECONDS = float(os.getenv("CONTENT_PURGE_INTERVAL_SECONDS", "60"))
+PURGE_BATCH_SIZE = int(os.getenv("CONTENT_PURGE_BATCH_SIZE", "500"))
+PURGE_MAX_BATCHES = int(os.getenv("CONTENT_PURGE_MAX_BATCHES", "20"))
+# Batches only run while at most this many API requests are being served.
+PURGE_MAX_IN_FLIGHT = int(os.getenv("CONTENT_PURGE_MAX_IN_FLIGHT", "2"))
+
+PURGED_ROWS = Counter("content_purged_rows_total", "Soft-deleted rows removed by the purge worker.", ["table"])
+PURGE_DEFERRED = Counter("content_purge_deferred_total", "Purge rounds cut short because the API was busy.")
+
+# Refreshed at the end of every round; scrapes never query the database.
+_backlog: dict[str, int] = {}
+
+
+def _collect_backlog() -> Iterable[tuple[tuple[str, ...], float]]:
+    for table, rows in _backlog.items():
+        yield (table,), rows
+
+
+PURGE_BACKLOG = CallbackGauge(
+    "content_purge_backlog_rows",
+    "Soft-deleted rows waiting to be purged, as of the last purge round.",
+    ["table"],
+    _collect_backlog,
+)
+
+
+def _api_is_quiet() -> bool:
+    return IN_FLIGHT.labels().value() <= PURGE_MAX_IN_FLIGHT
+
+
+def _purge_table(
+    db: Session,
+    model: Any,
+    batch_size: int,
+    max_batches: int,
+    is_quiet: Callable[[], bool],
+) -> tuple[int, bool]:
+    """(rows purged, whether the API got busy) for one table."""
+    purged = 0
+    for _ in range(max_batches):
+        if not is_quiet():
+            return purged, True
+        count = purge_deleted(db, model, batch_size)
+        PURGED_ROWS.labels(model.__tablename__).inc(count)
+        purged += count
+        if count < batch_size:
+            break
+    return purged, False
+
+
+def purge_once(
+    batch_size: int = PURGE_BATCH_SIZE,
+    max_batches: int = PURGE_MAX_BATCHES,
+    is_quiet: Callable[[], bool] = lambda: True,
+) -> int:
+    """Purge up to `max_batches` batches per table, stopping early when busy."""
+    purged = 0
+    with SessionLocal() as db:
+        for model in SOFT_DELETED_MODELS:
+            count, busy = _purge_table(db, model, batch_size, max_batches, is_quiet)
+            purged += count
+            if busy:
+                PURGE_DEFERRED.inc()
+                break
+        _backlog.update(purge_backlog(db))
+    return purged
+
+
+async def purge_periodically() -> None:
+    """Background loop started by the API; failures are logged and retried next round."""
+    while True:
+        await asyncio.sleep(PURGE_INTERVAL_SECONDS)
+        if not _api_is_quiet():
+            PURGE_DEFERRED.inc()
+            continue
+        try:
+            purged = await run_in_threadpool(purge_once, is_quiet=_api_is_quiet)
+        except Exception:
+            logger.exception("soft-deleted content purge failed")
+            continue
+        if purged:
+            logger.info("purged %s soft-deleted rows", purged)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Remove soft-deleted notes, comments and responses")
+    parser.add_argument("--batch-size", type=int, default=PURGE_BATCH_SIZE)
+    parser.add_argument("--max-batches", type=int, default=1_000_000, help="per table")
+    args = parser.parse_args()
+    print(f"purged {purge_once(args.batch_size, args.max_batches)} rows")
+    for table, rows in _backlog.items():
+        print(f"    {table}: {rows} still waiting")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Delete expired idempotency keys.
+
+The API runs this periodically in the background; it can also be run once
+from ``src``::
+
+    python -m jobs.purge_idempotency_keys
+"""
+import argparse
+import asyncio
+import logging
+import os
+
+from starlette.concurrency import run_in_threadpool
+
+from db import SessionLocal
+from services.idempotency_service import purge_expired_keys
+
+logger = logging.getLogger("core.jobs")
+
+PURGE_INTERVAL_SECONDS = float(os.getenv("IDEMPOTENCY_GC_INTERVAL_SECONDS", "300"))
+
+
+def purge_once(batch_size: int = 1000) -> int:
+    with SessionLocal() as db:
+        return purge_expired_keys(db, batch_size)
+
+
+async def purge_periodically() -> None:
+    """Background loop started by the API; failures are logged and retried next round."""
+    while True:
+        await asyncio.sleep(PURGE_INTERVAL_SECONDS)
+        try:
+            purged = await run_in_threadpool(purge_once)
+        except Exception:
+            logger.exception("idempotency key purge failed")
+            continue
+        if purged:
+            logger.info("purged %s expired idempotency keys", purged)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Delete expired idempotency keys")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+    print(f"purged {purge_once(args.batch_size)} keys")
+
+
+if __name__ == "__main__":
+    main()
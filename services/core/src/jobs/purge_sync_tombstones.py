@@ -0,0 +1,49 @@
+"""Delete sync tombstones past their retention.
+
+The API runs this periodically in the background; it can also be run once
+from ``src``::
+
+    python -m jobs.purge_sync_tombstones
+"""
+import argparse
+import asyncio
+import logging
+import os
+
+from starlette.concurrency import run_in_threadpool
+
+from db import SessionLocal
+from services.sync_service import purge_expired_tombstones
+
+logger = logging.getLogger("core.jobs")
+
+PURGE_INTERVAL_SECONDS = float(os.getenv("SYNC_TOMBSTONE_GC_INTERVAL_SECONDS", "3600"))
+
+
+def purge_once(batch_size: int = 1000) -> int:
+    with SessionLocal() as db:
+        return purge_expired_tombstones(db, batch_size)
+
+
+async def purge_periodically() -> None:
+    """Background loop started by the API; failures are logged and retried next round."""
+    while True:
+        await asyncio.sleep(PURGE_INTERVAL_SECONDS)
+        try:
+            purged = await run_in_threadpool(purge_once)
+        except Exception:
+            logger.exception("sync tombstone purge failed")
+            continue
+        if purged:
+            logger.info("purged %s sync tombstones", purged)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Delete expired sync tombstones")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+    print(f"purged {purge_once(args.batch_size)} tombstones")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+"""Rebuild content_counters from the base tables.
+
+Run from ``src``::
+
+    python -m jobs.reconcile_counters [--study-id UUID]
+"""
+import argparse
+from uuid import UUID
+
+from db import SessionLocal
+from services.counters_service import reconcile_counters
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rebuild content counters")
+    parser.add_argument("--study-id", type=UUID, default=None, help="only rebuild one study")
+    args = parser.parse_args()
+
+    with SessionLocal() as db:
+        rebuilt = reconcile_counters(db, args.study_id)
+    print(f"rebuilt {rebuilt} counters")
+
+
+if __name__ == "__main__":
+    main()
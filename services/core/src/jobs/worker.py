@@ -0,0 +1,171 @@
+"""Run jobs queued through services.job_queue.
+
+The API runs one worker loop in the background unless JOB_WORKER_EMBEDDED=0;
+dedicated workers can be started from ``src``, as many as needed::
+
+    python -m jobs.worker --concurrency 4
+    python -m jobs.worker --drain    # run what is runnable now, then exit
+
+While a job runs, its lease is extended every third of the visibility
+timeout, so only a worker that actually stopped loses its job.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import socket
+import threading
+import time
+import traceback
+import uuid
+from uuid import UUID
+
+from starlette.concurrency import run_in_threadpool
+
+# Imported for their @job_handler registrations.
+import jobs.delete_in_batches  # noqa: F401
+from db import SessionLocal
+from metrics import Counter, Histogram
+from services.job_queue import (
+    JOB_VISIBILITY_TIMEOUT,
+    claim,
+    complete,
+    extend,
+    fail,
+    get_handler,
+    purge_finished,
+    reap_abandoned,
+)
+
+logger = logging.getLogger("core.jobs")
+
+JOB_WORKER_EMBEDDED = os.getenv("JOB_WORKER_EMBEDDED", "1") == "1"
+JOB_POLL_SECONDS = float(os.getenv("JOB_POLL_SECONDS", "2"))
+JOB_MAINTENANCE_SECONDS = float(os.getenv("JOB_MAINTENANCE_SECONDS", "60"))
+
+JOBS_RUN = Counter("jobs_run_total", "Job attempts by kind and outcome.", ["kind", "outcome"])
+JOB_SECONDS = Histogram(
+    "job_duration_seconds",
+    "Time spent running one job attempt.",
+    ["kind"],
+    buckets=(0.1, 0.5, 1, 5, 15, 60, 300, 900, 3600),
+)
+
+
+def worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+def _keep_lease(job_id: UUID, owner: str, done: threading.Event) -> None:
+    while not done.wait(JOB_VISIBILITY_TIMEOUT.total_seconds() / 3):
+        try:
+            with SessionLocal() as db:
+                if not extend(db, job_id, owner):
+                    logger.warning("lost the lease on job %s", job_id)
+                    return
+        except Exception:
+            logger.exception("could not extend the lease on job %s", job_id)
+
+
+def run_one(owner: str) -> bool:
+    """Claim and run one job; False when none was runnable."""
+    with SessionLocal() as db:
+        job = claim(db, owner)
+    if job is None:
+        return False
+
+    done = threading.Event()
+    lease = threading.Thread(target=_keep_lease, args=(job.id, owner, done), daemon=True)
+    lease.start()
+    started = time.perf_counter()
+    try:
+        with SessionLocal() as db:
+            result = get_handler(job.kind)(db, job.payload)
+    except Exception:
+        logger.exception("job %s (%s) failed on attempt %s of %s", job.id, job.kind, job.attempts, job.max_attempts)
+        outcome = "failed"
+        with SessionLocal() as db:
+            fail(db, job, owner, traceback.format_exc())
+    else:
+        outcome = "succeeded"
+        with SessionLocal() as db:
+            complete(db, job.id, owner, result)
+    finally:
+        done.set()
+        lease.join()
+    JOB_SECONDS.labels(job.kind).observe(time.perf_counter() - started)
+    JOBS_RUN.labels(job.kind, outcome).inc()
+    return True
+
+
+def maintain() -> None:
+    """Fail abandoned jobs and drop finished ones past their retention."""
+    with SessionLocal() as db:
+        reaped = reap_abandoned(db)
+        purged = purge_finished(db)
+    if reaped or purged:
+        logger.info("jobs: %s abandoned, %s purged", reaped, purged)
+
+
+def run_forever(stop: threading.Event, drain: bool = False) -> None:
+    owner = worker_id()
+    next_maintenance = 0.0
+    while not stop.is_set():
+        try:
+            if time.monotonic() >= next_maintenance:
+                maintain()
+                next_maintenance = time.monotonic() + JOB_MAINTENANCE_SECONDS
+            ran = run_one(owner)
+        except Exception:
+            logger.exception("job worker poll failed")
+            ran = False
+        if not ran:
+            if drain:
+                return
+            stop.wait(JOB_POLL_SECONDS)
+
+
+async def work_periodically() -> None:
+    """Worker loop started by the API; jobs run in the threadpool, one at a time."""
+    owner = worker_id()
+    next_maintenance = 0.0
+    while True:
+        try:
+            if time.monotonic() >= next_maintenance:
+                await run_in_threadpool(maintain)
+                next_maintenance = time.monotonic() + JOB_MAINTENANCE_SECONDS
+            ran = await run_in_threadpool(run_one, owner)
+        except Exception:
+            logger.exception("job worker poll failed")
+            ran = False
+        if not ran:
+            await asyncio.sleep(JOB_POLL_SECONDS)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run queued jobs")
+    parser.add_argument("--concurrency", type=int, default=1, help="jobs run at once")
+    parser.add_argument("--drain", action="store_true", help="exit once no job is runnable")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(threadName)s %(message)s")
+
+    stop = threading.Event()
+    threads = [
+        threading.Thread(target=run_forever, args=(stop, args.drain), name=f"worker-{index}")
+        for index in range(args.concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    try:
+        for thread in threads:
+            while thread.is_alive():
+                thread.join(1)
+    except KeyboardInterrupt:
+        # Jobs already running finish; nothing new is claimed.
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,4 @@
+import asyncio
 import os
 from pathlib import Path
 
@@ -7,7 +8,11 @@ from fastapi.middleware.cors import CORSMiddleware
 from controllers.groups_controller import router as groups_router
 from controllers.health_controller import router as health_router
 from controllers.invite_controller import router as invite_router
+from controllers.jobs_controller import router as jobs_router
+from controllers.search_controller import router as search_router
+from controllers.session_actions_controller import router as session_actions_router
 from controllers.studies_controller import router as studies_router
+from controllers.sync_controller import router as sync_router
 from controllers.study_sessions_controller import router as study_sessions_router
 from controllers.study_session_notes_controller import (
     router as study_session_notes_router,
@@ -15,6 +20,11 @@ from controllers.study_session_notes_controller import (
 from controllers.study_passages_controller import router as study_passages_router
 from controllers.study_questions_controller import router as study_questions_router
 from controllers.user_controller import router as user_router
+from db import engine
+from jobs import purge_deleted_content, purge_idempotency_keys, purge_sync_tombstones, worker
+from middleware.compression import CompressionMiddleware
+from middleware.metrics import RequestMetricsMiddleware, install_pool_metrics
+from middleware.query_stats import QueryStatsMiddleware, install_query_hooks
 
 app = FastAPI()
 
@@ -26,13 +36,22 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(CompressionMiddleware)
+app.add_middleware(QueryStatsMiddleware)
+app.add_middleware(RequestMetricsMiddleware)
+install_query_hooks(engine)
+install_pool_metrics(engine)
 
 app.include_router(health_router)
 app.include_router(groups_router)
 app.include_router(invite_router)
+app.include_router(jobs_router)
+app.include_router(search_router)
 app.include_router(studies_router)
 app.include_router(study_sessions_router)
 app.include_router(study_session_notes_router)
+app.include_router(session_actions_router)
+app.include_router(sync_router)
 app.include_router(study_passages_router)
 app.include_router(study_questions_router)
 app.include_router(user_router)
@@ -57,3 +76,23 @@ def _run_migrations() -> None:
 @app.on_event("startup")
 def on_startup() -> None:
     _run_migrations()
+
+
+@app.on_event("startup")
+async def start_background_jobs() -> None:
+    # Keep a reference so the task is not garbage collected.
+    app.state.idempotency_gc = asyncio.create_task(purge_idempotency_keys.purge_periodically())
+    app.state.tombstone_gc = asyncio.create_task(purge_sync_tombstones.purge_periodically())
+    app.state.content_gc = asyncio.create_task(purge_deleted_content.purge_periodically())
+    app.state.job_worker = None
+    if worker.JOB_WORKER_EMBEDDED:
+        app.state.job_worker = asyncio.create_task(worker.work_periodically())
+
+
+@app.on_event("shutdown")
+async def stop_background_jobs() -> None:
+    app.state.idempotency_gc.cancel()
+    app.state.tombstone_gc.cancel()
+    app.state.content_gc.cancel()
+    if app.state.job_worker is not None:
+        app.state.job_worker.cancel()
@@ -0,0 +1,242 @@
+"""In-process metrics rendered in the Prometheus text exposition format.
+
+Hot-path updates are lock-free: every thread increments its own shard of
+plain floats and the shards are only summed when /metrics is scraped. Label
+sets are bound once with ``labels()`` and the returned child is cached by the
+caller, so recording a sample is an index lookup and an addition.
+"""
+import abc
+import threading
+from bisect import bisect_left
+from collections.abc import Callable, Iterable
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class _Shards:
+    """Per-thread arrays of `size` floats, summed on read."""
+
+    __slots__ = ("_size", "_local", "_all")
+
+    def __init__(self, size: int) -> None:
+        self._size = size
+        self._local = threading.local()
+        self._all: list[list[float]] = []
+
+    def local(self) -> list[float]:
+        try:
+            return self._local.values
+        except AttributeError:
+            values = [0.0] * self._size
+            self._local.values = values
+            self._all.append(values)
+            return values
+
+    def totals(self) -> list[float]:
+        totals = [0.0] * self._size
+        for values in list(self._all):
+            for index, value in enumerate(values):
+                totals[index] += value
+        return totals
+
+
+class _CounterChild:
+    __slots__ = ("_shards",)
+
+    def __init__(self) -> None:
+        self._shards = _Shards(1)
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._shards.local()[0] += amount
+
+    def value(self) -> float:
+        return self._shards.totals()[0]
+
+
+class _GaugeChild(_CounterChild):
+    __slots__ = ()
+
+    def dec(self, amount: float = 1.0) -> None:
+        self._shards.local()[0] -= amount
+
+
+class _HistogramChild:
+    __slots__ = ("_buckets", "_shards")
+
+    def __init__(self, buckets: tuple[float, ...]) -> None:
+        self._buckets = buckets
+        # One slot per bucket, one for +Inf and a trailing slot for the sum.
+        self._shards = _Shards(len(buckets) + 2)
+
+    def observe(self, value: float) -> None:
+        values = self._shards.local()
+        values[bisect_left(self._buckets, value)] += 1
+        values[-1] += value
+
+    def totals(self) -> tuple[list[float], float]:
+        totals = self._shards.totals()
+        return totals[:-1], totals[-1]
+
+
+class _Metric(abc.ABC):
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: dict[tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+        REGISTRY.register(self)
+
+    @abc.abstractmethod
+    def _new_child(self):
+        """A fresh child for one label set."""
+
+    def labels(self, *values: str):
+        """Bind a label set once; keep the returned child for the hot path."""
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}")
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    @abc.abstractmethod
+    def _samples(self) -> Iterable[str]:
+        """Exposition lines for every child, without HELP and TYPE."""
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+    def _samples(self) -> Iterable[str]:
+        for key, child in list(self._children.items()):
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(child.value())}"
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def _new_child(self) -> _GaugeChild:
+        return _GaugeChild()
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.labels().dec(amount)
+
+
+class CallbackGauge(_Metric):
+    """Gauge whose samples are computed by `collect` at scrape time."""
+
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str],
+        collect: Callable[[], Iterable[tuple[tuple[str, ...], float]]],
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._collect = collect
+
+    def _new_child(self):
+        raise TypeError(f"{self.name} is computed at scrape time and cannot be updated through labels()")
+
+    def _samples(self) -> Iterable[str]:
+        for key, value in self._collect():
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def _samples(self) -> Iterable[str]:
+        bucket_names = (*self.labelnames, "le")
+        bounds = [_format_value(bound) for bound in self.buckets] + ["+Inf"]
+        for key, child in list(self._children.items()):
+            counts, total = child.totals()
+            cumulative = 0.0
+            for bound, count in zip(bounds, counts):
+                cumulative += count
+                labels = _format_labels(bucket_names, (*key, bound))
+                yield f"{self.name}_bucket{labels} {_format_value(cumulative)}"
+            labels = _format_labels(self.labelnames, key)
+            yield f"{self.name}_sum{labels} {_format_value(total)}"
+            yield f"{self.name}_count{labels} {_format_value(cumulative)}"
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: list[_Metric] = []
+
+    def register(self, metric: _Metric) -> None:
+        self._metrics.append(metric)
+
+    def render(self) -> str:
+        return "\n".join(metric.render() for metric in self._metrics) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == int(value):
+        return str(int(value))
+    return repr(value)
+
+
+REGISTRY = Registry()
+
+CACHE_LOOKUPS = Counter("cache_lookups_total", "Cache lookups.", ["cache"])
+CACHE_MISSES = Counter("cache_misses_total", "Cache lookups that had to load the value.", ["cache"])
+
+
+def _cache_hit_ratios() -> Iterable[tuple[tuple[str, ...], float]]:
+    misses = {key: child.value() for key, child in list(CACHE_MISSES._children.items())}
+    for key, child in list(CACHE_LOOKUPS._children.items()):
+        lookups = child.value()
+        if lookups:
+            yield key, max(lookups - misses.get(key, 0.0), 0.0) / lookups
+
+
+CACHE_HIT_RATIO = CallbackGauge("cache_hit_ratio", "Share of cache lookups served from the cache.", ["cache"], _cache_hit_ratios)
@@ -0,0 +1,260 @@
+import gzip
+import hashlib
+import os
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from collections.abc import Callable
+
+import anyio
+from fastapi import Request
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from metrics import CACHE_LOOKUPS, CACHE_MISSES, Counter, Histogram
+
+try:
+    import brotli
+except ImportError:  # optional: without it only gzip is offered
+    brotli = None
+
+# Bodies smaller than this are sent as is; headers would eat the savings.
+COMPRESSION_MIN_BYTES = int(os.getenv("COMPRESSION_MIN_BYTES", "1024"))
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+# Bodies (or streamed chunks) at least this large are compressed in a worker
+# thread so the event loop keeps serving other requests meanwhile.
+COMPRESSION_OFFLOAD_BYTES = int(os.getenv("COMPRESSION_OFFLOAD_BYTES", str(64 * 1024)))
+# Budget for compressed copies of responses marked with cache_compressed.
+COMPRESSION_CACHE_BYTES = int(os.getenv("COMPRESSION_CACHE_BYTES", str(32 * 1024 * 1024)))
+
+COMPRESSION_BYTES = Counter(
+    "http_compression_bytes_total",
+    "Response body bytes before (in) and after (out) compression.",
+    ["encoding", "stage"],
+)
+COMPRESSION_SECONDS = Histogram(
+    "http_compression_seconds",
+    "CPU time spent compressing one response body.",
+    ["encoding"],
+    buckets=(0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25),
+)
+
+_COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/javascript",
+    "application/xml",
+)
+
+_cache_lookups = CACHE_LOOKUPS.labels("compressed_responses")
+_cache_misses = CACHE_MISSES.labels("compressed_responses")
+
+
+def cache_compressed(request: Request) -> None:
+    """Route dependency marking a response as static enough to keep compressed.
+
+    Compressed bodies are cached by a digest of the uncompressed body, so a
+    changed payload simply misses; nothing has to be invalidated.
+    """
+    request.state.compression_cache = True
+
+
+def negotiate_encoding(accept_encoding: str) -> str | None:
+    """Pick br or gzip from an Accept-Encoding header, honouring q=0."""
+    weights: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[token] = weight
+
+    wildcard = weights.get("*", 0.0)
+    offered = ["br", "gzip"] if brotli is not None else ["gzip"]
+    scored = [(weights.get(encoding, wildcard), encoding) for encoding in offered]
+    best_weight, best = max(scored, key=lambda item: item[0])
+    return best if best_weight > 0 else None
+
+
+def _is_compressible(content_type: str) -> bool:
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    return (
+        media_type.startswith("text/")
+        or media_type in _COMPRESSIBLE_TYPES
+        or media_type.endswith("+json")
+        or media_type.endswith("+xml")
+    )
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=COMPRESSION_BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=COMPRESSION_GZIP_LEVEL, mtime=0)
+
+
+def _compressor(encoding: str) -> tuple[Callable[[bytes], bytes], Callable[[], bytes]]:
+    """(compress chunk, finish) functions for a streamed body."""
+    if encoding == "br":
+        stream = brotli.Compressor(quality=COMPRESSION_BROTLI_QUALITY)
+        return stream.process, stream.finish
+    stream = zlib.compressobj(COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    return stream.compress, stream.flush
+
+
+class _CompressedCache:
+    """LRU of compressed bodies keyed by (encoding, digest of the raw body), bounded in bytes."""
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[tuple[str, bytes], bytes] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple[str, bytes]) -> bytes | None:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: tuple[str, bytes], value: bytes) -> None:
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+            self._entries[key] = value
+            self._size += len(value)
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+
+_cache = _CompressedCache(COMPRESSION_CACHE_BYTES)
+
+
+def _timed_compress(body: bytes, encoding: str) -> bytes:
+    # thread_time, not process_time: this often runs in the threadpool next
+    # to other requests, whose CPU must not be counted here.
+    started = time.thread_time()
+    compressed = compress(body, encoding)
+    COMPRESSION_SECONDS.labels(encoding).observe(time.thread_time() - started)
+    return compressed
+
+
+class CompressionMiddleware:
+    """Negotiated br/gzip compression for text and JSON responses.
+
+    Whole bodies under COMPRESSION_MIN_BYTES pass through untouched; streamed
+    bodies are compressed chunk by chunk. Large bodies and chunks are
+    compressed off the event loop.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Message | None = None
+        mode = "pending"
+        stream: tuple[Callable[[bytes], bytes], Callable[[], bytes]] | None = None
+        bytes_in = COMPRESSION_BYTES.labels(encoding, "in")
+        bytes_out = COMPRESSION_BYTES.labels(encoding, "out")
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start, mode, stream
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if message["type"] != "http.response.body" or mode == "identity":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if mode == "pending":
+                headers = MutableHeaders(raw=start["headers"])
+                status = start["status"]
+                if (
+                    status < 200
+                    or status in (204, 304)
+                    or "content-encoding" in headers
+                    or "no-transform" in headers.get("cache-control", "")
+                    or not _is_compressible(headers.get("content-type", ""))
+                    or (not more_body and len(body) < COMPRESSION_MIN_BYTES)
+                ):
+                    mode = "identity"
+                    await send(start)
+                    await send(message)
+                    return
+
+                headers["Content-Encoding"] = encoding
+                headers.add_vary_header("Accept-Encoding")
+                # The compressed bytes differ from the ones a strong ETag
+                # names; parse_if_match accepts the weak form back.
+                etag = headers.get("etag")
+                if etag and not etag.startswith("W/"):
+                    headers["ETag"] = f"W/{etag}"
+                if not more_body:
+                    compressed = await self._compress_body(scope, body, encoding)
+                    bytes_in.inc(len(body))
+                    bytes_out.inc(len(compressed))
+                    headers["Content-Length"] = str(len(compressed))
+                    await send(start)
+                    await send({"type": "http.response.body", "body": compressed})
+                    return
+
+                del headers["Content-Length"]
+                mode = "stream"
+                stream = _compressor(encoding)
+                await send(start)
+
+            compress_chunk, finish = stream
+            if len(body) >= COMPRESSION_OFFLOAD_BYTES:
+                chunk = await anyio.to_thread.run_sync(compress_chunk, body)
+            else:
+                chunk = compress_chunk(body)
+            if not more_body:
+                chunk += finish()
+            bytes_in.inc(len(body))
+            bytes_out.inc(len(chunk))
+            if chunk or not more_body:
+                await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
+
+    async def _compress_body(self, scope: Scope, body: bytes, encoding: str) -> bytes:
+        cacheable = scope.get("state", {}).get("compression_cache", False)
+        if cacheable:
+            _cache_lookups.inc()
+            key = (encoding, hashlib.blake2b(body, digest_size=16).digest())
+            cached = _cache.get(key)
+            if cached is not None:
+                return cached
+            _cache_misses.inc()
+
+        if len(body) >= COMPRESSION_OFFLOAD_BYTES:
+            compressed = await anyio.to_thread.run_sync(_timed_compress, body, encoding)
+        else:
+            compressed = _timed_compress(body, encoding)
+
+        if cacheable:
+            _cache.put(key, compressed)
+        return compressed
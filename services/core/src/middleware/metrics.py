@@ -0,0 +1,90 @@
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from metrics import CallbackGauge, Counter, Gauge, Histogram
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Request latency by route template.",
+    ["method", "route"],
+)
+RESPONSES = Counter("http_responses_total", "Responses by route template and status.", ["method", "route", "status"])
+IN_FLIGHT = Gauge("http_requests_in_flight", "Requests currently being served.")
+
+POOL_CHECKOUTS = Counter("db_pool_checkouts_total", "Connections checked out of the pool.")
+POOL_CONNECTS = Counter("db_pool_connections_created_total", "New DBAPI connections opened by the pool.")
+POOL_INVALIDATIONS = Counter("db_pool_invalidations_total", "Pooled connections invalidated after errors.")
+
+# Routes that did not match anything share one label so scanners cannot blow
+# up the number of series.
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class RequestMetricsMiddleware:
+    """Latency histogram, status counter and in-flight gauge per route template."""
+
+    def __init__(self, app) -> None:
+        self.app = app
+        self._in_flight = IN_FLIGHT.labels()
+        self._durations: dict[tuple[str, str], object] = {}
+        self._responses: dict[tuple[str, str, int], object] = {}
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_with_status(message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        self._in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            self._in_flight.dec()
+
+            route = scope.get("route")
+            key = (scope["method"], getattr(route, "path", UNMATCHED_ROUTE))
+            duration = self._durations.get(key)
+            if duration is None:
+                duration = self._durations.setdefault(key, REQUEST_DURATION.labels(*key))
+            duration.observe(elapsed)
+
+            response_key = (*key, status_code)
+            responses = self._responses.get(response_key)
+            if responses is None:
+                responses = self._responses.setdefault(response_key, RESPONSES.labels(*response_key))
+            responses.inc()
+
+
+def install_pool_metrics(engine: Engine) -> None:
+    """Count pool checkouts and expose the pool's occupancy at scrape time."""
+    pool = engine.pool
+    checkouts = POOL_CHECKOUTS.labels()
+    connects = POOL_CONNECTS.labels()
+    invalidations = POOL_INVALIDATIONS.labels()
+
+    event.listen(pool, "checkout", lambda *_args: checkouts.inc())
+    event.listen(pool, "connect", lambda *_args: connects.inc())
+    event.listen(pool, "invalidate", lambda *_args: invalidations.inc())
+
+    def occupancy():
+        for state, read in (
+            ("size", "size"),
+            ("checked_in", "checkedin"),
+            ("checked_out", "checkedout"),
+            ("overflow", "overflow"),
+        ):
+            if hasattr(pool, read):
+                yield (state,), getattr(pool, read)()
+
+    CallbackGauge("db_pool_connections", "Connection pool occupancy.", ["state"], occupancy)
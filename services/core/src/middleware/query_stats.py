@@ -0,0 +1,152 @@
+import json
+import logging
+import os
+import re
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+request_logger = logging.getLogger("core.requests")
+slow_query_logger = logging.getLogger("core.sql.slow")
+
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|%s|\$\d+")
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_VALUE_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+# Statements at or above this many milliseconds are logged with their SQL.
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+
+
+def normalize_sql(statement: str) -> str:
+    """Collapse a statement to its shape so slow queries group in the logs."""
+    normalized = _PLACEHOLDER.sub("?", statement)
+    normalized = _STRING_LITERAL.sub("?", normalized)
+    normalized = _NUMBER_LITERAL.sub("?", normalized)
+    normalized = _VALUE_LIST.sub("(?, ...)", normalized)
+    return _WHITESPACE.sub(" ", normalized).strip()
+
+
+@dataclass
+class QueryStats:
+    statements: int = 0
+    db_time: float = 0.0
+    slowest_time: float = 0.0
+    slowest_statement: str | None = None
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.statements += 1
+        self.db_time += elapsed
+        if elapsed > self.slowest_time:
+            self.slowest_time = elapsed
+            self.slowest_statement = statement
+
+
+# The stats object is created by the middleware; sync endpoints run in a
+# worker thread with a copy of the context, which still points at it.
+_current_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    elapsed = time.perf_counter() - conn.info["query_started"].pop()
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.record(statement, elapsed)
+
+    elapsed_ms = elapsed * 1000
+    if elapsed_ms >= SLOW_QUERY_MS:
+        slow_query_logger.warning(
+            json.dumps(
+                {
+                    "event": "slow_query",
+                    "duration_ms": round(elapsed_ms, 3),
+                    "sql": normalize_sql(statement),
+                }
+            )
+        )
+
+
+def _handle_error(context) -> None:
+    started = context.connection.info.get("query_started") if context.connection is not None else None
+    if started:
+        started.pop()
+
+
+def install_query_hooks(engine: Engine) -> None:
+    """Time every statement the engine runs."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(engine, "handle_error", _handle_error)
+
+
+def _server_timing(stats: QueryStats, total: float) -> bytes:
+    parts = [
+        f'db;dur={stats.db_time * 1000:.3f};desc="{stats.statements} statements"',
+        f"db-slowest;dur={stats.slowest_time * 1000:.3f}",
+        f"app;dur={total * 1000:.3f}",
+    ]
+    return ", ".join(parts).encode("latin-1")
+
+
+class QueryStatsMiddleware:
+    """Per-request statement count, DB time and slowest statement.
+
+    Adds a Server-Timing header to every HTTP response and logs one JSON line
+    per request on the ``core.requests`` logger.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = _current_stats.set(stats)
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_timing(message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", _server_timing(stats, time.perf_counter() - started)))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_stats.reset(token)
+            route = scope.get("route")
+            request_logger.info(
+                json.dumps(
+                    {
+                        "event": "request",
+                        "method": scope["method"],
+                        "path": scope["path"],
+                        "route": getattr(route, "path", None),
+                        "status": status_code,
+                        "duration_ms": round((time.perf_counter() - started) * 1000, 3),
+                        "db_statements": stats.statements,
+                        "db_time_ms": round(stats.db_time * 1000, 3),
+                        "db_slowest_ms": round(stats.slowest_time * 1000, 3),
+                        "db_slowest_sql": normalize_sql(stats.slowest_statement)
+                        if stats.slowest_statement
+                        else None,
+                    }
+                )
+            )
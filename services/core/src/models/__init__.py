@@ -1,8 +1,12 @@
+from .content_counter import ContentCounter
 from .group import Group
 from .group_member import GroupMember, GroupRole
 from .group_session import GroupSession
 from .group_study import GroupStudy
+from .idempotency_key import IdempotencyKey
 from .invite_code import InviteCode
+from .job import Job, JobStatus
+from .position_counter import PositionCounter
 from .study import Study
 from .study_passage import StudyPassage
 from .study_passage_comment import StudyPassageComment
@@ -11,15 +15,21 @@ from .study_question import StudyQuestion
 from .study_question_response import StudyQuestionResponse
 from .study_session_note import StudySessionNote
 from .study_session import StudySession
+from .sync_tombstone import SyncTombstone
 from .user import User
 
 __all__ = [
+    "ContentCounter",
     "Group",
     "GroupMember",
     "GroupRole",
     "GroupSession",
     "GroupStudy",
+    "IdempotencyKey",
     "InviteCode",
+    "Job",
+    "JobStatus",
+    "PositionCounter",
     "Study",
     "StudyPassage",
     "StudyPassageComment",
@@ -28,5 +38,6 @@ __all__ = [
     "StudyQuestionResponse",
     "StudySessionNote",
     "StudySession",
+    "SyncTombstone",
     "User",
 ]
@@ -0,0 +1,28 @@
+from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, Index, String
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+
+from db import Base
+
+
+class ContentCounter(Base):
+    """Denormalized per-group counts, e.g. ("session", session_id, "notes").
+
+    Maintained in the same transaction as the rows they count and rebuilt by
+    jobs.reconcile_counters.
+    """
+
+    __tablename__ = "content_counters"
+    __table_args__ = (Index("ix_content_counters_group_study", "group_id", "study_id"),)
+
+    group_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("groups.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    scope = Column(String(16), primary_key=True)
+    scope_id = Column(UUID(as_uuid=True), primary_key=True)
+    kind = Column(String(16), primary_key=True)
+    study_id = Column(UUID(as_uuid=True), nullable=True)
+    count = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
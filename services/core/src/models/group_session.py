@@ -1,6 +1,6 @@
 import uuid
 
-from sqlalchemy import Column, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, DateTime, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 
@@ -11,6 +11,7 @@ class GroupSession(Base):
     __tablename__ = "group_sessions"
     __table_args__ = (
         UniqueConstraint("group_study_id", "study_session_id", name="uq_group_session"),
+        Index("ix_group_sessions_study_session", "study_session_id"),
     )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
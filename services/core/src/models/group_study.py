@@ -1,6 +1,6 @@
 import uuid
 
-from sqlalchemy import Column, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, DateTime, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 
@@ -9,7 +9,10 @@ from db import Base
 
 class GroupStudy(Base):
     __tablename__ = "group_studies"
-    __table_args__ = (UniqueConstraint("group_id", "study_id", name="uq_group_study"),)
+    __table_args__ = (
+        UniqueConstraint("group_id", "study_id", name="uq_group_study"),
+        Index("ix_group_studies_study", "study_id"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     group_id = Column(UUID(as_uuid=True), ForeignKey("groups.id", ondelete="CASCADE"), nullable=False)
@@ -0,0 +1,21 @@
+from sqlalchemy import Column, DateTime, Index, SmallInteger, String, Text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.sql import func
+
+from db import Base
+
+
+class IdempotencyKey(Base):
+    """Stored response of a create request, replayed when the client retries
+    with the same Idempotency-Key header."""
+
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (Index("ix_idempotency_keys_expires_at", "expires_at"),)
+
+    user_sub = Column(Text, primary_key=True)
+    key = Column(String(255), primary_key=True)
+    request_hash = Column(String(64), nullable=False)
+    status_code = Column(SmallInteger, nullable=False)
+    response = Column(JSONB, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
@@ -0,0 +1,60 @@
+import enum
+import uuid
+
+from sqlalchemy import Column, DateTime, Enum, Index, Integer, String, Text, text
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.sql import func
+
+from db import Base
+
+
+class JobStatus(enum.Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class Job(Base):
+    """Heavy work queued by the API and run by jobs.worker.
+
+    A worker claims a job by moving run_after past the visibility timeout;
+    a job left RUNNING with run_after in the past belonged to a worker that
+    died and is claimed again.
+    """
+
+    __tablename__ = "jobs"
+    __table_args__ = (
+        # Only jobs a worker may still pick up, in claim order.
+        Index(
+            "ix_jobs_claimable",
+            "run_after",
+            postgresql_where=text("status IN ('queued', 'running')"),
+        ),
+        Index("ix_jobs_user_created", "user_sub", "created_at"),
+        Index("ix_jobs_finished", "finished_at", postgresql_where=text("finished_at IS NOT NULL")),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    kind = Column(String(64), nullable=False)
+    payload = Column(JSONB, nullable=False)
+    status = Column(
+        Enum(JobStatus, name="job_status", values_callable=lambda x: [e.value for e in x]),
+        nullable=False,
+        default=JobStatus.QUEUED,
+    )
+    user_sub = Column(String(128), nullable=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False)
+    run_after = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    locked_by = Column(String(128), nullable=True)
+    last_error = Column(Text, nullable=True)
+    result = Column(JSONB, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
+    finished_at = Column(DateTime(timezone=True), nullable=True)
@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, String
+from sqlalchemy.dialects.postgresql import UUID
+
+from db import Base
+
+
+class PositionCounter(Base):
+    """Last position handed out under a parent, e.g. ("study_sessions", study_id).
+
+    Bumped by the same statement that inserts the child, so concurrent
+    appends to one parent queue on this row instead of racing on max().
+    """
+
+    __tablename__ = "position_counters"
+
+    scope = Column(String(32), primary_key=True)
+    scope_id = Column(UUID(as_uuid=True), primary_key=True)
+    last_position = Column(Integer, nullable=False)
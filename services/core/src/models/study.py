@@ -1,6 +1,6 @@
 import uuid
 
-from sqlalchemy import Column, DateTime, ForeignKey, String, Text, Boolean
+from sqlalchemy import Column, DateTime, ForeignKey, Index, String, Text, Boolean
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 
@@ -9,6 +9,7 @@ from db import Base
 
 class Study(Base):
     __tablename__ = "studies"
+    __table_args__ = (Index("ix_studies_group", "group_id"),)
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     group_id = Column(UUID(as_uuid=True), ForeignKey("groups.id", ondelete="CASCADE"), nullable=False)
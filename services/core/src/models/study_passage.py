@@ -1,7 +1,8 @@
 import uuid
 
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, Computed, DateTime, ForeignKey, Index, Integer, String, Text
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
+from sqlalchemy.orm import deferred
 from sqlalchemy.sql import func
 
 from db import Base
@@ -9,6 +10,10 @@ from db import Base
 
 class StudyPassage(Base):
     __tablename__ = "study_passages"
+    __table_args__ = (
+        Index("ix_study_passages_search_vector", "search_vector", postgresql_using="gin"),
+        Index("ix_study_passages_session", "session_id"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     session_id = Column(
@@ -23,3 +28,13 @@ class StudyPassage(Base):
     version = Column(String(20), nullable=True)
     text = Column(Text, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    row_version = Column(Integer, nullable=False, default=1)
+    search_vector = deferred(
+        Column(
+            TSVECTOR,
+            Computed("to_tsvector('english', coalesce(text, ''))", persisted=True),
+            nullable=True,
+        )
+    )
+
+    __mapper_args__ = {"eager_defaults": True, "version_id_col": row_version}
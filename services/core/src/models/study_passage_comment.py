@@ -1,7 +1,8 @@
 import uuid
 
-from sqlalchemy import Column, DateTime, ForeignKey, Text
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, Computed, DateTime, ForeignKey, Index, Integer, Text, text
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
+from sqlalchemy.orm import deferred
 from sqlalchemy.sql import func
 
 from db import Base
@@ -9,6 +10,18 @@ from db import Base
 
 class StudyPassageComment(Base):
     __tablename__ = "study_passage_comments"
+    __table_args__ = (
+        Index("ix_study_passage_comments_search_vector", "search_vector", postgresql_using="gin"),
+        Index("ix_study_passage_comments_group_session_updated", "group_session_id", "updated_at"),
+        Index("ix_study_passage_comments_passage", "passage_id"),
+        Index(
+            "ix_study_passage_comments_passage_live",
+            "passage_id",
+            "group_id",
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+        Index("ix_study_passage_comments_deleted", "deleted_at", postgresql_where=text("deleted_at IS NOT NULL")),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     passage_id = Column(
@@ -35,3 +48,15 @@ class StudyPassageComment(Base):
         onupdate=func.now(),
         nullable=False,
     )
+    row_version = Column(Integer, nullable=False, default=1)
+    # Set by soft deletes; jobs.purge_deleted_content removes the row later.
+    deleted_at = Column(DateTime(timezone=True), nullable=True)
+    search_vector = deferred(
+        Column(
+            TSVECTOR,
+            Computed("to_tsvector('english', coalesce(comment, ''))", persisted=True),
+            nullable=True,
+        )
+    )
+
+    __mapper_args__ = {"eager_defaults": True, "version_id_col": row_version}
@@ -1,7 +1,8 @@
 import uuid
 
-from sqlalchemy import Column, DateTime, ForeignKey, Text, UniqueConstraint
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, Computed, DateTime, ForeignKey, Index, Integer, Text, text
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
+from sqlalchemy.orm import deferred
 from sqlalchemy.sql import func
 
 from db import Base
@@ -10,13 +11,25 @@ from db import Base
 class StudyQuestionResponse(Base):
     __tablename__ = "study_question_responses"
     __table_args__ = (
-        UniqueConstraint(
+        # Partial so a member may reply again after deleting a reply.
+        Index(
+            "uq_question_response",
             "question_id",
             "group_id",
             "user_sub",
             "parent_response_id",
-            name="uq_question_response",
+            unique=True,
+            postgresql_where=text("deleted_at IS NULL"),
         ),
+        Index("ix_study_question_responses_question", "question_id"),
+        Index("ix_study_question_responses_search_vector", "search_vector", postgresql_using="gin"),
+        Index("ix_study_question_responses_group_session_updated", "group_session_id", "updated_at"),
+        Index(
+            "ix_study_question_responses_parent",
+            "parent_response_id",
+            postgresql_where=text("parent_response_id IS NOT NULL"),
+        ),
+        Index("ix_study_question_responses_deleted", "deleted_at", postgresql_where=text("deleted_at IS NOT NULL")),
     )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
@@ -49,3 +62,15 @@ class StudyQuestionResponse(Base):
         onupdate=func.now(),
         nullable=False,
     )
+    row_version = Column(Integer, nullable=False, default=1)
+    # Set by soft deletes; jobs.purge_deleted_content removes the row later.
+    deleted_at = Column(DateTime(timezone=True), nullable=True)
+    search_vector = deferred(
+        Column(
+            TSVECTOR,
+            Computed("to_tsvector('english', coalesce(response, ''))", persisted=True),
+            nullable=True,
+        )
+    )
+
+    __mapper_args__ = {"eager_defaults": True, "version_id_col": row_version}
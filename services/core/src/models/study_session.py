@@ -9,7 +9,17 @@ from db import Base
 
 class StudySession(Base):
     __tablename__ = "study_sessions"
-    __table_args__ = (UniqueConstraint("study_id", "position", name="uq_study_session_position"),)
+    # Deferrable so bulk reorders may pass through transient duplicates
+    # within a statement.
+    __table_args__ = (
+        UniqueConstraint(
+            "study_id",
+            "position",
+            name="uq_study_session_position",
+            deferrable=True,
+            initially="IMMEDIATE",
+        ),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     study_id = Column(UUID(as_uuid=True), ForeignKey("studies.id", ondelete="CASCADE"), nullable=False)
@@ -1,7 +1,8 @@
 import uuid
 
-from sqlalchemy import Column, DateTime, ForeignKey, Text
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, Computed, DateTime, ForeignKey, Index, Integer, Text, text
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
+from sqlalchemy.orm import deferred
 from sqlalchemy.sql import func
 
 from db import Base
@@ -9,6 +10,21 @@ from db import Base
 
 class StudySessionNote(Base):
     __tablename__ = "study_session_notes"
+    __table_args__ = (
+        # Hot feed index; soft-deleted rows are left out of it.
+        Index(
+            "ix_study_session_notes_group_created",
+            "group_id",
+            "created_at",
+            "id",
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+        Index("ix_study_session_notes_session_created", "session_id", "group_id", "created_at", "id"),
+        Index("ix_study_session_notes_study_created", "study_id", "group_id", "created_at", "id"),
+        Index("ix_study_session_notes_search_vector", "search_vector", postgresql_using="gin"),
+        Index("ix_study_session_notes_group_session_updated", "group_session_id", "updated_at"),
+        Index("ix_study_session_notes_deleted", "deleted_at", postgresql_where=text("deleted_at IS NOT NULL")),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     session_id = Column(
@@ -16,6 +32,12 @@ class StudySessionNote(Base):
         ForeignKey("study_sessions.id", ondelete="CASCADE"),
         nullable=False,
     )
+    # Denormalized from study_sessions so study-wide listings skip the join.
+    study_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("studies.id", ondelete="CASCADE"),
+        nullable=False,
+    )
     group_session_id = Column(
         UUID(as_uuid=True),
         ForeignKey("group_sessions.id", ondelete="CASCADE"),
@@ -35,3 +57,15 @@ class StudySessionNote(Base):
         onupdate=func.now(),
         nullable=False,
     )
+    row_version = Column(Integer, nullable=False, default=1)
+    # Set by soft deletes; jobs.purge_deleted_content removes the row later.
+    deleted_at = Column(DateTime(timezone=True), nullable=True)
+    search_vector = deferred(
+        Column(
+            TSVECTOR,
+            Computed("to_tsvector('english', coalesce(note, ''))", persisted=True),
+            nullable=True,
+        )
+    )
+
+    __mapper_args__ = {"eager_defaults": True, "version_id_col": row_version}
@@ -0,0 +1,25 @@
+from sqlalchemy import BigInteger, Column, DateTime, Index, String
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+
+from db import Base
+
+
+class SyncTombstone(Base):
+    """A deleted note, comment, like or response, kept so offline clients learn of it.
+
+    Written by the record_sync_tombstone trigger on every delete path,
+    including cascades, and purged by jobs.purge_sync_tombstones. Rows deleted
+    together with their group session get none, since no client can sync that
+    session any more. There is no foreign key on group_session_id: tombstones
+    outlive the group session.
+    """
+
+    __tablename__ = "sync_tombstones"
+    __table_args__ = (Index("ix_sync_tombstones_group_session_deleted", "group_session_id", "deleted_at"),)
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    group_session_id = Column(UUID(as_uuid=True), nullable=False)
+    entity = Column(String(16), nullable=False)
+    entity_id = Column(UUID(as_uuid=True), nullable=False)
+    deleted_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
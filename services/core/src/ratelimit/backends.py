@@ -0,0 +1,83 @@
+import json
+import logging
+import threading
+import time
+import urllib.error
+import urllib.request
+from typing import Protocol
+
+logger = logging.getLogger("core.ratelimit")
+
+
+class RateLimitBackend(Protocol):
+    def take(self, key: str, rate: float, burst: int, cost: int = 1) -> float:
+        """Spend `cost` tokens from the bucket at `key`.
+
+        Returns 0 when the tokens were available, otherwise the seconds until
+        they will be.
+        """
+
+
+class InMemoryBackend:
+    """Token buckets held in this process, refilled lazily on access."""
+
+    # Fully refilled buckets are indistinguishable from missing ones, so they
+    # are dropped once the table grows past this size. Each bucket records
+    # when it will be full under its own rate and burst, so a request in a
+    # fast group never drops a slow group's partly drained bucket.
+    max_keys = 100_000
+
+    def __init__(self) -> None:
+        # key -> (tokens, updated, full_at)
+        self._buckets: dict[str, tuple[float, float, float]] = {}
+        self._lock = threading.Lock()
+        self._prune_at = self.max_keys
+
+    def take(self, key: str, rate: float, burst: int, cost: int = 1) -> float:
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated, _ = self._buckets.get(key, (float(burst), now, now))
+            tokens = min(float(burst), tokens + (now - updated) * rate)
+            if tokens >= cost:
+                tokens -= cost
+                retry_after = 0.0
+            else:
+                retry_after = (cost - tokens) / rate
+            self._buckets[key] = (tokens, now, now + (burst - tokens) / rate)
+            if len(self._buckets) > self._prune_at:
+                self._prune(now)
+        return retry_after
+
+    def _prune(self, now: float) -> None:
+        self._buckets = {key: bucket for key, bucket in self._buckets.items() if bucket[2] > now}
+        # When most buckets are still refilling, wait for the table to double
+        # before scanning again, so pruning stays amortized O(1) per request.
+        self._prune_at = max(self.max_keys, 2 * len(self._buckets))
+
+
+class HttpBackend:
+    """Buckets shared by every worker, kept by a bucket service over HTTP.
+
+    The service answers ``POST /take`` with ``{"retry_after": seconds}``;
+    ``python -m ratelimit.server`` is a local stand-in. When the service is
+    unreachable requests are let through rather than failing the write.
+    """
+
+    def __init__(self, url: str, timeout: float = 0.1) -> None:
+        self._url = url.rstrip("/") + "/take"
+        self._timeout = timeout
+
+    def take(self, key: str, rate: float, burst: int, cost: int = 1) -> float:
+        body = json.dumps({"key": key, "rate": rate, "burst": burst, "cost": cost}).encode()
+        request = urllib.request.Request(
+            self._url,
+            data=body,
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self._timeout) as response:
+                return float(json.load(response)["retry_after"])
+        except (OSError, ValueError, KeyError) as exc:
+            logger.warning("rate limit backend unavailable: %s", exc)
+            return 0.0
@@ -0,0 +1,128 @@
+import math
+import os
+import threading
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from functools import lru_cache
+
+from fastapi import Depends, HTTPException, status
+
+from auth.cognito import cognito_auth_required
+from metrics import Counter
+from ratelimit.backends import HttpBackend, InMemoryBackend, RateLimitBackend
+
+RATE_LIMITED = Counter("rate_limited_total", "Requests rejected before reaching the database.", ["group", "reason"])
+
+
+@dataclass(frozen=True)
+class Limit:
+    per_minute: float
+    burst: int
+
+    @property
+    def rate(self) -> float:
+        return self.per_minute / 60
+
+
+# Route group -> default limit. Override with RATE_LIMIT_<GROUP>="per_minute:burst".
+DEFAULT_LIMITS = {
+    "likes": Limit(per_minute=60, burst=20),
+    "comments": Limit(per_minute=30, burst=10),
+    "notes": Limit(per_minute=30, burst=10),
+    "responses": Limit(per_minute=30, burst=10),
+    # One batch carries up to MAX_BATCH_ACTIONS writes.
+    "batch": Limit(per_minute=12, burst=4),
+    "sync": Limit(per_minute=12, burst=4),
+    # Each export streams a whole study.
+    "export": Limit(per_minute=4, burst=2),
+    "import": Limit(per_minute=2, burst=2),
+}
+
+# Writes one user may have in flight at once in this worker.
+MAX_CONCURRENT_WRITES = int(os.getenv("RATE_LIMIT_MAX_CONCURRENT_WRITES", "4"))
+
+
+def _limit_for(group: str) -> Limit:
+    configured = os.getenv(f"RATE_LIMIT_{group.upper()}")
+    if not configured:
+        return DEFAULT_LIMITS[group]
+    per_minute, burst = configured.split(":")
+    return Limit(per_minute=float(per_minute), burst=int(burst))
+
+
+@lru_cache(maxsize=1)
+def get_backend() -> RateLimitBackend | None:
+    """The configured backend; RATE_LIMIT_BACKEND=off disables limiting."""
+    kind = os.getenv("RATE_LIMIT_BACKEND", "memory")
+    if kind == "off":
+        return None
+    if kind == "http":
+        return HttpBackend(os.getenv("RATE_LIMIT_URL", "http://127.0.0.1:9230"))
+    return InMemoryBackend()
+
+
+class _InFlight:
+    def __init__(self) -> None:
+        self._counts: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, user_sub: str, cap: int) -> bool:
+        with self._lock:
+            count = self._counts.get(user_sub, 0)
+            if count >= cap:
+                return False
+            self._counts[user_sub] = count + 1
+            return True
+
+    def release(self, user_sub: str) -> None:
+        with self._lock:
+            count = self._counts.get(user_sub, 0) - 1
+            if count > 0:
+                self._counts[user_sub] = count
+            else:
+                self._counts.pop(user_sub, None)
+
+
+_in_flight = _InFlight()
+
+
+def rate_limit(group: str) -> Callable[..., Iterator[None]]:
+    """Route dependency enforcing the `group` token bucket per user.
+
+    Add it through ``dependencies=[...]`` on the route so it is resolved
+    before the endpoint's own dependencies: a rejected request never opens a
+    database session.
+    """
+    limit = _limit_for(group)
+    rate_limited = RATE_LIMITED.labels(group, "rate")
+    too_concurrent = RATE_LIMITED.labels(group, "concurrency")
+
+    def dependency(claims: dict[str, object] = Depends(cognito_auth_required)) -> Iterator[None]:
+        backend = get_backend()
+        if backend is None:
+            yield
+            return
+
+        user_sub = str(claims.get("sub") or "")
+        retry_after = backend.take(f"{group}:{user_sub}", limit.rate, limit.burst)
+        if retry_after > 0:
+            rate_limited.inc()
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Rate limit exceeded",
+                headers={"Retry-After": str(math.ceil(retry_after))},
+            )
+
+        if not _in_flight.acquire(user_sub, MAX_CONCURRENT_WRITES):
+            too_concurrent.inc()
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many concurrent requests",
+                headers={"Retry-After": "1"},
+            )
+        try:
+            yield
+        finally:
+            _in_flight.release(user_sub)
+
+    return dependency
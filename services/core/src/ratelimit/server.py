@@ -0,0 +1,65 @@
+"""Local stand-in for the shared rate limit service.
+
+Keeps the buckets of every API worker in one place so limits hold across
+processes::
+
+    python -m ratelimit.server --port 9230
+    RATE_LIMIT_BACKEND=http RATE_LIMIT_URL=http://127.0.0.1:9230 uvicorn main:app --workers 4
+"""
+import argparse
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from ratelimit.backends import InMemoryBackend
+
+
+def make_server(host: str, port: int) -> ThreadingHTTPServer:
+    backend = InMemoryBackend()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self) -> None:
+            if self.path != "/take":
+                self.send_error(404)
+                return
+            try:
+                payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+                retry_after = backend.take(
+                    str(payload["key"]),
+                    float(payload["rate"]),
+                    int(payload["burst"]),
+                    int(payload.get("cost", 1)),
+                )
+            except (KeyError, TypeError, ValueError):
+                self.send_error(400)
+                return
+            body = json.dumps({"retry_after": retry_after}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args) -> None:
+            pass
+
+    return ThreadingHTTPServer((host, port), Handler)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Shared rate limit service stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9230)
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port)
+    print(f"serving token buckets on http://{args.host}:{args.port}/take")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
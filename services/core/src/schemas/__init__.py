@@ -1,6 +1,9 @@
-from .studies import StudyCreate, StudyOut, StudyUpdate
+from .jobs import JobOut
+from .session_actions import SessionActionBatch, SessionActionBatchOut, SessionActionResult
+from .studies import StudyCreate, StudyImportOut, StudyOut, StudyUpdate
 from .study_sessions import (
     StudySessionCreate,
+    StudySessionMove,
     StudySessionOut,
     StudySessionReorderItem,
     StudySessionUpdate,
@@ -12,20 +15,39 @@ from .study_passage_comments import (
     StudyPassageCommentUpdate,
 )
 from .study_passage_likes import StudyPassageLikeOut
-from .study_questions import StudyQuestionCreate, StudyQuestionOut, StudyQuestionUpdate
+from .study_questions import (
+    StudyQuestionCreate,
+    StudyQuestionMove,
+    StudyQuestionOut,
+    StudyQuestionReorderItem,
+    StudyQuestionUpdate,
+)
 from .study_question_responses import (
     StudyQuestionResponseCreate,
     StudyQuestionResponseOut,
     StudyQuestionResponseUpdate,
 )
-from .study_session_notes import StudySessionNoteCreate, StudySessionNoteOut, StudySessionNoteUpdate
+from .study_session_notes import (
+    StudySessionNoteCreate,
+    StudySessionNoteOut,
+    StudySessionNotePageOut,
+    StudySessionNotesGroupOut,
+    StudySessionNoteUpdate,
+)
+from .sync import SyncChange, SyncChangeResult, SyncOut, SyncRequest, SyncTombstoneOut
 from .user import UserCreate, UserResponse, UserUpdate
 
 __all__ = [
+    "JobOut",
+    "SessionActionBatch",
+    "SessionActionBatchOut",
+    "SessionActionResult",
     "StudyCreate",
+    "StudyImportOut",
     "StudyOut",
     "StudyUpdate",
     "StudySessionCreate",
+    "StudySessionMove",
     "StudySessionOut",
     "StudySessionReorderItem",
     "StudySessionUpdate",
@@ -37,14 +59,23 @@ __all__ = [
     "StudyPassageCommentUpdate",
     "StudyPassageLikeOut",
     "StudyQuestionCreate",
+    "StudyQuestionMove",
     "StudyQuestionOut",
+    "StudyQuestionReorderItem",
     "StudyQuestionUpdate",
     "StudyQuestionResponseCreate",
     "StudyQuestionResponseOut",
     "StudyQuestionResponseUpdate",
     "StudySessionNoteCreate",
     "StudySessionNoteOut",
+    "StudySessionNotePageOut",
+    "StudySessionNotesGroupOut",
     "StudySessionNoteUpdate",
+    "SyncChange",
+    "SyncChangeResult",
+    "SyncOut",
+    "SyncRequest",
+    "SyncTombstoneOut",
     "UserCreate",
     "UserResponse",
     "UserUpdate",
@@ -0,0 +1,12 @@
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict
+
+
+class ContentCounterOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    scope: str
+    scope_id: UUID
+    kind: str
+    count: int
@@ -0,0 +1,21 @@
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict
+
+
+class JobOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    kind: str
+    # queued | running | succeeded | failed
+    status: str
+    attempts: int
+    max_attempts: int
+    last_error: str | None
+    result: Any | None
+    created_at: datetime
+    updated_at: datetime
+    finished_at: datetime | None
@@ -0,0 +1,30 @@
+from datetime import datetime
+from enum import Enum
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict
+
+
+class SearchKind(str, Enum):
+    NOTE = "note"
+    COMMENT = "comment"
+    RESPONSE = "response"
+    PASSAGE = "passage"
+
+
+class SearchResultOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    kind: SearchKind
+    id: UUID
+    group_id: UUID
+    # Session for notes and passages, passage for comments, question for responses.
+    parent_id: UUID
+    rank: float
+    headline: str
+    created_at: datetime
+
+
+class SearchPageOut(BaseModel):
+    items: list[SearchResultOut]
+    next_cursor: str | None = None
@@ -0,0 +1,62 @@
+from typing import Annotated, Literal
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+from .study_passage_comments import StudyPassageCommentOut
+from .study_passage_likes import StudyPassageLikeOut
+from .study_question_responses import StudyQuestionResponseOut
+from .study_session_notes import StudySessionNoteOut
+
+MAX_BATCH_ACTIONS = 100
+
+
+class CreateNoteAction(BaseModel):
+    op: Literal["create_note"]
+    note: str
+
+
+class CreateCommentAction(BaseModel):
+    op: Literal["create_comment"]
+    passage_id: UUID
+    comment: str
+
+
+class CreateResponseAction(BaseModel):
+    op: Literal["create_response"]
+    question_id: UUID
+    response: str
+    parent_response_id: UUID | None = None
+
+
+class LikePassageAction(BaseModel):
+    op: Literal["like_passage"]
+    passage_id: UUID
+
+
+class UnlikePassageAction(BaseModel):
+    op: Literal["unlike_passage"]
+    passage_id: UUID
+
+
+SessionAction = Annotated[
+    CreateNoteAction | CreateCommentAction | CreateResponseAction | LikePassageAction | UnlikePassageAction,
+    Field(discriminator="op"),
+]
+
+
+class SessionActionBatch(BaseModel):
+    actions: list[SessionAction] = Field(..., min_length=1, max_length=MAX_BATCH_ACTIONS)
+
+
+class SessionActionResult(BaseModel):
+    index: int
+    op: str
+    # created | exists | deleted | not_found | invalid | superseded
+    status: str
+    item: StudySessionNoteOut | StudyPassageCommentOut | StudyQuestionResponseOut | StudyPassageLikeOut | None = None
+    detail: str | None = None
+
+
+class SessionActionBatchOut(BaseModel):
+    results: list[SessionActionResult]
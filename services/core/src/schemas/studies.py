@@ -25,3 +25,9 @@ class StudyOut(BaseModel):
     is_archived: bool
     created_at: datetime
     updated_at: datetime
+
+
+class StudyImportOut(BaseModel):
+    study: StudyOut
+    # Rows created per table.
+    counts: dict[str, int]
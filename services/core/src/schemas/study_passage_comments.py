@@ -22,3 +22,4 @@ class StudyPassageCommentOut(BaseModel):
     comment: str
     created_at: datetime
     updated_at: datetime
+    row_version: int
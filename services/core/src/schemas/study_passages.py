@@ -34,3 +34,4 @@ class StudyPassageOut(BaseModel):
     version: str | None
     text: str | None
     created_at: datetime
+    row_version: int
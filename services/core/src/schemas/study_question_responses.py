@@ -24,3 +24,4 @@ class StudyQuestionResponseOut(BaseModel):
     response: str
     created_at: datetime
     updated_at: datetime
+    row_version: int
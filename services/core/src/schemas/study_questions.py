@@ -14,6 +14,16 @@ class StudyQuestionUpdate(BaseModel):
     position: int | None = None
 
 
+class StudyQuestionReorderItem(BaseModel):
+    id: UUID
+    position: int
+
+
+class StudyQuestionMove(BaseModel):
+    # Question to place this one after; None moves it first.
+    after_id: UUID | None = None
+
+
 class StudyQuestionOut(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
@@ -17,8 +17,22 @@ class StudySessionNoteOut(BaseModel):
 
     id: UUID
     session_id: UUID
+    study_id: UUID
     group_id: UUID
     user_sub: str
     note: str
     created_at: datetime
     updated_at: datetime
+    row_version: int
+
+
+class StudySessionNotePageOut(BaseModel):
+    items: list[StudySessionNoteOut]
+    next_cursor: str | None = None
+
+
+class StudySessionNotesGroupOut(BaseModel):
+    session_id: UUID
+    title: str
+    position: int
+    notes: list[StudySessionNoteOut]
@@ -21,6 +21,11 @@ class StudySessionReorderItem(BaseModel):
     position: int
 
 
+class StudySessionMove(BaseModel):
+    # Session to place this one after; None moves it first.
+    after_id: UUID | None = None
+
+
 class StudySessionOut(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
@@ -0,0 +1,58 @@
+from datetime import datetime
+from typing import Literal
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+from .study_passage_comments import StudyPassageCommentOut
+from .study_passage_likes import StudyPassageLikeOut
+from .study_question_responses import StudyQuestionResponseOut
+from .study_session_notes import StudySessionNoteOut
+
+MAX_SYNC_CHANGES = 500
+
+
+class SyncChange(BaseModel):
+    entity: Literal["note", "comment", "like", "response"]
+    action: Literal["create", "update", "delete"]
+    # Client-generated for creates and kept as the server id. Likes are
+    # addressed by passage_id instead.
+    id: UUID | None = None
+    passage_id: UUID | None = None
+    question_id: UUID | None = None
+    parent_response_id: UUID | None = None
+    text: str | None = None
+    # row_version the client edited; updates against a newer row conflict.
+    base_version: int | None = None
+    changed_at: datetime
+
+
+class SyncRequest(BaseModel):
+    since: str | None = None
+    changes: list[SyncChange] = Field(default_factory=list, max_length=MAX_SYNC_CHANGES)
+
+
+class SyncChangeResult(BaseModel):
+    index: int
+    # applied | conflict | not_found | forbidden | invalid
+    status: str
+    detail: str | None = None
+
+
+class SyncTombstoneOut(BaseModel):
+    entity: str
+    id: UUID
+    deleted_at: datetime
+
+
+class SyncOut(BaseModel):
+    token: str
+    # True when `since` was too old to diff against: drop local state and
+    # take this response as a full snapshot.
+    reset: bool
+    results: list[SyncChangeResult]
+    notes: list[StudySessionNoteOut]
+    comments: list[StudyPassageCommentOut]
+    likes: list[StudyPassageLikeOut]
+    responses: list[StudyQuestionResponseOut]
+    deleted: list[SyncTombstoneOut]
@@ -0,0 +1,100 @@
+"""Deleting very large studies and sessions in bounded batches.
+
+delete_study and delete_session remove a container with one DELETE and let
+the ON DELETE CASCADE foreign keys drop every descendant inside that
+statement. For containers with hundreds of thousands of descendants that
+single transaction holds its locks and WAL for a long time, so these
+functions instead drain the descendants deepest-first, one short
+transaction per batch, and delete the container itself last. Nothing is
+loaded into the session; every batch is a ``DELETE ... WHERE id IN
+(SELECT id ... LIMIT n)``.
+
+Descendants are deleted while their group sessions still exist, so the sync
+tombstone trigger cannot tell they are going away with them; each batch sets
+app.skip_sync_tombstones for its transaction instead.
+"""
+import os
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import delete, select, text
+from sqlalchemy.orm import Session
+
+from models.group_session import GroupSession
+from models.group_study import GroupStudy
+from models.study import Study
+from models.study_passage import StudyPassage
+from models.study_passage_comment import StudyPassageComment
+from models.study_passage_like import StudyPassageLike
+from models.study_question import StudyQuestion
+from models.study_question_response import StudyQuestionResponse
+from models.study_session import StudySession
+from models.study_session_note import StudySessionNote
+from services.counters_service import SCOPE_SESSION, SCOPE_STUDY, clear_counters
+from services.positions import clear_position_counters
+
+DELETE_BATCH_SIZE = int(os.getenv("DELETE_BATCH_SIZE", "5000"))
+
+
+def _session_descendants(session_condition: Any) -> list[tuple[Any, Any]]:
+    """(model, condition) pairs below the matching sessions, children before parents."""
+    passages = select(StudyPassage.id).where(session_condition(StudyPassage.session_id))
+    questions = select(StudyQuestion.id).where(session_condition(StudyQuestion.session_id))
+    return [
+        # Replies cascade from their parent response within the same batch.
+        (StudyQuestionResponse, StudyQuestionResponse.question_id.in_(questions)),
+        (StudyPassageComment, StudyPassageComment.passage_id.in_(passages)),
+        (StudyPassageLike, StudyPassageLike.passage_id.in_(passages)),
+        (StudySessionNote, session_condition(StudySessionNote.session_id)),
+        (StudyPassage, session_condition(StudyPassage.session_id)),
+        (StudyQuestion, session_condition(StudyQuestion.session_id)),
+        (GroupSession, session_condition(GroupSession.study_session_id)),
+    ]
+
+
+def _drain(db: Session, model: Any, condition: Any, batch_size: int) -> int:
+    deleted = 0
+    while True:
+        batch = select(model.id).where(condition).limit(batch_size)
+        db.execute(text("SELECT set_config('app.skip_sync_tombstones', 'on', true)"))
+        count = db.execute(delete(model).where(model.id.in_(batch))).rowcount
+        db.commit()
+        deleted += count
+        if count < batch_size:
+            return deleted
+
+
+def delete_session_in_batches(db: Session, session_id: UUID, batch_size: int = DELETE_BATCH_SIZE) -> int:
+    """Delete a session and its descendants batch by batch; returns the rows deleted.
+
+    Authorization is the caller's job. Safe to re-run after an interruption.
+    """
+    clear_counters(db, SCOPE_SESSION, session_id)
+    deleted = 0
+    for model, condition in _session_descendants(lambda column: column == session_id):
+        deleted += _drain(db, model, condition, batch_size)
+    clear_position_counters(db, session_id)
+    deleted += db.execute(delete(StudySession).where(StudySession.id == session_id)).rowcount
+    db.commit()
+    return deleted
+
+
+def delete_study_in_batches(db: Session, study_id: UUID, batch_size: int = DELETE_BATCH_SIZE) -> int:
+    """Delete a study and its descendants batch by batch; returns the rows deleted.
+
+    Authorization is the caller's job. Safe to re-run after an interruption.
+    """
+    sessions = select(StudySession.id).where(StudySession.study_id == study_id)
+    clear_position_counters(db, study_id, sessions)
+    steps = _session_descendants(lambda column: column.in_(sessions))
+    steps += [
+        (StudySession, StudySession.study_id == study_id),
+        (GroupStudy, GroupStudy.study_id == study_id),
+    ]
+    deleted = 0
+    for model, condition in steps:
+        deleted += _drain(db, model, condition, batch_size)
+    clear_counters(db, SCOPE_STUDY, study_id)
+    deleted += db.execute(delete(Study).where(Study.id == study_id)).rowcount
+    db.commit()
+    return deleted
@@ -0,0 +1,164 @@
+from uuid import UUID
+
+from sqlalchemy import delete, func, or_, select, text, union_all
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from models.content_counter import ContentCounter
+from models.study_passage import StudyPassage
+from models.study_question import StudyQuestion
+from models.study_session import StudySession
+
+SCOPE_GROUP = "group"
+SCOPE_STUDY = "study"
+SCOPE_SESSION = "session"
+SCOPE_PASSAGE = "passage"
+SCOPE_QUESTION = "question"
+
+KIND_MEMBERS = "members"
+KIND_NOTES = "notes"
+KIND_COMMENTS = "comments"
+KIND_LIKES = "likes"
+KIND_RESPONSES = "responses"
+
+
+def _study_of_scope(scope: str, scope_id: UUID):
+    if scope == SCOPE_SESSION:
+        return select(StudySession.study_id).where(StudySession.id == scope_id).scalar_subquery()
+    if scope == SCOPE_PASSAGE:
+        return (
+            select(StudySession.study_id)
+            .join(StudyPassage, StudyPassage.session_id == StudySession.id)
+            .where(StudyPassage.id == scope_id)
+            .scalar_subquery()
+        )
+    if scope == SCOPE_QUESTION:
+        return (
+            select(StudySession.study_id)
+            .join(StudyQuestion, StudyQuestion.session_id == StudySession.id)
+            .where(StudyQuestion.id == scope_id)
+            .scalar_subquery()
+        )
+    return None
+
+
+def bump_counter(
+    db: Session,
+    group_id: UUID,
+    scope: str,
+    scope_id: UUID,
+    kind: str,
+    delta: int,
+) -> None:
+    """Adjust a counter inside the caller's transaction with a single upsert.
+
+    The owning study is resolved server-side on first insert, so callers do
+    not need an extra lookup.
+    """
+    stmt = insert(ContentCounter).values(
+        group_id=group_id,
+        scope=scope,
+        scope_id=scope_id,
+        kind=kind,
+        study_id=_study_of_scope(scope, scope_id),
+        count=max(delta, 0),
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[
+            ContentCounter.group_id,
+            ContentCounter.scope,
+            ContentCounter.scope_id,
+            ContentCounter.kind,
+        ],
+        set_={
+            "count": func.greatest(ContentCounter.count + delta, 0),
+            "updated_at": func.now(),
+        },
+    )
+    db.execute(stmt)
+
+
+def clear_counters(db: Session, scope: str, scope_id: UUID) -> None:
+    """Drop the counters of a container that is being deleted, including nested scopes."""
+    if scope == SCOPE_STUDY:
+        condition = ContentCounter.study_id == scope_id
+    elif scope == SCOPE_SESSION:
+        condition = or_(
+            ContentCounter.scope_id == scope_id,
+            ContentCounter.scope_id.in_(
+                union_all(
+                    select(StudyPassage.id).where(StudyPassage.session_id == scope_id),
+                    select(StudyQuestion.id).where(StudyQuestion.session_id == scope_id),
+                )
+            ),
+        )
+    else:
+        condition = ContentCounter.scope_id == scope_id
+    db.execute(delete(ContentCounter).where(condition))
+
+
+def list_study_counters(db: Session, group_id: UUID, study_id: UUID) -> list[ContentCounter]:
+    """Every counter a client needs for one study screen, in one indexed query."""
+    return list(
+        db.scalars(
+            select(ContentCounter).where(
+                ContentCounter.group_id == group_id,
+                or_(
+                    ContentCounter.study_id == study_id,
+                    ContentCounter.scope == SCOPE_GROUP,
+                ),
+            )
+        )
+    )
+
+
+_REBUILD_SQL = """
+INSERT INTO content_counters (group_id, scope, scope_id, kind, study_id, count, updated_at)
+SELECT group_id, 'group', group_id, 'members', NULL, count(*), now()
+FROM group_members
+WHERE (CAST(:study_id AS uuid) IS NULL)
+GROUP BY group_id
+UNION ALL
+SELECT n.group_id, 'session', n.session_id, 'notes', n.study_id, count(*), now()
+FROM study_session_notes AS n
+WHERE n.deleted_at IS NULL AND (CAST(:study_id AS uuid) IS NULL OR n.study_id = :study_id)
+GROUP BY n.group_id, n.session_id, n.study_id
+UNION ALL
+SELECT c.group_id, 'passage', c.passage_id, 'comments', s.study_id, count(*), now()
+FROM study_passage_comments AS c
+JOIN study_passages AS p ON p.id = c.passage_id
+JOIN study_sessions AS s ON s.id = p.session_id
+WHERE c.deleted_at IS NULL AND (CAST(:study_id AS uuid) IS NULL OR s.study_id = :study_id)
+GROUP BY c.group_id, c.passage_id, s.study_id
+UNION ALL
+SELECT l.group_id, 'passage', l.passage_id, 'likes', s.study_id, count(*), now()
+FROM study_passage_likes AS l
+JOIN study_passages AS p ON p.id = l.passage_id
+JOIN study_sessions AS s ON s.id = p.session_id
+WHERE (CAST(:study_id AS uuid) IS NULL OR s.study_id = :study_id)
+GROUP BY l.group_id, l.passage_id, s.study_id
+UNION ALL
+SELECT r.group_id, 'question', r.question_id, 'responses', s.study_id, count(*), now()
+FROM study_question_responses AS r
+JOIN study_questions AS q ON q.id = r.question_id
+JOIN study_sessions AS s ON s.id = q.session_id
+WHERE r.deleted_at IS NULL AND (CAST(:study_id AS uuid) IS NULL OR s.study_id = :study_id)
+GROUP BY r.group_id, r.question_id, s.study_id
+"""
+
+
+def reconcile_counters(db: Session, study_id: UUID | None = None) -> int:
+    """Rebuild counters from the base tables, for one study or for everything.
+
+    The EXCLUSIVE lock waits for in-flight writers (which hold ROW EXCLUSIVE
+    until they commit) and holds new ones back until the rebuild commits, so
+    no increment is lost or double counted.
+    """
+    db.execute(text("LOCK TABLE content_counters IN EXCLUSIVE MODE"))
+    if study_id is None:
+        db.execute(delete(ContentCounter))
+    else:
+        db.execute(delete(ContentCounter).where(ContentCounter.study_id == study_id))
+    result = db.execute(text(_REBUILD_SQL), {"study_id": study_id})
+    db.commit()
+    return result.rowcount
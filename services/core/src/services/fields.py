@@ -0,0 +1,49 @@
+from typing import Any, Callable
+
+from fastapi import HTTPException, status
+from pydantic import BaseModel
+from sqlalchemy import Select, select
+from sqlalchemy.orm import Session
+
+
+def parse_fields(fields: str | None, schema: type[BaseModel]) -> tuple[str, ...] | None:
+    """Field names from a ``fields=a,b`` query value, checked against `schema`.
+
+    None means every field. ``id`` is always included so clients can key the
+    rows they get back.
+    """
+    if fields is None:
+        return None
+    names = [name.strip() for name in fields.split(",") if name.strip()]
+    if not names or any(name not in schema.model_fields for name in names):
+        raise ValueError("invalid_fields")
+    return ("id", *dict.fromkeys(name for name in names if name != "id"))
+
+
+def fields_param(schema: type[BaseModel]) -> Callable[[str | None], tuple[str, ...] | None]:
+    """Route dependency reading the ``fields`` query param; a bad value is a 400."""
+
+    def dependency(fields: str | None = None) -> tuple[str, ...] | None:
+        try:
+            return parse_fields(fields, schema)
+        except ValueError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"fields must be a comma separated subset of: {', '.join(schema.model_fields)}",
+            ) from exc
+
+    return dependency
+
+
+def select_fields(model: Any, fields: tuple[str, ...] | None) -> Select:
+    """SELECT of whole `model` rows, or of just the requested columns."""
+    if fields is None:
+        return select(model)
+    return select(*(getattr(model, name) for name in fields))
+
+
+def fetch_all(db: Session, query: Select, fields: tuple[str, ...] | None) -> list[Any]:
+    """Run a select_fields query: ORM objects for full rows, plain dicts for sparse ones."""
+    if fields is None:
+        return list(db.scalars(query))
+    return [dict(row._mapping) for row in db.execute(query)]
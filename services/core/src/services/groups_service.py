@@ -5,6 +5,8 @@ from sqlalchemy.orm import Session
 
 from models.group import Group
 from models.group_member import GroupMember, GroupRole
+from services.counters_service import KIND_MEMBERS, SCOPE_GROUP, bump_counter
+from services.writes import commit_created
 
 
 def list_groups(db: Session, user_sub: str) -> list[Group]:
@@ -19,6 +21,11 @@ def list_groups(db: Session, user_sub: str) -> list[Group]:
     )
 
 
+def list_group_ids(db: Session, user_sub: str) -> list[UUID]:
+    """List ids of the groups that the user is a member of."""
+    return list(db.scalars(select(GroupMember.group_id).where(GroupMember.user_sub == user_sub)))
+
+
 def create_group(db: Session, name: str, description: str | None, user_sub: str) -> Group:
     group = Group(name=name, description=description)
     db.add(group)
@@ -26,8 +33,8 @@ def create_group(db: Session, name: str, description: str | None, user_sub: str)
 
     member = GroupMember(group_id=group.id, user_sub=user_sub, role=GroupRole.LEADER)
     db.add(member)
-    db.commit()
-    db.refresh(group)
+    bump_counter(db, group.id, SCOPE_GROUP, group.id, KIND_MEMBERS, 1)
+    commit_created(db, group, member)
     return group
 
 
@@ -47,8 +54,8 @@ def join_group(db: Session, group_id: UUID, user_sub: str) -> GroupMember:
 
     member = GroupMember(group_id=group_id, user_sub=user_sub, role=GroupRole.MEMBER)
     db.add(member)
-    db.commit()
-    db.refresh(member)
+    bump_counter(db, group_id, SCOPE_GROUP, group_id, KIND_MEMBERS, 1)
+    commit_created(db, member)
     return member
 
 
@@ -62,5 +69,6 @@ def leave_group(db: Session, group_id: UUID, user_sub: str) -> None:
     if not member:
         raise ValueError("membership_not_found")
 
+    bump_counter(db, group_id, SCOPE_GROUP, group_id, KIND_MEMBERS, -1)
     db.delete(member)
     db.commit()
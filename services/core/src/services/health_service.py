@@ -1,2 +1,70 @@
+import os
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+
+from alembic.script import ScriptDirectory
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+
+from auth.cognito import check_jwks
+from db import engine
+
+# Probes can poll as often as they like; dependencies are checked at most
+# once per interval per worker.
+READINESS_CACHE_SECONDS = float(os.getenv("READINESS_CACHE_SECONDS", "5"))
+
+_readiness_lock = threading.Lock()
+_readiness: tuple[float, bool, dict[str, object]] | None = None
+
+
 def get_status() -> dict[str, str]:
     return {"status": "ok"}
+
+
+@lru_cache(maxsize=1)
+def _migration_head() -> str | None:
+    script_location = Path(__file__).resolve().parents[2] / "alembic"
+    return ScriptDirectory(str(script_location)).get_current_head()
+
+
+def _check_database() -> tuple[dict[str, object], dict[str, object]]:
+    started = time.perf_counter()
+    try:
+        with engine.connect() as connection:
+            revision = connection.execute(text("SELECT version_num FROM alembic_version")).scalar()
+    except SQLAlchemyError as exc:
+        error = {"ok": False, "error": type(exc).__name__}
+        return error, error
+
+    database = {"ok": True, "latency_ms": round((time.perf_counter() - started) * 1000, 3)}
+    head = _migration_head()
+    migrations = {"ok": revision == head, "revision": revision, "head": head}
+    return database, migrations
+
+
+def _run_checks() -> tuple[bool, dict[str, object]]:
+    database, migrations = _check_database()
+    checks = {"database": database, "migrations": migrations, "jwks": check_jwks()}
+    return all(check["ok"] for check in checks.values()), checks
+
+
+def get_readiness() -> tuple[bool, dict[str, object]]:
+    """Dependency checks, cached for READINESS_CACHE_SECONDS.
+
+    Only one thread refreshes an expired result; concurrent probes wait for
+    it instead of stacking up their own database round trips.
+    """
+    global _readiness
+    cached = _readiness
+    if cached is not None and time.monotonic() < cached[0]:
+        return cached[1], cached[2]
+
+    with _readiness_lock:
+        cached = _readiness
+        if cached is None or time.monotonic() >= cached[0]:
+            ready, checks = _run_checks()
+            cached = (time.monotonic() + READINESS_CACHE_SECONDS, ready, checks)
+            _readiness = cached
+    return cached[1], cached[2]
@@ -0,0 +1,130 @@
+import hashlib
+import json
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from fastapi import HTTPException, status
+from fastapi.responses import JSONResponse
+from sqlalchemy import delete, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from models.idempotency_key import IdempotencyKey
+
+IDEMPOTENCY_TTL = timedelta(hours=float(os.getenv("IDEMPOTENCY_TTL_HOURS", "24")))
+MAX_KEY_LENGTH = 255
+
+
+def request_fingerprint(*parts: Any) -> str:
+    """Hash of what a request asked for, so a reused key with a different body is caught."""
+    return hashlib.sha256(json.dumps(parts, default=str, separators=(",", ":")).encode()).hexdigest()
+
+
+def find_response(db: Session, user_sub: str, key: str, request_hash: str) -> IdempotencyKey | None:
+    """The stored response for `key`, via a single primary key lookup."""
+    if not key or len(key) > MAX_KEY_LENGTH:
+        raise ValueError("invalid_idempotency_key")
+
+    stored = db.scalar(
+        select(IdempotencyKey).where(
+            IdempotencyKey.user_sub == user_sub,
+            IdempotencyKey.key == key,
+            IdempotencyKey.expires_at > datetime.now(timezone.utc),
+        )
+    )
+    if stored is not None and stored.request_hash != request_hash:
+        raise ValueError("idempotency_key_reused")
+    return stored
+
+
+def find_stored_response(
+    db: Session,
+    user_sub: str,
+    idempotency_key: str,
+    request_hash: str,
+) -> IdempotencyKey | None:
+    """find_response for a route: a bad or reused key becomes a 400 or 422."""
+    try:
+        return find_response(db, user_sub, idempotency_key, request_hash)
+    except ValueError as exc:
+        if str(exc) == "invalid_idempotency_key":
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid Idempotency-Key header",
+            ) from exc
+        if str(exc) == "idempotency_key_reused":
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Idempotency-Key was already used for a different request",
+            ) from exc
+        raise
+
+
+def replay_response(stored: IdempotencyKey) -> JSONResponse:
+    """The stored response, marked as a replay."""
+    return JSONResponse(
+        status_code=stored.status_code,
+        content=stored.response,
+        headers={"Idempotent-Replayed": "true"},
+    )
+
+
+def save_response(
+    db: Session,
+    user_sub: str,
+    key: str,
+    request_hash: str,
+    status_code: int,
+    response: Any,
+) -> bool:
+    """Record the response inside the caller's transaction.
+
+    Returns False when a concurrent request with the same key committed first
+    (the insert waits for it); the caller should roll back and replay that one.
+    """
+    now = datetime.now(timezone.utc)
+    stmt = (
+        insert(IdempotencyKey)
+        .values(
+            user_sub=user_sub,
+            key=key,
+            request_hash=request_hash,
+            status_code=status_code,
+            response=response,
+            expires_at=now + IDEMPOTENCY_TTL,
+        )
+        .on_conflict_do_update(
+            index_elements=[IdempotencyKey.user_sub, IdempotencyKey.key],
+            # Only an expired entry may be taken over.
+            set_={
+                "request_hash": request_hash,
+                "status_code": status_code,
+                "response": response,
+                "created_at": now,
+                "expires_at": now + IDEMPOTENCY_TTL,
+            },
+            where=IdempotencyKey.expires_at <= now,
+        )
+        .returning(IdempotencyKey.key)
+    )
+    return db.scalar(stmt) is not None
+
+
+def purge_expired_keys(db: Session, batch_size: int = 1000) -> int:
+    """Delete expired keys in batches small enough not to hold locks for long."""
+    purged = 0
+    while True:
+        batch = (
+            select(IdempotencyKey.user_sub, IdempotencyKey.key)
+            .where(IdempotencyKey.expires_at <= datetime.now(timezone.utc))
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        deleted = db.execute(
+            delete(IdempotencyKey).where(tuple_(IdempotencyKey.user_sub, IdempotencyKey.key).in_(batch))
+        ).rowcount
+        db.commit()
+        purged += deleted
+        if deleted < batch_size:
+            return purged
@@ -1,13 +1,90 @@
+import os
 import secrets
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from uuid import UUID
 
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from metrics import CACHE_LOOKUPS, CACHE_MISSES
 from models.group import Group
 from models.group_member import GroupMember, GroupRole
 from models.invite_code import InviteCode
+from services.counters_service import KIND_MEMBERS, SCOPE_GROUP, bump_counter
+from services.writes import commit_created
+
+# Invite links are previewed far more often than they are created, revoked
+# or used. Only previews read the cache, so a preview on another worker may
+# show a revoked code for up to the TTL; joins always read the invite row.
+INVITE_CACHE_TTL_SECONDS = float(os.getenv("INVITE_CACHE_TTL_SECONDS", "30"))
+INVITE_CACHE_MAX_ENTRIES = int(os.getenv("INVITE_CACHE_MAX_ENTRIES", "10000"))
+
+_cache_lookups = CACHE_LOOKUPS.labels("invites")
+_cache_misses = CACHE_MISSES.labels("invites")
+
+
+@dataclass(frozen=True)
+class InviteGroup:
+    """The group summary shown when previewing an invite."""
+
+    id: UUID
+    name: str
+    description: str | None
+    created_at: datetime
+
+
+@dataclass(frozen=True)
+class ResolvedInvite:
+    group: InviteGroup
+    is_active: bool
+    expires_at: datetime | None
+
+    def is_usable(self) -> bool:
+        """Active and not past its expiry, judged now rather than when cached."""
+        return self.is_active and (self.expires_at is None or self.expires_at >= datetime.now(timezone.utc))
+
+
+class _InviteCache:
+    """LRU of code -> ResolvedInvite (or None for unknown codes) with a TTL."""
+
+    def __init__(self, ttl: float, max_entries: int) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, ResolvedInvite | None]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, code: str) -> tuple[bool, ResolvedInvite | None]:
+        """(found, value); expired entries count as not found."""
+        with self._lock:
+            entry = self._entries.get(code)
+            if entry is None:
+                return False, None
+            expires, value = entry
+            if expires <= time.monotonic():
+                del self._entries[code]
+                return False, None
+            self._entries.move_to_end(code)
+            return True, value
+
+    def put(self, code: str, value: ResolvedInvite | None) -> None:
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[code] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(code)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, code: str) -> None:
+        with self._lock:
+            self._entries.pop(code, None)
+
+
+_invite_cache = _InviteCache(INVITE_CACHE_TTL_SECONDS, INVITE_CACHE_MAX_ENTRIES)
 
 
 def generate_invite_code() -> str:
@@ -49,8 +126,8 @@ def create_invite(
         is_active=True,
     )
     db.add(invite)
-    db.commit()
-    db.refresh(invite)
+    commit_created(db, invite)
+    _invite_cache.invalidate(code)
     return invite
 
 
@@ -59,6 +136,36 @@ def get_invite_by_code(db: Session, code: str) -> InviteCode | None:
     return db.scalar(select(InviteCode).where(InviteCode.code == code))
 
 
+def resolve_invite(db: Session, code: str) -> ResolvedInvite | None:
+    """What an invite code points at, from the cache or one joined query.
+
+    For previews only: the answer may be up to INVITE_CACHE_TTL_SECONDS old.
+    """
+    _cache_lookups.inc()
+    found, resolved = _invite_cache.get(code)
+    if found:
+        return resolved
+
+    _cache_misses.inc()
+    row = db.execute(
+        select(
+            InviteCode.is_active,
+            InviteCode.expires_at,
+            Group.id,
+            Group.name,
+            Group.description,
+            Group.created_at,
+        )
+        .join(Group, Group.id == InviteCode.group_id)
+        .where(InviteCode.code == code)
+    ).one_or_none()
+    if row is not None:
+        is_active, expires_at, *group = row
+        resolved = ResolvedInvite(group=InviteGroup(*group), is_active=is_active, expires_at=expires_at)
+    _invite_cache.put(code, resolved)
+    return resolved
+
+
 def get_group_invites(db: Session, group_id: UUID) -> list[InviteCode]:
     """Get all active invites for a group."""
     return list(
@@ -82,10 +189,11 @@ def join_by_invite(db: Session, code: str, user_sub: str) -> GroupMember:
     if invite.expires_at and invite.expires_at < datetime.now(timezone.utc):
         raise ValueError("invite_expired")
 
+    group_id = invite.group_id
     # Check if already a member
     existing = db.scalar(
         select(GroupMember).where(
-            GroupMember.group_id == invite.group_id,
+            GroupMember.group_id == group_id,
             GroupMember.user_sub == user_sub,
         )
     )
@@ -94,13 +202,13 @@ def join_by_invite(db: Session, code: str, user_sub: str) -> GroupMember:
 
     # Add as member
     member = GroupMember(
-        group_id=invite.group_id,
+        group_id=group_id,
         user_sub=user_sub,
         role=GroupRole.MEMBER,
     )
     db.add(member)
-    db.commit()
-    db.refresh(member)
+    bump_counter(db, group_id, SCOPE_GROUP, group_id, KIND_MEMBERS, 1)
+    commit_created(db, member)
     return member
 
 
@@ -125,11 +233,12 @@ def deactivate_invite(db: Session, code: str, user_sub: str) -> None:
 
     invite.is_active = False
     db.commit()
+    _invite_cache.invalidate(code)
 
 
-def get_group_for_invite(db: Session, code: str) -> Group | None:
-    """Get the group associated with an invite code."""
-    invite = get_invite_by_code(db, code)
-    if not invite:
+def get_group_for_invite(db: Session, code: str) -> InviteGroup | None:
+    """Get the group associated with an invite code, or None if it is unknown, revoked or expired."""
+    invite = resolve_invite(db, code)
+    if not invite or not invite.is_usable():
         return None
-    return db.get(Group, invite.group_id)
+    return invite.group
@@ -0,0 +1,220 @@
+"""Postgres-backed queue for work too heavy to run inside a request.
+
+A route enqueues a Job and answers 202 with its id; jobs.worker claims jobs
+with ``SELECT ... FOR UPDATE SKIP LOCKED``, so any number of workers poll
+the table without blocking each other or taking the same job. Claiming
+moves run_after forward by the visibility timeout: a worker that dies
+leaves the job RUNNING, and it becomes claimable again once that passes.
+Failures are retried with exponential backoff until max_attempts.
+
+Handlers must be safe to run again after a partial run.
+"""
+import os
+from collections.abc import Callable
+from datetime import timedelta
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import delete, func, select, text, update
+from sqlalchemy.orm import Session
+
+from models.job import Job, JobStatus
+from services.writes import commit_created
+
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "5"))
+JOB_VISIBILITY_TIMEOUT = timedelta(seconds=float(os.getenv("JOB_VISIBILITY_TIMEOUT_SECONDS", "300")))
+JOB_RETRY_DELAY = timedelta(seconds=float(os.getenv("JOB_RETRY_DELAY_SECONDS", "10")))
+JOB_MAX_RETRY_DELAY = timedelta(seconds=float(os.getenv("JOB_MAX_RETRY_DELAY_SECONDS", "900")))
+# Finished jobs stay readable through GET /jobs/{id} this long.
+JOB_RETENTION = timedelta(seconds=float(os.getenv("JOB_RETENTION_SECONDS", str(7 * 24 * 3600))))
+
+MAX_JOBS_LIST = 100
+
+Handler = Callable[[Session, dict[str, Any]], Any]
+
+# kind -> handler(db, payload); the return value is stored as the job result
+# and must be JSON serializable.
+_HANDLERS: dict[str, Handler] = {}
+
+# Spelled exactly like the ix_jobs_claimable predicate, and without bind
+# parameters, so prepared (generic) plans can still use the partial index.
+_PENDING = text("jobs.status IN ('queued', 'running')")
+
+
+def job_handler(kind: str) -> Callable[[Handler], Handler]:
+    """Register the decorated function as the handler for `kind`."""
+
+    def register(handler: Handler) -> Handler:
+        _HANDLERS[kind] = handler
+        return handler
+
+    return register
+
+
+def get_handler(kind: str) -> Handler:
+    try:
+        return _HANDLERS[kind]
+    except KeyError:
+        raise ValueError("unknown_job_kind") from None
+
+
+def enqueue(
+    db: Session,
+    kind: str,
+    payload: dict[str, Any],
+    user_sub: str | None = None,
+    max_attempts: int = JOB_MAX_ATTEMPTS,
+) -> Job:
+    """Queue a job and commit; it runs once a worker polls."""
+    job = Job(
+        kind=kind,
+        payload=payload,
+        user_sub=user_sub,
+        status=JobStatus.QUEUED,
+        attempts=0,
+        max_attempts=max_attempts,
+    )
+    db.add(job)
+    commit_created(db, job)
+    return job
+
+
+def claim(db: Session, worker_id: str, visibility: timedelta = JOB_VISIBILITY_TIMEOUT) -> Job | None:
+    """Take the oldest runnable job, or None when there is nothing to do.
+
+    The returned job is detached; its attempts already count this run.
+    """
+    candidate = (
+        select(Job.id)
+        .where(
+            _PENDING,
+            Job.run_after <= func.now(),
+            Job.attempts < Job.max_attempts,
+        )
+        .order_by(Job.run_after)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    job = db.scalar(
+        update(Job)
+        .where(Job.id == candidate)
+        .values(
+            status=JobStatus.RUNNING,
+            attempts=Job.attempts + 1,
+            run_after=func.now() + visibility,
+            locked_by=worker_id,
+        )
+        .returning(Job)
+        .execution_options(synchronize_session=False)
+    )
+    if job is None:
+        db.commit()
+        return None
+    commit_created(db, job)
+    return job
+
+
+def _owned(job_id: UUID, worker_id: str) -> Any:
+    # A worker that overran its lease may no longer own the job; its
+    # updates are then dropped rather than clobbering the new owner's.
+    return (Job.id == job_id, Job.status == JobStatus.RUNNING, Job.locked_by == worker_id)
+
+
+def extend(db: Session, job_id: UUID, worker_id: str, visibility: timedelta = JOB_VISIBILITY_TIMEOUT) -> bool:
+    """Push the lease of a running job forward; False if it was lost."""
+    extended = db.execute(
+        update(Job).where(*_owned(job_id, worker_id)).values(run_after=func.now() + visibility)
+    ).rowcount
+    db.commit()
+    return bool(extended)
+
+
+def complete(db: Session, job_id: UUID, worker_id: str, result: Any = None) -> bool:
+    completed = db.execute(
+        update(Job)
+        .where(*_owned(job_id, worker_id))
+        .values(
+            status=JobStatus.SUCCEEDED,
+            result=result,
+            last_error=None,
+            locked_by=None,
+            finished_at=func.now(),
+        )
+    ).rowcount
+    db.commit()
+    return bool(completed)
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """Backoff before the next attempt: the base delay doubled per failed attempt."""
+    return min(JOB_RETRY_DELAY * 2 ** max(attempts - 1, 0), JOB_MAX_RETRY_DELAY)
+
+
+def fail(db: Session, job: Job, worker_id: str, error: str) -> bool:
+    """Record a failed attempt: queue a retry, or give up after max_attempts."""
+    if job.attempts >= job.max_attempts:
+        values = {"status": JobStatus.FAILED, "finished_at": func.now()}
+    else:
+        values = {"status": JobStatus.QUEUED, "run_after": func.now() + retry_delay(job.attempts)}
+    failed = db.execute(
+        update(Job)
+        .where(*_owned(job.id, worker_id))
+        .values(last_error=error[:4000], locked_by=None, **values)
+    ).rowcount
+    db.commit()
+    return bool(failed)
+
+
+def reap_abandoned(db: Session) -> int:
+    """Fail jobs whose worker died during their last allowed attempt."""
+    reaped = db.execute(
+        update(Job)
+        .where(
+            _PENDING,
+            Job.status == JobStatus.RUNNING,
+            Job.run_after <= func.now(),
+            Job.attempts >= Job.max_attempts,
+        )
+        .values(
+            status=JobStatus.FAILED,
+            last_error="worker stopped before the job finished",
+            locked_by=None,
+            finished_at=func.now(),
+        )
+    ).rowcount
+    db.commit()
+    return reaped
+
+
+def purge_finished(db: Session, batch_size: int = 1000) -> int:
+    """Delete one batch of jobs that finished more than JOB_RETENTION ago."""
+    batch = (
+        select(Job.id)
+        .where(Job.finished_at < func.now() - JOB_RETENTION)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    purged = db.execute(delete(Job).where(Job.id.in_(batch))).rowcount
+    db.commit()
+    return purged
+
+
+def get_job(db: Session, job_id: UUID, user_sub: str) -> Job:
+    job = db.get(Job, job_id)
+    # Other users' jobs are reported as missing, not forbidden.
+    if not job or job.user_sub != user_sub:
+        raise ValueError("job_not_found")
+    return job
+
+
+def list_jobs(db: Session, user_sub: str, limit: int = 20) -> list[Job]:
+    """The user's most recent jobs, newest first."""
+    return list(
+        db.scalars(
+            select(Job)
+            .where(Job.user_sub == user_sub)
+            .order_by(Job.created_at.desc())
+            .limit(min(limit, MAX_JOBS_LIST))
+        )
+    )
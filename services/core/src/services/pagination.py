@@ -0,0 +1,39 @@
+import base64
+import json
+from datetime import datetime
+from uuid import UUID
+
+
+def _to_json(value: object) -> object:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+def encode_cursor(*values: object) -> str:
+    """Encode keyset values into an opaque, URL-safe cursor."""
+    raw = json.dumps([_to_json(value) for value in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> list[object]:
+    """Decode a cursor produced by encode_cursor, checking it has `size` values."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except ValueError as exc:
+        raise ValueError("invalid_cursor") from exc
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("invalid_cursor")
+    return values
+
+
+def decode_time_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """Decode a (created_at, id) cursor used by newest-first listings."""
+    created_at, item_id = decode_cursor(cursor, 2)
+    try:
+        return datetime.fromisoformat(str(created_at)), UUID(str(item_id))
+    except ValueError as exc:
+        raise ValueError("invalid_cursor") from exc
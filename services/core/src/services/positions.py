@@ -0,0 +1,192 @@
+"""Gap-based ordering for sessions within a study and questions within a session.
+
+Positions are spaced POSITION_GAP apart, so moving one item usually means
+giving it the midpoint of its new neighbours: one row changes. Only when two
+neighbours end up adjacent is the parent's list renumbered, with a single
+UPDATE.
+
+Appends take their position from a per-parent counter row (PositionCounter)
+bumped inside the INSERT itself, so parallel creates under one parent never
+pick the same slot. Moves, reorders and rebalances lock the same row before
+reading any positions, so they queue behind each other and behind appends
+instead of computing the same midpoint, and raise the counter to the highest
+position they wrote before committing: an append waiting on the row then
+starts above it even though its own max() cannot see the move.
+"""
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import Integer, column, delete, func, insert, null, or_, select, true, update, values
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from models.position_counter import PositionCounter
+
+POSITION_GAP = 1024
+
+
+def append(db: Session, model: Any, parent_column: Any, parent_id: UUID, **fields: Any) -> Any:
+    """Insert a child of `parent_id` after its current last sibling, in one statement.
+
+    A CTE upserts the parent's counter row to
+    ``greatest(counter, max(position)) + POSITION_GAP`` and the INSERT reads
+    the new value. Concurrent appends block on that row until the first one
+    commits, then see its value. Moves and reorders raise the counter past
+    what they write before committing; max() (an index lookup on
+    ``(parent, position)``) also covers rows positioned before counters
+    existed.
+    """
+    top = func.coalesce(
+        select(func.max(model.position)).where(parent_column == parent_id).scalar_subquery(),
+        0,
+    )
+    slot = (
+        pg_insert(PositionCounter)
+        .values(scope=model.__tablename__, scope_id=parent_id, last_position=top + POSITION_GAP)
+        .on_conflict_do_update(
+            index_elements=[PositionCounter.scope, PositionCounter.scope_id],
+            set_={"last_position": func.greatest(PositionCounter.last_position, top) + POSITION_GAP},
+        )
+        .returning(PositionCounter.last_position)
+        .cte("slot")
+    )
+    return db.scalar(
+        insert(model)
+        .values(**fields, position=select(slot.c.last_position).scalar_subquery())
+        .returning(model)
+    )
+
+
+def lock_positions(db: Session, model: Any, parent_column: Any, parent_id: UUID) -> None:
+    """Lock the parent's counter row until commit and raise it to max(position).
+
+    An upsert rather than ``SELECT ... FOR UPDATE``: parents that have never
+    had an append have no counter row to lock yet. Run again after writing
+    positions, so the counter covers them by the time the lock is released.
+    """
+    top = func.coalesce(
+        select(func.max(model.position)).where(parent_column == parent_id).scalar_subquery(),
+        0,
+    )
+    db.execute(
+        pg_insert(PositionCounter)
+        .values(scope=model.__tablename__, scope_id=parent_id, last_position=top)
+        .on_conflict_do_update(
+            index_elements=[PositionCounter.scope, PositionCounter.scope_id],
+            set_={"last_position": func.greatest(PositionCounter.last_position, top)},
+        )
+    )
+
+
+def clear_position_counters(db: Session, parent_id: UUID, *child_ids: Any) -> None:
+    """Drop the counter of a parent being deleted and of its children (ids or a select)."""
+    condition = PositionCounter.scope_id == parent_id
+    for ids in child_ids:
+        condition = or_(condition, PositionCounter.scope_id.in_(ids))
+    db.execute(delete(PositionCounter).where(condition))
+
+
+def reorder(
+    db: Session,
+    model: Any,
+    parent_column: Any,
+    parent_id: UUID,
+    updates: list[tuple[UUID, int]],
+) -> list[Any]:
+    """Set many positions with one ``UPDATE ... FROM (VALUES ...) RETURNING``.
+
+    Ids that are not children of `parent_id` are ignored. Returns the updated
+    rows ordered by their new position.
+    """
+    positions = dict(updates)
+    if not positions:
+        return []
+    lock_positions(db, model, parent_column, parent_id)
+    new_positions = values(
+        column("id", PG_UUID(as_uuid=True)),
+        column("position", Integer),
+        name="new_positions",
+    ).data(list(positions.items()))
+    rows = db.scalars(
+        update(model)
+        .where(model.id == new_positions.c.id, parent_column == parent_id)
+        .values(position=new_positions.c.position)
+        .returning(model)
+        .execution_options(synchronize_session=False)
+    ).all()
+    lock_positions(db, model, parent_column, parent_id)
+    return sorted(rows, key=lambda row: (row.position, row.created_at))
+
+
+def rebalance(db: Session, model: Any, parent_column: Any, parent_id: UUID) -> None:
+    """Respace every child of `parent_id` POSITION_GAP apart, keeping their order."""
+    lock_positions(db, model, parent_column, parent_id)
+    ranked = (
+        select(
+            model.id,
+            (func.row_number().over(order_by=(model.position, model.created_at)) * POSITION_GAP).label("position"),
+        )
+        .where(parent_column == parent_id)
+        .subquery()
+    )
+    db.execute(
+        update(model)
+        .where(model.id == ranked.c.id)
+        .values(position=ranked.c.position)
+        .execution_options(synchronize_session=False)
+    )
+    lock_positions(db, model, parent_column, parent_id)
+
+
+def move_after(
+    db: Session,
+    model: Any,
+    parent_column: Any,
+    parent_id: UUID,
+    item_id: UUID,
+    after_id: UUID | None,
+) -> Any | None:
+    """Place `item_id` right after `after_id`, or first when `after_id` is None.
+
+    Returns the moved row, or None when it is not a child of `parent_id`.
+    Raises ValueError("anchor_not_found") when `after_id` is not a sibling.
+    """
+    lock_positions(db, model, parent_column, parent_id)
+    for _ in range(2):
+        lower = null()
+        if after_id is not None:
+            lower = (
+                select(model.position)
+                .where(model.id == after_id, parent_column == parent_id)
+                .scalar_subquery()
+            )
+        upper = select(func.min(model.position)).where(
+            parent_column == parent_id,
+            model.id != item_id,
+            model.position > lower if after_id is not None else true(),
+        )
+        low, high = db.execute(select(lower, upper.scalar_subquery())).one()
+        if after_id is not None and low is None:
+            raise ValueError("anchor_not_found")
+
+        if low is None:
+            position = high - POSITION_GAP if high is not None else POSITION_GAP
+        elif high is None:
+            position = low + POSITION_GAP
+        elif high - low > 1:
+            position = (low + high) // 2
+        else:
+            rebalance(db, model, parent_column, parent_id)
+            continue
+
+        moved = db.scalar(
+            update(model)
+            .where(model.id == item_id, parent_column == parent_id)
+            .values(position=position)
+            .returning(model)
+            .execution_options(synchronize_session=False)
+        )
+        lock_positions(db, model, parent_column, parent_id)
+        return moved
+    raise RuntimeError("no room after rebalancing")
@@ -0,0 +1,174 @@
+from uuid import UUID
+
+from sqlalchemy import and_, any_, bindparam, cast, func, literal, literal_column, or_, select, union_all
+from sqlalchemy.dialects.postgresql import ARRAY, DOUBLE_PRECISION
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+
+from models.study import Study
+from models.study_passage import StudyPassage
+from models.study_passage_comment import StudyPassageComment
+from models.study_question_response import StudyQuestionResponse
+from models.study_session import StudySession
+from models.study_session_note import StudySessionNote
+from services.groups_service import list_group_ids
+from services.pagination import decode_cursor, encode_cursor
+
+# Must match the text search configuration of the generated search_vector columns,
+# otherwise the GIN indexes cannot be used.
+SEARCH_CONFIG = literal_column("'english'::regconfig")
+HEADLINE_OPTIONS = "StartSel=<mark>, StopSel=</mark>, MaxWords=35, MinWords=15, MaxFragments=2"
+
+SEARCH_KINDS = ("note", "comment", "response", "passage")
+
+
+def _matches(column, ts_query):
+    return column.bool_op("@@")(ts_query)
+
+
+def _rank(column, ts_query):
+    # ts_rank_cd returns real; as double precision the value in the cursor
+    # round-trips exactly, so rows tied with the last one on a page are not
+    # skipped by the next page's comparison.
+    return cast(func.ts_rank_cd(column, ts_query), DOUBLE_PRECISION).label("rank")
+
+
+def _note_hits(group_ids, ts_query):
+    return select(
+        literal("note").label("kind"),
+        StudySessionNote.id.label("id"),
+        StudySessionNote.group_id.label("group_id"),
+        StudySessionNote.session_id.label("parent_id"),
+        StudySessionNote.created_at.label("created_at"),
+        StudySessionNote.note.label("body"),
+        _rank(StudySessionNote.search_vector, ts_query),
+    ).where(
+        StudySessionNote.group_id == any_(group_ids),
+        StudySessionNote.deleted_at.is_(None),
+        _matches(StudySessionNote.search_vector, ts_query),
+    )
+
+
+def _comment_hits(group_ids, ts_query):
+    return select(
+        literal("comment").label("kind"),
+        StudyPassageComment.id.label("id"),
+        StudyPassageComment.group_id.label("group_id"),
+        StudyPassageComment.passage_id.label("parent_id"),
+        StudyPassageComment.created_at.label("created_at"),
+        StudyPassageComment.comment.label("body"),
+        _rank(StudyPassageComment.search_vector, ts_query),
+    ).where(
+        StudyPassageComment.group_id == any_(group_ids),
+        StudyPassageComment.deleted_at.is_(None),
+        _matches(StudyPassageComment.search_vector, ts_query),
+    )
+
+
+def _response_hits(group_ids, ts_query):
+    return select(
+        literal("response").label("kind"),
+        StudyQuestionResponse.id.label("id"),
+        StudyQuestionResponse.group_id.label("group_id"),
+        StudyQuestionResponse.question_id.label("parent_id"),
+        StudyQuestionResponse.created_at.label("created_at"),
+        StudyQuestionResponse.response.label("body"),
+        _rank(StudyQuestionResponse.search_vector, ts_query),
+    ).where(
+        StudyQuestionResponse.group_id == any_(group_ids),
+        StudyQuestionResponse.deleted_at.is_(None),
+        _matches(StudyQuestionResponse.search_vector, ts_query),
+    )
+
+
+def _passage_hits(group_ids, ts_query):
+    return (
+        select(
+            literal("passage").label("kind"),
+            StudyPassage.id.label("id"),
+            Study.group_id.label("group_id"),
+            StudyPassage.session_id.label("parent_id"),
+            StudyPassage.created_at.label("created_at"),
+            StudyPassage.text.label("body"),
+            _rank(StudyPassage.search_vector, ts_query),
+        )
+        .join(StudySession, StudyPassage.session_id == StudySession.id)
+        .join(Study, StudySession.study_id == Study.id)
+        .where(
+            Study.group_id == any_(group_ids),
+            _matches(StudyPassage.search_vector, ts_query),
+        )
+    )
+
+
+_HIT_BUILDERS = {
+    "note": _note_hits,
+    "comment": _comment_hits,
+    "response": _response_hits,
+    "passage": _passage_hits,
+}
+
+
+def search_content(
+    db: Session,
+    user_sub: str,
+    query: str,
+    kinds: list[str] | None,
+    limit: int,
+    cursor: str | None,
+) -> tuple[list[Row], str | None]:
+    """Rank notes, comments, responses and passages in the caller's groups.
+
+    Results are ordered by rank and then id, and paginated with a keyset cursor
+    over that pair. Headlines are only generated for the rows on the page.
+    """
+    after: tuple[float, UUID] | None = None
+    if cursor is not None:
+        rank, item_id = decode_cursor(cursor, 2)
+        try:
+            after = (float(rank), UUID(str(item_id)))
+        except (TypeError, ValueError) as exc:
+            raise ValueError("invalid_cursor") from exc
+
+    group_ids = list_group_ids(db, user_sub)
+    if not group_ids:
+        return [], None
+
+    group_param = bindparam("group_ids", group_ids, type_=ARRAY(PG_UUID(as_uuid=True)))
+    ts_query = func.websearch_to_tsquery(SEARCH_CONFIG, query)
+    selected = kinds or list(SEARCH_KINDS)
+    hits = union_all(*(_HIT_BUILDERS[kind](group_param, ts_query) for kind in selected)).subquery("hits")
+
+    page = select(hits)
+    if after is not None:
+        page = page.where(
+            or_(
+                hits.c.rank < after[0],
+                and_(hits.c.rank == after[0], hits.c.id < after[1]),
+            )
+        )
+    page = page.order_by(hits.c.rank.desc(), hits.c.id.desc()).limit(limit + 1).subquery("page")
+
+    rows = list(
+        db.execute(
+            select(
+                page.c.kind,
+                page.c.id,
+                page.c.group_id,
+                page.c.parent_id,
+                page.c.created_at,
+                page.c.rank,
+                func.ts_headline(SEARCH_CONFIG, page.c.body, ts_query, HEADLINE_OPTIONS).label(
+                    "headline"
+                ),
+            ).order_by(page.c.rank.desc(), page.c.id.desc())
+        )
+    )
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(last.rank, last.id)
+    return rows, next_cursor
@@ -0,0 +1,287 @@
+import uuid
+from collections import Counter
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from models.group_member import GroupMember
+from models.group_session import GroupSession
+from models.group_study import GroupStudy
+from models.study_passage import StudyPassage
+from models.study_passage_comment import StudyPassageComment
+from models.study_passage_like import StudyPassageLike
+from models.study_question import StudyQuestion
+from models.study_question_response import StudyQuestionResponse
+from models.study_session import StudySession
+from models.study_session_note import StudySessionNote
+from services.counters_service import (
+    KIND_COMMENTS,
+    KIND_LIKES,
+    KIND_NOTES,
+    KIND_RESPONSES,
+    SCOPE_PASSAGE,
+    SCOPE_QUESTION,
+    SCOPE_SESSION,
+    bump_counter,
+)
+from services.writes import commit_created
+
+
+def ensure_group_session(db: Session, group_id: UUID, session: StudySession, create: bool = True) -> UUID | None:
+    """Id of the group's materialized copy of `session`, creating it on first use.
+
+    The common case is one indexed lookup; the upserts only run for the first
+    write of a group in a session and tolerate a concurrent first writer.
+    With ``create=False`` a missing copy is reported as None.
+    """
+    lookup = (
+        select(GroupSession.id)
+        .join(GroupStudy, GroupStudy.id == GroupSession.group_study_id)
+        .where(
+            GroupStudy.group_id == group_id,
+            GroupStudy.study_id == session.study_id,
+            GroupSession.study_session_id == session.id,
+        )
+    )
+    group_session_id = db.scalar(lookup)
+    if group_session_id is not None or not create:
+        return group_session_id
+
+    db.execute(
+        pg_insert(GroupStudy)
+        .values(id=uuid.uuid4(), group_id=group_id, study_id=session.study_id)
+        .on_conflict_do_nothing(index_elements=[GroupStudy.group_id, GroupStudy.study_id])
+    )
+    group_study_id = (
+        select(GroupStudy.id)
+        .where(GroupStudy.group_id == group_id, GroupStudy.study_id == session.study_id)
+        .scalar_subquery()
+    )
+    db.execute(
+        pg_insert(GroupSession)
+        .values(id=uuid.uuid4(), group_study_id=group_study_id, study_session_id=session.id)
+        .on_conflict_do_nothing(index_elements=[GroupSession.group_study_id, GroupSession.study_session_id])
+    )
+    return db.scalar(lookup)
+
+
+def _result(index: int, action: dict[str, Any], status: str, item: Any = None, detail: str | None = None) -> dict:
+    return {"index": index, "op": action["op"], "status": status, "item": item, "detail": detail}
+
+
+def apply_session_actions(
+    db: Session,
+    session_id: UUID,
+    group_id: UUID,
+    user_sub: str,
+    actions: list[dict[str, Any]],
+) -> list[dict[str, Any]]:
+    """Apply a burst of member actions in one transaction.
+
+    Membership and the group session are resolved once, referenced passages,
+    questions and parent responses are validated with one query per kind,
+    and each kind of row is written with a single multi-row statement.
+    Invalid items are reported per item and skipped; the rest still commit.
+    Likes and unlikes of one passage take effect in the order submitted.
+    """
+    session = db.get(StudySession, session_id)
+    if not session:
+        raise ValueError("session_not_found")
+
+    is_member = db.scalar(
+        select(GroupMember.id).where(GroupMember.group_id == group_id, GroupMember.user_sub == user_sub)
+    )
+    if is_member is None:
+        raise ValueError("forbidden")
+
+    passage_ids = {a["passage_id"] for a in actions if "passage_id" in a}
+    question_ids = {a["question_id"] for a in actions if "question_id" in a}
+    parent_ids = {a["parent_response_id"] for a in actions if a.get("parent_response_id")}
+
+    valid_passages = set()
+    if passage_ids:
+        valid_passages = set(
+            db.scalars(
+                select(StudyPassage.id).where(
+                    StudyPassage.session_id == session_id,
+                    StudyPassage.id.in_(passage_ids),
+                )
+            )
+        )
+    valid_questions = set()
+    if question_ids:
+        valid_questions = set(
+            db.scalars(
+                select(StudyQuestion.id).where(
+                    StudyQuestion.session_id == session_id,
+                    StudyQuestion.id.in_(question_ids),
+                )
+            )
+        )
+    parents: dict[UUID, UUID] = {}
+    if parent_ids:
+        parents = dict(
+            db.execute(
+                select(StudyQuestionResponse.id, StudyQuestionResponse.question_id).where(
+                    StudyQuestionResponse.id.in_(parent_ids),
+                    StudyQuestionResponse.group_id == group_id,
+                    StudyQuestionResponse.deleted_at.is_(None),
+                )
+            ).all()
+        )
+
+    results: list[dict[str, Any] | None] = [None] * len(actions)
+    notes: list[tuple[int, dict]] = []
+    comments: list[tuple[int, dict]] = []
+    responses: list[tuple[int, dict]] = []
+    passage_ops: dict[UUID, list[int]] = {}
+
+    for index, action in enumerate(actions):
+        op = action["op"]
+        if "passage_id" in action and action["passage_id"] not in valid_passages:
+            results[index] = _result(index, action, "not_found", detail="Passage not found")
+        elif op == "create_response" and action["question_id"] not in valid_questions:
+            results[index] = _result(index, action, "not_found", detail="Question not found")
+        elif op == "create_response" and action.get("parent_response_id") and (
+            parents.get(action["parent_response_id"]) != action["question_id"]
+        ):
+            results[index] = _result(index, action, "invalid", detail="Invalid parent response")
+        elif op == "create_note":
+            notes.append((index, action))
+        elif op == "create_comment":
+            comments.append((index, action))
+        elif op == "create_response":
+            responses.append((index, action))
+        elif op in ("like_passage", "unlike_passage"):
+            passage_ops.setdefault(action["passage_id"], []).append(index)
+
+    # Each passage ends up as its last like or unlike says; the repeats that
+    # end the batch are applied, anything they override is superseded.
+    likes: dict[UUID, list[int]] = {}
+    unlikes: dict[UUID, list[int]] = {}
+    for passage_id, indexes in passage_ops.items():
+        final_op = actions[indexes[-1]]["op"]
+        start = len(indexes)
+        while start and actions[indexes[start - 1]]["op"] == final_op:
+            start -= 1
+        for index in indexes[:start]:
+            results[index] = _result(index, actions[index], "superseded", detail="Overridden by a later action")
+        (likes if final_op == "like_passage" else unlikes)[passage_id] = indexes[start:]
+
+    group_session_id = None
+    if notes or comments or responses or likes:
+        group_session_id = ensure_group_session(db, group_id, session)
+
+    common = {"group_id": group_id, "group_session_id": group_session_id, "user_sub": user_sub}
+
+    if notes:
+        rows = db.scalars(
+            insert(StudySessionNote).returning(StudySessionNote, sort_by_parameter_order=True),
+            [{**common, "session_id": session_id, "study_id": session.study_id, "note": a["note"]} for _, a in notes],
+        ).all()
+        for (index, action), row in zip(notes, rows):
+            results[index] = _result(index, action, "created", row)
+        bump_counter(db, group_id, SCOPE_SESSION, session_id, KIND_NOTES, len(rows))
+
+    if comments:
+        rows = db.scalars(
+            insert(StudyPassageComment).returning(StudyPassageComment, sort_by_parameter_order=True),
+            [{**common, "passage_id": a["passage_id"], "comment": a["comment"]} for _, a in comments],
+        ).all()
+        for (index, action), row in zip(comments, rows):
+            results[index] = _result(index, action, "created", row)
+        for passage_id, count in Counter(row.passage_id for row in rows).items():
+            bump_counter(db, group_id, SCOPE_PASSAGE, passage_id, KIND_COMMENTS, count)
+
+    if responses:
+        # A member may reply to a given response only once (uq_question_response);
+        # repeats are reported per item instead of aborting the batch.
+        ids = [uuid.uuid4() for _ in responses]
+        inserted = {
+            row.id: row
+            for row in db.scalars(
+                pg_insert(StudyQuestionResponse)
+                .values(
+                    [
+                        {
+                            **common,
+                            "id": response_id,
+                            "question_id": a["question_id"],
+                            "parent_response_id": a.get("parent_response_id"),
+                            "response": a["response"],
+                            "row_version": 1,
+                        }
+                        for response_id, (_, a) in zip(ids, responses)
+                    ]
+                )
+                .on_conflict_do_nothing()
+                .returning(StudyQuestionResponse)
+            )
+        }
+        for response_id, (index, action) in zip(ids, responses):
+            row = inserted.get(response_id)
+            if row is None:
+                results[index] = _result(index, action, "exists", detail="Already replied to this response")
+            else:
+                results[index] = _result(index, action, "created", row)
+        for question_id, count in Counter(row.question_id for row in inserted.values()).items():
+            bump_counter(db, group_id, SCOPE_QUESTION, question_id, KIND_RESPONSES, count)
+
+    if unlikes:
+        removed = set(
+            db.scalars(
+                delete(StudyPassageLike)
+                .where(
+                    StudyPassageLike.group_id == group_id,
+                    StudyPassageLike.user_sub == user_sub,
+                    StudyPassageLike.passage_id.in_(unlikes),
+                )
+                .returning(StudyPassageLike.passage_id)
+            )
+        )
+        for passage_id, indexes in unlikes.items():
+            for index in indexes:
+                status = "deleted" if passage_id in removed else "not_found"
+                results[index] = _result(index, actions[index], status)
+            if passage_id in removed:
+                bump_counter(db, group_id, SCOPE_PASSAGE, passage_id, KIND_LIKES, -1)
+
+    if likes:
+        # Liking twice is not an error: conflicts keep the existing like.
+        inserted = {
+            row.passage_id: row
+            for row in db.scalars(
+                pg_insert(StudyPassageLike)
+                .values([{**common, "id": uuid.uuid4(), "passage_id": passage_id} for passage_id in likes])
+                .on_conflict_do_nothing(constraint="uq_passage_like")
+                .returning(StudyPassageLike)
+            )
+        }
+        existing = {}
+        if len(inserted) < len(likes):
+            existing = {
+                row.passage_id: row
+                for row in db.scalars(
+                    select(StudyPassageLike).where(
+                        StudyPassageLike.group_id == group_id,
+                        StudyPassageLike.user_sub == user_sub,
+                        StudyPassageLike.passage_id.in_(set(likes) - set(inserted)),
+                    )
+                )
+            }
+        for passage_id, indexes in likes.items():
+            row = inserted.get(passage_id)
+            for position, index in enumerate(indexes):
+                if row is not None and position == 0:
+                    results[index] = _result(index, actions[index], "created", row)
+                else:
+                    results[index] = _result(index, actions[index], "exists", row or existing.get(passage_id))
+            if row is not None:
+                bump_counter(db, group_id, SCOPE_PASSAGE, passage_id, KIND_LIKES, 1)
+
+    # Returned rows are already complete; keep them usable after commit.
+    commit_created(db, *{id(r["item"]): r["item"] for r in results if r["item"] is not None}.values())
+    return results
@@ -0,0 +1,72 @@
+"""Soft deletes for notes, comments and responses.
+
+Deleting only stamps deleted_at with one UPDATE, so the request no longer
+pays for index maintenance, the sync tombstone trigger and the reply
+cascade of a hard delete. Reads filter on ``deleted_at IS NULL`` (the hot
+indexes are partial on it) and jobs.purge_deleted_content removes the rows
+later, in bounded batches.
+"""
+import os
+from collections import Counter
+from datetime import timedelta
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.orm import Session
+
+from models.study_passage_comment import StudyPassageComment
+from models.study_question_response import StudyQuestionResponse
+from models.study_session_note import StudySessionNote
+
+SOFT_DELETED_MODELS = (StudySessionNote, StudyPassageComment, StudyQuestionResponse)
+
+# Soft-deleted rows are kept at least this long before they are purged.
+PURGE_GRACE = timedelta(seconds=float(os.getenv("CONTENT_PURGE_GRACE_SECONDS", "600")))
+
+
+def response_thread(root_condition: Any) -> Any:
+    """Ids of the matching responses and of all their replies, at any depth."""
+    thread = select(StudyQuestionResponse.id).where(root_condition).cte("thread", recursive=True)
+    thread = thread.union_all(
+        select(StudyQuestionResponse.id).where(StudyQuestionResponse.parent_response_id == thread.c.id)
+    )
+    return select(thread.c.id)
+
+
+def soft_delete(db: Session, model: Any, parent_column: Any, condition: Any) -> Counter[tuple[UUID, UUID]]:
+    """Mark the live rows matching `condition` deleted, in the caller's transaction.
+
+    Returns how many rows were deleted per (group_id, parent id), which is
+    what the content counters need. updated_at moves too, so sync clients
+    see the deletion in their next delta.
+    """
+    rows = db.execute(
+        update(model)
+        .where(condition, model.deleted_at.is_(None))
+        .values(deleted_at=func.now())
+        .returning(model.group_id, parent_column)
+        .execution_options(synchronize_session=False)
+    )
+    return Counter((group_id, parent_id) for group_id, parent_id in rows)
+
+
+def purge_deleted(db: Session, model: Any, batch_size: int) -> int:
+    """Hard-delete one batch of rows soft-deleted more than PURGE_GRACE ago."""
+    batch = (
+        select(model.id)
+        .where(model.deleted_at < func.now() - PURGE_GRACE)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    purged = db.execute(delete(model).where(model.id.in_(batch))).rowcount
+    db.commit()
+    return purged
+
+
+def purge_backlog(db: Session) -> dict[str, int]:
+    """Soft-deleted rows per table, read from the partial deleted_at indexes."""
+    return {
+        model.__tablename__: db.scalar(select(func.count()).where(model.deleted_at.is_not(None)))
+        for model in SOFT_DELETED_MODELS
+    }
@@ -1,10 +1,15 @@
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import delete, select
 from sqlalchemy.orm import Session
 
 from models.group_member import GroupMember, GroupRole
 from models.study import Study
+from models.study_session import StudySession
+from services.counters_service import SCOPE_STUDY, clear_counters
+from services.fields import fetch_all, select_fields
+from services.positions import clear_position_counters
+from services.writes import commit_created
 
 
 def _is_group_leader(db: Session, group_id: UUID, user_sub: str) -> bool:
@@ -18,8 +23,8 @@ def _is_group_leader(db: Session, group_id: UUID, user_sub: str) -> bool:
     return membership is not None
 
 
-def list_studies(db: Session, group_id: UUID) -> list[Study]:
-    return list(db.scalars(select(Study).where(Study.group_id == group_id)))
+def list_studies(db: Session, group_id: UUID, fields: tuple[str, ...] | None = None) -> list[Study]:
+    return fetch_all(db, select_fields(Study, fields).where(Study.group_id == group_id), fields)
 
 
 def create_study(
@@ -34,8 +39,7 @@ def create_study(
 
     study = Study(group_id=group_id, title=title, description=description)
     db.add(study)
-    db.commit()
-    db.refresh(study)
+    commit_created(db, study)
     return study
 
 
@@ -66,13 +70,22 @@ def update_study(
     return study
 
 
-def delete_study(db: Session, study_id: UUID, user_sub: str) -> None:
+def get_deletable_study(db: Session, study_id: UUID, user_sub: str) -> Study:
     study = db.get(Study, study_id)
     if not study:
         raise ValueError("study_not_found")
 
     if not _is_group_leader(db, study.group_id, user_sub):
         raise ValueError("forbidden")
+    return study
+
+
+def delete_study(db: Session, study_id: UUID, user_sub: str) -> None:
+    study = get_deletable_study(db, study_id, user_sub)
 
-    db.delete(study)
+    clear_counters(db, SCOPE_STUDY, study.id)
+    clear_position_counters(db, study.id, select(StudySession.id).where(StudySession.study_id == study.id))
+    # One statement; sessions, passages, questions and all group content go
+    # with it through the ON DELETE CASCADE foreign keys, never via the ORM.
+    db.execute(delete(Study).where(Study.id == study.id))
     db.commit()
@@ -0,0 +1,337 @@
+"""Streaming study exports as JSON, CSV or Markdown.
+
+export_records walks a study in document order: the study, then for every
+session its passages, its questions each followed by the group's responses,
+and the group's notes. Sessions are read up front (there are few); everything
+below them comes from one index-ordered query per session and kind, run with
+``yield_per`` so psycopg reads it through a server-side cursor. The writers
+turn that record stream into text chunks of about EXPORT_CHUNK_BYTES, so
+memory stays flat however large the study is. Soft-deleted rows are left out.
+"""
+import csv
+import io
+import json
+import os
+from collections.abc import Iterable, Iterator
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import and_, or_, select
+from sqlalchemy.orm import Session
+
+from models.group_member import GroupMember, GroupRole
+from models.group_study import GroupStudy
+from models.study import Study
+from models.study_passage import StudyPassage
+from models.study_question import StudyQuestion
+from models.study_question_response import StudyQuestionResponse
+from models.study_session import StudySession
+from models.study_session_note import StudySessionNote
+
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "2000"))
+EXPORT_CHUNK_BYTES = int(os.getenv("EXPORT_CHUNK_BYTES", str(64 * 1024)))
+
+# format -> (media type, file extension)
+EXPORT_FORMATS = {
+    "json": ("application/json", "json"),
+    "csv": ("text/csv; charset=utf-8", "csv"),
+    "markdown": ("text/markdown; charset=utf-8", "md"),
+}
+
+Record = tuple[str, dict[str, Any]]
+
+
+def get_exportable_study(db: Session, group_id: UUID, study_id: UUID, user_sub: str) -> Study:
+    """The study, if `group_id` owns or uses it and `user_sub` leads that group."""
+    study = db.scalar(
+        select(Study).where(
+            Study.id == study_id,
+            or_(
+                Study.group_id == group_id,
+                select(GroupStudy.id)
+                .where(GroupStudy.group_id == group_id, GroupStudy.study_id == study_id)
+                .exists(),
+            ),
+        )
+    )
+    if not study:
+        raise ValueError("study_not_found")
+
+    is_leader = db.scalar(
+        select(GroupMember.id).where(
+            GroupMember.group_id == group_id,
+            GroupMember.user_sub == user_sub,
+            GroupMember.role == GroupRole.LEADER,
+        )
+    )
+    if is_leader is None:
+        raise ValueError("forbidden")
+    return study
+
+
+def _stream(db: Session, query: Any) -> Iterator[dict[str, Any]]:
+    for row in db.execute(query, execution_options={"yield_per": EXPORT_BATCH_SIZE}):
+        yield row._mapping
+
+
+def export_records(db: Session, study: Study, group_id: UUID) -> Iterator[Record]:
+    """(kind, fields) pairs for the whole study, in document order.
+
+    All reads share one REPEATABLE READ transaction, so the export is a
+    consistent snapshot even while the study is being edited.
+    """
+    study_fields = {
+        "id": study.id,
+        "title": study.title,
+        "description": study.description,
+        "created_at": study.created_at,
+    }
+    db.commit()
+    db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+
+    yield "study", study_fields
+    sessions = db.execute(
+        select(StudySession.id, StudySession.position, StudySession.title, StudySession.description)
+        .where(StudySession.study_id == study.id)
+        .order_by(StudySession.position)
+    ).all()
+    for session in sessions:
+        yield "session", dict(session._mapping)
+        for passage in _stream(
+            db,
+            select(
+                StudyPassage.id,
+                StudyPassage.book,
+                StudyPassage.chapter,
+                StudyPassage.start_verse,
+                StudyPassage.end_verse,
+                StudyPassage.version,
+                StudyPassage.text,
+            )
+            .where(StudyPassage.session_id == session.id)
+            .order_by(StudyPassage.created_at, StudyPassage.id),
+        ):
+            yield "passage", dict(passage)
+
+        # One row per response, or one with no response for an unanswered
+        # question; ordered so each question's responses follow it.
+        question_id = None
+        for row in _stream(
+            db,
+            select(
+                StudyQuestion.id.label("question_id"),
+                StudyQuestion.position,
+                StudyQuestion.question,
+                StudyQuestionResponse.id,
+                StudyQuestionResponse.parent_response_id,
+                StudyQuestionResponse.user_sub,
+                StudyQuestionResponse.response,
+                StudyQuestionResponse.created_at,
+            )
+            .outerjoin(
+                StudyQuestionResponse,
+                and_(
+                    StudyQuestionResponse.question_id == StudyQuestion.id,
+                    StudyQuestionResponse.group_id == group_id,
+                    StudyQuestionResponse.deleted_at.is_(None),
+                ),
+            )
+            .where(StudyQuestion.session_id == session.id)
+            .order_by(
+                StudyQuestion.position,
+                StudyQuestion.id,
+                StudyQuestionResponse.created_at,
+                StudyQuestionResponse.id,
+            ),
+        ):
+            if row["question_id"] != question_id:
+                question_id = row["question_id"]
+                yield "question", {"id": question_id, "position": row["position"], "question": row["question"]}
+            if row["id"] is not None:
+                yield "response", {
+                    "id": row["id"],
+                    "parent_response_id": row["parent_response_id"],
+                    "user_sub": row["user_sub"],
+                    "response": row["response"],
+                    "created_at": row["created_at"],
+                }
+
+        for note in _stream(
+            db,
+            select(StudySessionNote.id, StudySessionNote.user_sub, StudySessionNote.note, StudySessionNote.created_at)
+            .where(
+                StudySessionNote.session_id == session.id,
+                StudySessionNote.group_id == group_id,
+                StudySessionNote.deleted_at.is_(None),
+            )
+            .order_by(StudySessionNote.created_at, StudySessionNote.id),
+        ):
+            yield "note", dict(note)
+    db.commit()
+
+
+def _chunked(pieces: Iterable[str]) -> Iterator[str]:
+    """Join small pieces into chunks of about EXPORT_CHUNK_BYTES."""
+    buffer: list[str] = []
+    size = 0
+    for piece in pieces:
+        buffer.append(piece)
+        size += len(piece)
+        if size >= EXPORT_CHUNK_BYTES:
+            yield "".join(buffer)
+            buffer.clear()
+            size = 0
+    if buffer:
+        yield "".join(buffer)
+
+
+def _json_value(value: Any) -> Any:
+    if isinstance(value, UUID):
+        return str(value)
+    return value.isoformat()
+
+
+def _json(fields: dict[str, Any]) -> str:
+    return json.dumps(fields, default=_json_value, ensure_ascii=False)
+
+
+# List each kind is written to inside its parent object.
+_JSON_LISTS = {
+    "session": "sessions",
+    "passage": "passages",
+    "question": "questions",
+    "response": "responses",
+    "note": "notes",
+}
+_JSON_DEPTH = {"study": 0, "session": 1, "passage": 2, "question": 2, "response": 3, "note": 2}
+
+
+def _json_pieces(records: Iterable[Record]) -> Iterator[str]:
+    # Each open object is [kind, name of its open child list or None, items
+    # written to that list so far].
+    stack: list[list[Any]] = []
+    for kind, fields in records:
+        depth = _JSON_DEPTH[kind]
+        while len(stack) > depth:
+            _, open_list, _ = stack.pop()
+            yield "]}" if open_list else "}"
+        if stack:
+            parent = stack[-1]
+            list_name = _JSON_LISTS[kind]
+            if parent[1] != list_name:
+                yield f'],"{list_name}":[' if parent[1] else f',"{list_name}":['
+                parent[1], parent[2] = list_name, 0
+            if parent[2]:
+                yield ","
+            parent[2] += 1
+        yield _json(fields)[:-1]
+        stack.append([kind, None, 0])
+    while stack:
+        _, open_list, _ = stack.pop()
+        yield "]}" if open_list else "}"
+
+
+_CSV_COLUMNS = (
+    "entity",
+    "id",
+    "parent_id",
+    "reply_to",
+    "position",
+    "title",
+    "description",
+    "book",
+    "chapter",
+    "start_verse",
+    "end_verse",
+    "version",
+    "user_sub",
+    "created_at",
+    "text",
+)
+# Field holding each kind's main text, written to the text column.
+_CSV_TEXT = {"passage": "text", "question": "question", "response": "response", "note": "note"}
+# Kind whose id is the parent_id of each kind.
+_CSV_PARENT = {"session": "study", "passage": "session", "question": "session", "response": "question", "note": "session"}
+
+
+def _csv_pieces(records: Iterable[Record]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=_CSV_COLUMNS, extrasaction="ignore")
+    writer.writeheader()
+    current: dict[str, Any] = {}
+    for kind, fields in records:
+        current[kind] = fields["id"]
+        row = dict(fields, entity=kind)
+        if kind in _CSV_PARENT:
+            row["parent_id"] = current[_CSV_PARENT[kind]]
+        if kind in _CSV_TEXT:
+            row["text"] = fields[_CSV_TEXT[kind]]
+        if kind == "response":
+            row["reply_to"] = fields["parent_response_id"]
+        writer.writerow(row)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+
+def _indented(text: str | None, prefix: str) -> str:
+    return (text or "").strip().replace("\n", "\n" + prefix)
+
+
+def _reference(passage: dict[str, Any]) -> str:
+    reference = f"{passage['book']} {passage['chapter']}"
+    if passage["start_verse"] is not None:
+        reference += f":{passage['start_verse']}"
+        if passage["end_verse"] is not None and passage["end_verse"] != passage["start_verse"]:
+            reference += f"-{passage['end_verse']}"
+    if passage["version"]:
+        reference += f" ({passage['version']})"
+    return reference
+
+
+def _markdown_pieces(records: Iterable[Record]) -> Iterator[str]:
+    session_number = question_number = 0
+    section = None
+    for kind, fields in records:
+        if kind == "study":
+            yield f"# {fields['title']}\n\n"
+            if fields["description"]:
+                yield f"{fields['description'].strip()}\n\n"
+        elif kind == "session":
+            session_number += 1
+            question_number = 0
+            section = None
+            yield f"\n## {session_number}. {fields['title']}\n\n"
+            if fields["description"]:
+                yield f"{fields['description'].strip()}\n\n"
+        else:
+            heading = {"passage": "Passages", "question": "Questions", "response": "Questions", "note": "Notes"}[kind]
+            if heading != section:
+                section = heading
+                yield f"\n### {heading}\n\n"
+            if kind == "passage":
+                yield f"- **{_reference(fields)}**\n"
+                if fields["text"]:
+                    yield f"\n  {_indented(fields['text'], '  ')}\n\n"
+            elif kind == "question":
+                question_number += 1
+                yield f"{question_number}. {_indented(fields['question'], '   ')}\n"
+            elif kind == "response":
+                reply = "↳ " if fields["parent_response_id"] else ""
+                yield (
+                    f"   - {reply}**{fields['user_sub']}** ({fields['created_at']:%Y-%m-%d}): "
+                    f"{_indented(fields['response'], '     ')}\n"
+                )
+            else:
+                yield (
+                    f"- **{fields['user_sub']}** ({fields['created_at']:%Y-%m-%d}): "
+                    f"{_indented(fields['note'], '  ')}\n"
+                )
+
+
+_WRITERS = {"json": _json_pieces, "csv": _csv_pieces, "markdown": _markdown_pieces}
+
+
+def render_export(records: Iterable[Record], export_format: str) -> Iterator[str]:
+    """Text chunks of the export in `export_format` (a key of EXPORT_FORMATS)."""
+    return _chunked(_WRITERS[export_format](records))
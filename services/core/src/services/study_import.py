@@ -0,0 +1,201 @@
+"""Importing a study archive with COPY and set-based SQL.
+
+The archive is the CSV export (services.study_export): one row per entity in
+document order, each with its id and its parent's id. The parser streams it
+row by row straight into a ``COPY`` to a temporary staging table, giving every
+session, passage and question a new id on the way. Three ``INSERT ... SELECT``
+statements then move the staged rows into the real tables, joining on the old
+ids to find each child's new parent and renumbering positions. Nothing is
+held in memory and no ORM object is built per row, so a large curriculum
+loads in seconds. Responses and notes belong to the exporting group and are
+skipped.
+"""
+import csv
+from collections.abc import Iterable
+from typing import Any
+from uuid import UUID, uuid4
+
+import psycopg
+from sqlalchemy import select, text
+from sqlalchemy.exc import DataError, IntegrityError
+from sqlalchemy.orm import Session
+
+from models.group_member import GroupMember, GroupRole
+from models.study import Study
+from services.positions import POSITION_GAP
+from services.writes import commit_created
+
+IMPORTED_KINDS = ("session", "passage", "question")
+
+_REQUIRED_COLUMNS = {"entity", "id", "parent_id", "position", "title", "description", "text"}
+
+_STAGING_COLUMNS = (
+    "ordinal",
+    "entity",
+    "new_id",
+    "old_id",
+    "parent_id",
+    "position",
+    "title",
+    "description",
+    "book",
+    "chapter",
+    "start_verse",
+    "end_verse",
+    "version",
+    "text",
+)
+
+_CREATE_STAGING_SQL = """
+CREATE TEMPORARY TABLE study_import (
+    ordinal integer NOT NULL,
+    entity text NOT NULL,
+    new_id uuid NOT NULL,
+    old_id uuid NOT NULL,
+    parent_id uuid,
+    position integer,
+    title text,
+    description text,
+    book text,
+    chapter integer,
+    start_verse integer,
+    end_verse integer,
+    version text,
+    text text
+) ON COMMIT DROP
+"""
+
+# Positions are renumbered POSITION_GAP apart in archive order, which also
+# repairs archives with missing or duplicate positions.
+_INSERT_SESSIONS_SQL = """
+INSERT INTO study_sessions (id, study_id, title, description, position)
+SELECT new_id, :study_id, title, description,
+       row_number() OVER (ORDER BY position NULLS LAST, ordinal) * :gap
+FROM study_import
+WHERE entity = 'session'
+"""
+
+# Passages have no position; listings and exports order them by
+# (created_at, id), so created_at is spread a microsecond apart in archive
+# order instead of every row sharing the transaction's now().
+_INSERT_PASSAGES_SQL = """
+INSERT INTO study_passages (id, session_id, book, chapter, start_verse, end_verse, version, text, created_at)
+SELECT p.new_id, s.new_id, p.book, p.chapter, p.start_verse, p.end_verse, p.version, p.text,
+       now() + p.ordinal * interval '1 microsecond'
+FROM study_import p
+JOIN study_import s ON s.entity = 'session' AND s.old_id = p.parent_id
+WHERE p.entity = 'passage'
+"""
+
+_INSERT_QUESTIONS_SQL = """
+INSERT INTO study_questions (id, session_id, question, position)
+SELECT q.new_id, s.new_id, q.text,
+       row_number() OVER (PARTITION BY q.parent_id ORDER BY q.position NULLS LAST, q.ordinal) * :gap
+FROM study_import q
+JOIN study_import s ON s.entity = 'session' AND s.old_id = q.parent_id
+WHERE q.entity = 'question'
+"""
+
+# Passages and questions whose session is not in the archive. The inserts
+# join each row to its session and would otherwise drop these silently.
+_COUNT_ORPHANS_SQL = """
+SELECT count(*)
+FROM study_import c
+WHERE c.entity IN ('passage', 'question')
+  AND NOT EXISTS (SELECT 1 FROM study_import s WHERE s.entity = 'session' AND s.old_id = c.parent_id)
+"""
+
+
+def ensure_can_import(db: Session, group_id: UUID, user_sub: str) -> None:
+    """Raise forbidden unless `user_sub` leads the group; cheap enough to check before upload."""
+    is_leader = db.scalar(
+        select(GroupMember.id).where(
+            GroupMember.group_id == group_id,
+            GroupMember.user_sub == user_sub,
+            GroupMember.role == GroupRole.LEADER,
+        )
+    )
+    if is_leader is None:
+        raise ValueError("forbidden")
+
+
+def _optional_int(value: str | None) -> int | None:
+    return int(value) if value else None
+
+
+def _staging_row(ordinal: int, row: dict[str, Any]) -> tuple[Any, ...]:
+    return (
+        ordinal,
+        row["entity"],
+        uuid4(),
+        UUID(row["id"]),
+        UUID(row["parent_id"]) if row["parent_id"] else None,
+        _optional_int(row["position"]),
+        row["title"] or None,
+        row["description"] or None,
+        row.get("book") or None,
+        _optional_int(row.get("chapter")),
+        _optional_int(row.get("start_verse")),
+        _optional_int(row.get("end_verse")),
+        row.get("version") or None,
+        row["text"] or None,
+    )
+
+
+def _stage(db: Session, rows: Iterable[dict[str, Any]]) -> None:
+    driver = db.connection().connection.driver_connection
+    with driver.cursor() as cursor:
+        cursor.execute(_CREATE_STAGING_SQL)
+        with cursor.copy(f"COPY study_import ({', '.join(_STAGING_COLUMNS)}) FROM STDIN") as copy:
+            for ordinal, row in enumerate(rows):
+                if row["entity"] in IMPORTED_KINDS:
+                    copy.write_row(_staging_row(ordinal, row))
+        cursor.execute("CREATE INDEX ON study_import (old_id)")
+        cursor.execute("ANALYZE study_import")
+
+
+def import_study_archive(
+    db: Session,
+    group_id: UUID,
+    user_sub: str,
+    lines: Iterable[str],
+    title: str | None = None,
+) -> tuple[Study, dict[str, int]]:
+    """Create a study in `group_id` from a CSV archive; returns it and rows imported per table.
+
+    Everything happens in one transaction: an invalid archive, including one
+    with passages or questions outside any of its sessions, leaves nothing
+    behind and raises invalid_archive.
+    """
+    ensure_can_import(db, group_id, user_sub)
+    try:
+        reader = csv.DictReader(lines)
+        if not _REQUIRED_COLUMNS.issubset(reader.fieldnames or ()):
+            raise ValueError("invalid_archive")
+        first = next(reader, None)
+        if first is None or first["entity"] != "study":
+            raise ValueError("invalid_archive")
+
+        study = Study(
+            group_id=group_id,
+            title=title or first["title"],
+            description=first["description"] or None,
+            is_archived=False,
+        )
+        db.add(study)
+        db.flush()
+        _stage(db, reader)
+        if db.scalar(text(_COUNT_ORPHANS_SQL)):
+            raise ValueError("invalid_archive")
+        params = {"study_id": study.id, "gap": POSITION_GAP}
+        counts = {
+            "study_sessions": db.execute(text(_INSERT_SESSIONS_SQL), params).rowcount,
+            "study_passages": db.execute(text(_INSERT_PASSAGES_SQL), params).rowcount,
+            "study_questions": db.execute(text(_INSERT_QUESTIONS_SQL), params).rowcount,
+        }
+    except (ValueError, KeyError, csv.Error, psycopg.DataError, psycopg.IntegrityError, DataError, IntegrityError) as exc:
+        # ValueError covers bad UUIDs and numbers as well as undecodable text.
+        db.rollback()
+        raise ValueError("invalid_archive") from exc
+    commit_created(db, study)
+    return study, counts
@@ -1,12 +1,16 @@
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import delete, exists, select
 from sqlalchemy.orm import Session
 
 from models.group_member import GroupMember, GroupRole
 from models.study import Study
 from models.study_passage import StudyPassage
 from models.study_session import StudySession
+from services.counters_service import SCOPE_PASSAGE, clear_counters
+from services.fields import fetch_all, select_fields
+from services.versioning import versioned_update
+from services.writes import commit_created
 
 
 def _is_group_leader(db: Session, group_id: UUID, user_sub: str) -> bool:
@@ -27,11 +31,11 @@ def _get_study_for_session(db: Session, session_id: UUID) -> Study | None:
     return db.get(Study, session.study_id)
 
 
-def list_passages(db: Session, session_id: UUID) -> list[StudyPassage]:
-    return list(
-        db.scalars(
-            select(StudyPassage).where(StudyPassage.session_id == session_id)
-        )
+def list_passages(db: Session, session_id: UUID, fields: tuple[str, ...] | None = None) -> list[StudyPassage]:
+    return fetch_all(
+        db,
+        select_fields(StudyPassage, fields).where(StudyPassage.session_id == session_id),
+        fields,
     )
 
 
@@ -63,8 +67,7 @@ def create_passage(
         text=text,
     )
     db.add(passage)
-    db.commit()
-    db.refresh(passage)
+    commit_created(db, passage)
     return passage
 
 
@@ -80,7 +83,8 @@ def delete_passage(db: Session, passage_id: UUID, user_sub: str) -> None:
     if not _is_group_leader(db, study.group_id, user_sub):
         raise ValueError("forbidden")
 
-    db.delete(passage)
+    clear_counters(db, SCOPE_PASSAGE, passage.id)
+    db.execute(delete(StudyPassage).where(StudyPassage.id == passage.id))
     db.commit()
 
 
@@ -94,7 +98,29 @@ def update_passage(
     end_verse: int | None,
     version: str | None,
     text: str | None,
+    expected_version: int | None = None,
 ) -> StudyPassage:
+    fields = {
+        "book": book,
+        "chapter": chapter,
+        "start_verse": start_verse,
+        "end_verse": end_verse,
+        "version": version,
+        "text": text,
+    }
+    values = {key: value for key, value in fields.items() if value is not None}
+
+    is_leader = exists().where(
+        StudySession.id == StudyPassage.session_id,
+        Study.id == StudySession.study_id,
+        GroupMember.group_id == Study.group_id,
+        GroupMember.user_sub == user_sub,
+        GroupMember.role == GroupRole.LEADER,
+    )
+    passage = versioned_update(db, StudyPassage, passage_id, [is_leader], expected_version, values)
+    if passage is not None:
+        return passage
+
     passage = db.get(StudyPassage, passage_id)
     if not passage:
         raise ValueError("passage_not_found")
@@ -106,19 +132,4 @@ def update_passage(
     if not _is_group_leader(db, study.group_id, user_sub):
         raise ValueError("forbidden")
 
-    if book is not None:
-        passage.book = book
-    if chapter is not None:
-        passage.chapter = chapter
-    if start_verse is not None:
-        passage.start_verse = start_verse
-    if end_verse is not None:
-        passage.end_verse = end_verse
-    if version is not None:
-        passage.version = version
-    if text is not None:
-        passage.text = text
-
-    db.commit()
-    db.refresh(passage)
-    return passage
+    raise ValueError("version_conflict")
@@ -1,12 +1,16 @@
 from uuid import UUID
 
-from sqlalchemy import func, select
+from sqlalchemy import delete, select
 from sqlalchemy.orm import Session
 
 from models.group_member import GroupMember, GroupRole
 from models.study import Study
 from models.study_question import StudyQuestion
 from models.study_session import StudySession
+from services.counters_service import SCOPE_QUESTION, clear_counters
+from services.fields import fetch_all, select_fields
+from services.positions import append, lock_positions, move_after, reorder
+from services.writes import commit_created
 
 
 def _is_group_leader(db: Session, group_id: UUID, user_sub: str) -> bool:
@@ -27,13 +31,13 @@ def _get_study_for_session(db: Session, session_id: UUID) -> Study | None:
     return db.get(Study, session.study_id)
 
 
-def list_questions(db: Session, session_id: UUID) -> list[StudyQuestion]:
-    return list(
-        db.scalars(
-            select(StudyQuestion)
-            .where(StudyQuestion.session_id == session_id)
-            .order_by(StudyQuestion.position.asc(), StudyQuestion.created_at.asc())
-        )
+def list_questions(db: Session, session_id: UUID, fields: tuple[str, ...] | None = None) -> list[StudyQuestion]:
+    return fetch_all(
+        db,
+        select_fields(StudyQuestion, fields)
+        .where(StudyQuestion.session_id == session_id)
+        .order_by(StudyQuestion.position.asc(), StudyQuestion.created_at.asc()),
+        fields,
     )
 
 
@@ -52,22 +56,55 @@ def create_question(
         raise ValueError("forbidden")
 
     if position is None:
-        position = (
-            db.scalar(
-                select(func.coalesce(func.max(StudyQuestion.position), 0)).where(
-                    StudyQuestion.session_id == session_id
-                )
-            )
-            or 0
-        ) + 1
-
-    item = StudyQuestion(session_id=session_id, question=question, position=position)
-    db.add(item)
-    db.commit()
-    db.refresh(item)
+        item = append(db, StudyQuestion, StudyQuestion.session_id, session_id, session_id=session_id, question=question)
+    else:
+        item = StudyQuestion(session_id=session_id, question=question, position=position)
+        db.add(item)
+        lock_positions(db, StudyQuestion, StudyQuestion.session_id, session_id)
+    commit_created(db, item)
     return item
 
 
+def reorder_questions(
+    db: Session,
+    session_id: UUID,
+    user_sub: str,
+    updates: list[tuple[UUID, int]],
+) -> list[StudyQuestion]:
+    study = _get_study_for_session(db, session_id)
+    if not study:
+        raise ValueError("session_not_found")
+
+    if not _is_group_leader(db, study.group_id, user_sub):
+        raise ValueError("forbidden")
+
+    questions = reorder(db, StudyQuestion, StudyQuestion.session_id, session_id, updates)
+    commit_created(db, *questions)
+    return questions
+
+
+def move_question(
+    db: Session,
+    session_id: UUID,
+    question_id: UUID,
+    user_sub: str,
+    after_id: UUID | None,
+) -> StudyQuestion:
+    study = _get_study_for_session(db, session_id)
+    if not study:
+        raise ValueError("session_not_found")
+
+    if not _is_group_leader(db, study.group_id, user_sub):
+        raise ValueError("forbidden")
+
+    question = move_after(db, StudyQuestion, StudyQuestion.session_id, session_id, question_id, after_id)
+    if question is None:
+        db.rollback()
+        raise ValueError("question_not_found")
+    commit_created(db, question)
+    return question
+
+
 def delete_question(db: Session, question_id: UUID, user_sub: str) -> None:
     item = db.get(StudyQuestion, question_id)
     if not item:
@@ -80,7 +117,8 @@ def delete_question(db: Session, question_id: UUID, user_sub: str) -> None:
     if not _is_group_leader(db, study.group_id, user_sub):
         raise ValueError("forbidden")
 
-    db.delete(item)
+    clear_counters(db, SCOPE_QUESTION, item.id)
+    db.execute(delete(StudyQuestion).where(StudyQuestion.id == item.id))
     db.commit()
 
 
@@ -106,6 +144,7 @@ def update_question(
         item.question = question
     if position is not None:
         item.position = position
+        lock_positions(db, StudyQuestion, StudyQuestion.session_id, item.session_id)
 
     db.commit()
     db.refresh(item)
@@ -0,0 +1,157 @@
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import Select, bindparam, func, select, true, tuple_
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.orm import Session, aliased
+
+from models.study_session import StudySession
+from models.study_session_note import StudySessionNote
+from services.groups_service import list_group_ids
+from services.pagination import decode_time_cursor, encode_cursor
+
+# Everything the API returns; the deferred search_vector stays out of listings.
+_NOTE_COLUMNS = [column for column in StudySessionNote.__table__.columns if column.key != "search_vector"]
+
+
+def group_notes_query(
+    group_ids: list[UUID],
+    study_id: UUID | None,
+    session_id: UUID | None,
+    limit: int,
+    after: tuple[datetime, UUID] | None,
+) -> Select:
+    """Newest-first notes across `group_ids`, bounded by groups x limit rows.
+
+    Each group is read with its own LATERAL top-N scan of
+    ix_study_session_notes_group_created (or the study/session index when
+    filtered), and only those candidates are merged and sorted.
+    """
+    member_groups = select(
+        func.unnest(bindparam("group_ids", group_ids, type_=ARRAY(PG_UUID(as_uuid=True)))).label("group_id")
+    ).subquery("member_groups")
+
+    per_group = select(*_NOTE_COLUMNS).where(
+        StudySessionNote.group_id == member_groups.c.group_id,
+        StudySessionNote.deleted_at.is_(None),
+    )
+    if session_id is not None:
+        per_group = per_group.where(StudySessionNote.session_id == session_id)
+    if study_id is not None:
+        per_group = per_group.where(StudySessionNote.study_id == study_id)
+    if after is not None:
+        per_group = per_group.where(tuple_(StudySessionNote.created_at, StudySessionNote.id) < after)
+    per_group = (
+        per_group.order_by(StudySessionNote.created_at.desc(), StudySessionNote.id.desc())
+        .limit(limit)
+        .lateral("group_notes")
+    )
+
+    note = aliased(StudySessionNote, per_group)
+    return (
+        select(note)
+        .select_from(member_groups)
+        .join(per_group, true())
+        .order_by(note.created_at.desc(), note.id.desc())
+        .limit(limit)
+    )
+
+
+def list_group_notes(
+    db: Session,
+    user_sub: str,
+    study_id: UUID | None,
+    session_id: UUID | None,
+    limit: int,
+    cursor: str | None,
+) -> tuple[list[StudySessionNote], str | None]:
+    after = decode_time_cursor(cursor) if cursor is not None else None
+
+    group_ids = list_group_ids(db, user_sub)
+    if not group_ids:
+        return [], None
+
+    notes = list(db.scalars(group_notes_query(group_ids, study_id, session_id, limit + 1, after)))
+    next_cursor = None
+    if len(notes) > limit:
+        notes = notes[:limit]
+        next_cursor = encode_cursor(notes[-1].created_at, notes[-1].id)
+    return notes, next_cursor
+
+
+def list_study_notes(
+    db: Session,
+    group_id: UUID,
+    study_id: UUID,
+    session_id: UUID | None,
+    limit: int,
+    cursor: str | None,
+) -> tuple[list[StudySessionNote], str | None]:
+    """Newest-first notes of one group in one study, via ix_study_session_notes_study_created."""
+    query = select(StudySessionNote).where(
+        StudySessionNote.study_id == study_id,
+        StudySessionNote.group_id == group_id,
+        StudySessionNote.deleted_at.is_(None),
+    )
+    if session_id is not None:
+        query = query.where(StudySessionNote.session_id == session_id)
+    if cursor is not None:
+        query = query.where(
+            tuple_(StudySessionNote.created_at, StudySessionNote.id) < decode_time_cursor(cursor)
+        )
+    query = query.order_by(StudySessionNote.created_at.desc(), StudySessionNote.id.desc()).limit(limit + 1)
+
+    notes = list(db.scalars(query))
+    next_cursor = None
+    if len(notes) > limit:
+        notes = notes[:limit]
+        next_cursor = encode_cursor(notes[-1].created_at, notes[-1].id)
+    return notes, next_cursor
+
+
+def list_study_notes_by_session(
+    db: Session,
+    group_id: UUID,
+    study_id: UUID,
+    per_session: int,
+) -> list[dict[str, object]]:
+    """The latest `per_session` notes of a group for every session of a study.
+
+    Sessions come back in position order, each with a LATERAL top-N read of
+    ix_study_session_notes_session_created, so the cost is bounded by
+    sessions x per_session regardless of how many notes exist.
+    """
+    sessions = (
+        select(StudySession.id, StudySession.title, StudySession.position)
+        .where(StudySession.study_id == study_id)
+        .subquery("sessions")
+    )
+    per_session_notes = (
+        select(*_NOTE_COLUMNS)
+        .where(
+            StudySessionNote.session_id == sessions.c.id,
+            StudySessionNote.group_id == group_id,
+            StudySessionNote.deleted_at.is_(None),
+        )
+        .order_by(StudySessionNote.created_at.desc(), StudySessionNote.id.desc())
+        .limit(per_session)
+        .lateral("session_notes")
+    )
+    note = aliased(StudySessionNote, per_session_notes)
+    rows = db.execute(
+        select(sessions.c.id, sessions.c.title, sessions.c.position, note)
+        .select_from(sessions)
+        .outerjoin(per_session_notes, true())
+        .order_by(sessions.c.position.asc(), note.created_at.desc(), note.id.desc())
+    )
+
+    grouped: dict[UUID, dict[str, object]] = {}
+    for session_id, title, position, item in rows:
+        group = grouped.setdefault(
+            session_id,
+            {"session_id": session_id, "title": title, "position": position, "notes": []},
+        )
+        if item is not None:
+            group["notes"].append(item)
+    return list(grouped.values())
@@ -1,11 +1,15 @@
 from uuid import UUID
 
-from sqlalchemy import select, func
+from sqlalchemy import delete, select
 from sqlalchemy.orm import Session
 
 from models.group_member import GroupMember, GroupRole
 from models.study import Study
 from models.study_session import StudySession
+from services.counters_service import SCOPE_SESSION, clear_counters
+from services.fields import fetch_all, select_fields
+from services.positions import append, clear_position_counters, lock_positions, move_after, reorder
+from services.writes import commit_created
 
 
 def _is_group_leader(db: Session, group_id: UUID, user_sub: str) -> bool:
@@ -23,13 +27,13 @@ def _get_study(db: Session, study_id: UUID) -> Study | None:
     return db.get(Study, study_id)
 
 
-def list_sessions(db: Session, study_id: UUID) -> list[StudySession]:
-    return list(
-        db.scalars(
-            select(StudySession)
-            .where(StudySession.study_id == study_id)
-            .order_by(StudySession.position.asc(), StudySession.created_at.asc())
-        )
+def list_sessions(db: Session, study_id: UUID, fields: tuple[str, ...] | None = None) -> list[StudySession]:
+    return fetch_all(
+        db,
+        select_fields(StudySession, fields)
+        .where(StudySession.study_id == study_id)
+        .order_by(StudySession.position.asc(), StudySession.created_at.asc()),
+        fields,
     )
 
 
@@ -49,24 +53,25 @@ def create_session(
         raise ValueError("forbidden")
 
     if position is None:
-        position = (
-            db.scalar(
-                select(func.coalesce(func.max(StudySession.position), 0)).where(
-                    StudySession.study_id == study_id
-                )
-            )
-            or 0
-        ) + 1
-
-    session = StudySession(
-        study_id=study_id,
-        title=title,
-        description=description,
-        position=position,
-    )
-    db.add(session)
-    db.commit()
-    db.refresh(session)
+        session = append(
+            db,
+            StudySession,
+            StudySession.study_id,
+            study_id,
+            study_id=study_id,
+            title=title,
+            description=description,
+        )
+    else:
+        session = StudySession(
+            study_id=study_id,
+            title=title,
+            description=description,
+            position=position,
+        )
+        db.add(session)
+        lock_positions(db, StudySession, StudySession.study_id, study_id)
+    commit_created(db, session)
     return session
 
 
@@ -95,6 +100,7 @@ def update_session(
         session.description = description
     if position is not None:
         session.position = position
+        lock_positions(db, StudySession, StudySession.study_id, session.study_id)
 
     db.commit()
     db.refresh(session)
@@ -114,20 +120,34 @@ def reorder_sessions(
     if not _is_group_leader(db, study.group_id, user_sub):
         raise ValueError("forbidden")
 
-    sessions = list(
-        db.scalars(select(StudySession).where(StudySession.study_id == study_id))
-    )
-    session_map = {session.id: session for session in sessions}
+    sessions = reorder(db, StudySession, StudySession.study_id, study_id, updates)
+    commit_created(db, *sessions)
+    return sessions
 
-    for session_id, position in updates:
-        if session_id in session_map:
-            session_map[session_id].position = position
 
-    db.commit()
-    return list_sessions(db, study_id)
+def move_session(
+    db: Session,
+    study_id: UUID,
+    session_id: UUID,
+    user_sub: str,
+    after_id: UUID | None,
+) -> StudySession:
+    study = _get_study(db, study_id)
+    if not study:
+        raise ValueError("study_not_found")
 
+    if not _is_group_leader(db, study.group_id, user_sub):
+        raise ValueError("forbidden")
 
-def delete_session(db: Session, session_id: UUID, user_sub: str) -> None:
+    session = move_after(db, StudySession, StudySession.study_id, study_id, session_id, after_id)
+    if session is None:
+        db.rollback()
+        raise ValueError("session_not_found")
+    commit_created(db, session)
+    return session
+
+
+def get_deletable_session(db: Session, session_id: UUID, user_sub: str) -> StudySession:
     session = db.get(StudySession, session_id)
     if not session:
         raise ValueError("session_not_found")
@@ -138,6 +158,14 @@ def delete_session(db: Session, session_id: UUID, user_sub: str) -> None:
 
     if not _is_group_leader(db, study.group_id, user_sub):
         raise ValueError("forbidden")
+    return session
+
+
+def delete_session(db: Session, session_id: UUID, user_sub: str) -> None:
+    session = get_deletable_session(db, session_id, user_sub)
 
-    db.delete(session)
+    clear_counters(db, SCOPE_SESSION, session.id)
+    clear_position_counters(db, session.id)
+    # Descendants go through the ON DELETE CASCADE foreign keys.
+    db.execute(delete(StudySession).where(StudySession.id == session.id))
     db.commit()
@@ -0,0 +1,431 @@
+import os
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import delete, func, or_, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from models.group_member import GroupMember
+from models.study_passage import StudyPassage
+from models.study_passage_comment import StudyPassageComment
+from models.study_passage_like import StudyPassageLike
+from models.study_question import StudyQuestion
+from models.study_question_response import StudyQuestionResponse
+from models.study_session import StudySession
+from models.study_session_note import StudySessionNote
+from models.sync_tombstone import SyncTombstone
+from services.counters_service import (
+    KIND_COMMENTS,
+    KIND_LIKES,
+    KIND_NOTES,
+    KIND_RESPONSES,
+    SCOPE_PASSAGE,
+    SCOPE_QUESTION,
+    SCOPE_SESSION,
+    bump_counter,
+)
+from services.pagination import decode_cursor, encode_cursor
+from services.session_actions_service import ensure_group_session
+from services.soft_delete import response_thread, soft_delete
+from services.writes import commit_created
+
+# Tombstones are kept this long; clients that last synced earlier get a full snapshot.
+TOMBSTONE_RETENTION = timedelta(days=float(os.getenv("SYNC_TOMBSTONE_RETENTION_DAYS", "30")))
+# Deltas reach back this far before the token so rows committed by
+# transactions that were still open at the previous sync are not missed.
+# Clients upsert by id and row_version, so re-sent rows are harmless.
+SYNC_OVERLAP = timedelta(seconds=float(os.getenv("SYNC_OVERLAP_SECONDS", "30")))
+
+
+class _Entity:
+    def __init__(self, model: Any, text_column: str, parent_column: str, scope: str, kind: str) -> None:
+        self.model = model
+        self.text_column = text_column
+        self.parent_column = parent_column
+        self.scope = scope
+        self.kind = kind
+
+
+# Authored entities synced by id; likes are handled separately by passage.
+_ENTITIES = {
+    "note": _Entity(StudySessionNote, "note", "session_id", SCOPE_SESSION, KIND_NOTES),
+    "comment": _Entity(StudyPassageComment, "comment", "passage_id", SCOPE_PASSAGE, KIND_COMMENTS),
+    "response": _Entity(StudyQuestionResponse, "response", "question_id", SCOPE_QUESTION, KIND_RESPONSES),
+}
+
+
+def encode_sync_token(at: datetime) -> str:
+    return encode_cursor(at)
+
+
+def decode_sync_token(token: str) -> datetime:
+    try:
+        (at,) = decode_cursor(token, 1)
+        return datetime.fromisoformat(str(at))
+    except ValueError as exc:
+        raise ValueError("invalid_sync_token") from exc
+
+
+def _result(index: int, status: str, detail: str | None = None) -> dict[str, Any]:
+    return {"index": index, "status": status, "detail": detail}
+
+
+def sync_session(
+    db: Session,
+    session_id: UUID,
+    group_id: UUID,
+    user_sub: str,
+    since: str | None,
+    changes: list[dict[str, Any]],
+) -> dict[str, Any]:
+    """Apply an offline client's change log and return what changed since `since`.
+
+    Everything runs in one transaction. Conflict rules:
+
+    * changes apply in ``changed_at`` order; within an entity creates run
+      before updates and updates before deletes;
+    * creates use the client's id, so replaying a log is a no-op;
+    * updates must name the ``row_version`` they edited, otherwise the
+      server copy wins and the change is reported as a conflict;
+    * deletes win over concurrent edits and deleting a missing row succeeds;
+    * only the author may update or delete a row;
+    * for likes only the last change per passage counts.
+
+    The returned delta holds every row changed after the token (plus the rows
+    this log touched) and tombstones for rows deleted since.
+    """
+    session = db.get(StudySession, session_id)
+    if not session:
+        raise ValueError("session_not_found")
+
+    is_member = db.scalar(
+        select(GroupMember.id).where(GroupMember.group_id == group_id, GroupMember.user_sub == user_sub)
+    )
+    if is_member is None:
+        raise ValueError("forbidden")
+
+    now = db.scalar(select(func.now()))
+    since_at = decode_sync_token(since) if since else None
+    reset = since_at is not None and since_at < now - TOMBSTONE_RETENTION
+    if reset:
+        since_at = None
+
+    order = sorted(range(len(changes)), key=lambda i: changes[i]["changed_at"])
+    results: list[dict[str, Any] | None] = [None] * len(changes)
+    touched: dict[str, set[UUID]] = {entity: set() for entity in _ENTITIES}
+
+    group_session_id = ensure_group_session(db, group_id, session, create=bool(changes))
+
+    valid_passages, valid_questions, parents = _valid_parents(db, session_id, group_id, changes)
+    for index in order:
+        change = changes[index]
+        entity, action = change["entity"], change["action"]
+        if entity == "like":
+            if action == "update":
+                results[index] = _result(index, "invalid", "Likes cannot be updated")
+            elif change["passage_id"] is None:
+                results[index] = _result(index, "invalid", "passage_id is required")
+            elif action == "create" and change["passage_id"] not in valid_passages:
+                results[index] = _result(index, "not_found", "Passage not found")
+        elif change["id"] is None:
+            results[index] = _result(index, "invalid", "id is required")
+        elif action != "delete" and change["text"] is None:
+            results[index] = _result(index, "invalid", "text is required")
+        elif action == "create" and entity == "comment" and change["passage_id"] not in valid_passages:
+            results[index] = _result(index, "not_found", "Passage not found")
+        elif action == "create" and entity == "response":
+            if change["question_id"] not in valid_questions:
+                results[index] = _result(index, "not_found", "Question not found")
+            elif change["parent_response_id"] and parents.get(change["parent_response_id"]) != change["question_id"]:
+                results[index] = _result(index, "invalid", "Invalid parent response")
+
+    for name, entity in _ENTITIES.items():
+        pending = [i for i in order if results[i] is None and changes[i]["entity"] == name]
+        creates = [i for i in pending if changes[i]["action"] == "create"]
+        updates = [i for i in pending if changes[i]["action"] == "update"]
+        deletes = [i for i in pending if changes[i]["action"] == "delete"]
+        common = {"group_id": group_id, "group_session_id": group_session_id, "user_sub": user_sub}
+        if creates:
+            _apply_creates(db, entity, session, common, changes, creates, results)
+        if updates or deletes:
+            _apply_edits(db, entity, user_sub, changes, updates, deletes, results)
+        touched[name].update(changes[i]["id"] for i in pending)
+
+    likes = [i for i in order if results[i] is None and changes[i]["entity"] == "like"]
+    if likes:
+        _apply_likes(db, group_id, group_session_id, user_sub, changes, likes, results)
+
+    delta = _delta(db, group_session_id, since_at, touched)
+    commit_created(db, *delta["notes"], *delta["comments"], *delta["likes"], *delta["responses"])
+    return {"token": encode_sync_token(now), "reset": reset, "results": results, **delta}
+
+
+def _valid_parents(
+    db: Session,
+    session_id: UUID,
+    group_id: UUID,
+    changes: list[dict[str, Any]],
+) -> tuple[set[UUID], set[UUID], dict[UUID, UUID]]:
+    """Passages and questions of the session named by `changes`, and response parents by question."""
+    passage_ids = {c["passage_id"] for c in changes if c["passage_id"] is not None}
+    question_ids = {c["question_id"] for c in changes if c["question_id"] is not None}
+    parent_ids = {c["parent_response_id"] for c in changes if c["parent_response_id"] is not None}
+    passages: set[UUID] = set()
+    if passage_ids:
+        passages = set(
+            db.scalars(
+                select(StudyPassage.id).where(StudyPassage.session_id == session_id, StudyPassage.id.in_(passage_ids))
+            )
+        )
+    questions: set[UUID] = set()
+    if question_ids:
+        questions = set(
+            db.scalars(
+                select(StudyQuestion.id).where(
+                    StudyQuestion.session_id == session_id, StudyQuestion.id.in_(question_ids)
+                )
+            )
+        )
+    # A reply may answer a response created earlier in the same log.
+    parents = {
+        c["id"]: c["question_id"]
+        for c in changes
+        if c["entity"] == "response" and c["action"] == "create" and c["id"] in parent_ids
+    }
+    if parent_ids - parents.keys():
+        parents.update(
+            db.execute(
+                select(StudyQuestionResponse.id, StudyQuestionResponse.question_id).where(
+                    StudyQuestionResponse.id.in_(parent_ids - parents.keys()),
+                    StudyQuestionResponse.group_id == group_id,
+                    StudyQuestionResponse.deleted_at.is_(None),
+                )
+            ).all()
+        )
+    return passages, questions, parents
+
+
+def _apply_creates(
+    db: Session,
+    entity: _Entity,
+    session: StudySession,
+    common: dict[str, Any],
+    changes: list[dict[str, Any]],
+    indexes: list[int],
+    results: list[dict[str, Any] | None],
+) -> None:
+    rows = []
+    for i in indexes:
+        change = changes[i]
+        row = {**common, "id": change["id"], entity.text_column: change["text"], "row_version": 1}
+        if entity.model is StudySessionNote:
+            row.update(session_id=session.id, study_id=session.study_id)
+        elif entity.model is StudyPassageComment:
+            row.update(passage_id=change["passage_id"])
+        else:
+            row.update(question_id=change["question_id"], parent_response_id=change["parent_response_id"])
+        rows.append(row)
+
+    model = entity.model
+    parent = getattr(model, entity.parent_column)
+    # DO NOTHING covers replays of an earlier sync (same id) and a second
+    # reply to the same parent (uq_question_response).
+    inserted = dict(
+        db.execute(
+            insert(model).values(rows).on_conflict_do_nothing().returning(model.id, parent)
+        ).all()
+    )
+    missing = {changes[i]["id"] for i in indexes} - inserted.keys()
+    authors = {}
+    if missing:
+        authors = dict(db.execute(select(model.id, model.user_sub).where(model.id.in_(missing))).all())
+
+    for i in indexes:
+        item_id = changes[i]["id"]
+        if item_id in inserted or authors.get(item_id) == common["user_sub"]:
+            results[i] = _result(i, "applied")
+        else:
+            results[i] = _result(i, "conflict", "Conflicts with an existing row")
+    for parent_id, count in Counter(inserted.values()).items():
+        bump_counter(db, common["group_id"], entity.scope, parent_id, entity.kind, count)
+
+
+def _apply_edits(
+    db: Session,
+    entity: _Entity,
+    user_sub: str,
+    changes: list[dict[str, Any]],
+    updates: list[int],
+    deletes: list[int],
+    results: list[dict[str, Any] | None],
+) -> None:
+    model = entity.model
+    parent = getattr(model, entity.parent_column)
+    ids = {changes[i]["id"] for i in updates + deletes}
+    current = {
+        row.id: row
+        for row in db.execute(
+            select(model.id, model.user_sub, model.row_version, model.group_id, parent.label("parent_id")).where(
+                model.id.in_(ids), model.deleted_at.is_(None)
+            )
+        )
+    }
+    versions = {item_id: row.row_version for item_id, row in current.items()}
+
+    for i in updates:
+        item_id = changes[i]["id"]
+        row = current.get(item_id)
+        if row is None:
+            results[i] = _result(i, "not_found", "Deleted on the server")
+        elif row.user_sub != user_sub:
+            results[i] = _result(i, "forbidden", "Only the author can edit this row")
+        elif changes[i]["base_version"] != versions[item_id]:
+            results[i] = _result(i, "conflict", "Edited on the server since base_version")
+        else:
+            new_version = db.scalar(
+                update(model)
+                .where(model.id == item_id, model.row_version == versions[item_id], model.deleted_at.is_(None))
+                .values({entity.text_column: changes[i]["text"], "row_version": model.row_version + 1})
+                .returning(model.row_version)
+                .execution_options(synchronize_session=False)
+            )
+            if new_version is None:
+                results[i] = _result(i, "conflict", "Edited on the server since base_version")
+            else:
+                versions[item_id] = new_version
+                results[i] = _result(i, "applied")
+
+    doomed = set()
+    for i in deletes:
+        row = current.get(changes[i]["id"])
+        if row is not None and row.user_sub != user_sub:
+            results[i] = _result(i, "forbidden", "Only the author can delete this row")
+        else:
+            if row is not None:
+                doomed.add(row.id)
+            results[i] = _result(i, "applied")
+    if not doomed:
+        return
+
+    condition = model.id.in_(doomed)
+    if model is StudyQuestionResponse:
+        # Replies go with their parent.
+        condition = model.id.in_(response_thread(condition))
+    removed = soft_delete(db, model, parent, condition)
+    for (group_id, parent_id), count in removed.items():
+        bump_counter(db, group_id, entity.scope, parent_id, entity.kind, -count)
+
+
+def _apply_likes(
+    db: Session,
+    group_id: UUID,
+    group_session_id: UUID | None,
+    user_sub: str,
+    changes: list[dict[str, Any]],
+    indexes: list[int],
+    results: list[dict[str, Any] | None],
+) -> None:
+    final: dict[UUID, str] = {}
+    for i in indexes:
+        final[changes[i]["passage_id"]] = changes[i]["action"]
+        results[i] = _result(i, "applied")
+
+    liked = [passage_id for passage_id, action in final.items() if action == "create"]
+    unliked = [passage_id for passage_id, action in final.items() if action == "delete"]
+    if liked:
+        inserted = db.scalars(
+            insert(StudyPassageLike)
+            .values(
+                [
+                    {
+                        "id": uuid.uuid4(),
+                        "passage_id": passage_id,
+                        "group_id": group_id,
+                        "group_session_id": group_session_id,
+                        "user_sub": user_sub,
+                    }
+                    for passage_id in liked
+                ]
+            )
+            .on_conflict_do_nothing(constraint="uq_passage_like")
+            .returning(StudyPassageLike.passage_id)
+        ).all()
+        for passage_id in inserted:
+            bump_counter(db, group_id, SCOPE_PASSAGE, passage_id, KIND_LIKES, 1)
+    if unliked:
+        removed = db.scalars(
+            delete(StudyPassageLike)
+            .where(
+                StudyPassageLike.group_id == group_id,
+                StudyPassageLike.user_sub == user_sub,
+                StudyPassageLike.passage_id.in_(unliked),
+            )
+            .returning(StudyPassageLike.passage_id)
+            .execution_options(synchronize_session=False)
+        ).all()
+        for passage_id in removed:
+            bump_counter(db, group_id, SCOPE_PASSAGE, passage_id, KIND_LIKES, -1)
+
+
+def _delta(
+    db: Session,
+    group_session_id: UUID | None,
+    since_at: datetime | None,
+    touched: dict[str, set[UUID]],
+) -> dict[str, list[Any]]:
+    delta: dict[str, list[Any]] = {"notes": [], "comments": [], "likes": [], "responses": [], "deleted": []}
+    if group_session_id is None:
+        return delta
+    cutoff = since_at - SYNC_OVERLAP if since_at is not None else None
+
+    # Soft-deleted rows changed after the cutoff are reported like tombstones.
+    soft_deleted: list[dict[str, Any]] = []
+    for name, entity in _ENTITIES.items():
+        model = entity.model
+        query = select(model).where(model.group_session_id == group_session_id)
+        if cutoff is not None:
+            query = query.where(or_(model.updated_at > cutoff, model.id.in_(touched[name])))
+        else:
+            query = query.where(model.deleted_at.is_(None))
+        for row in db.scalars(query.order_by(model.updated_at, model.id)):
+            if row.deleted_at is None:
+                delta[f"{name}s"].append(row)
+            else:
+                soft_deleted.append({"entity": name, "id": row.id, "deleted_at": row.deleted_at})
+
+    likes = select(StudyPassageLike).where(StudyPassageLike.group_session_id == group_session_id)
+    if cutoff is not None:
+        likes = likes.where(StudyPassageLike.created_at > cutoff)
+    delta["likes"] = list(db.scalars(likes.order_by(StudyPassageLike.created_at, StudyPassageLike.id)))
+
+    if cutoff is not None:
+        delta["deleted"] = soft_deleted + [
+            {"entity": row.entity, "id": row.entity_id, "deleted_at": row.deleted_at}
+            for row in db.execute(
+                select(SyncTombstone.entity, SyncTombstone.entity_id, SyncTombstone.deleted_at)
+                .where(SyncTombstone.group_session_id == group_session_id, SyncTombstone.deleted_at > cutoff)
+                .order_by(SyncTombstone.deleted_at, SyncTombstone.id)
+            )
+        ]
+    return delta
+
+
+def purge_expired_tombstones(db: Session, batch_size: int = 1000) -> int:
+    """Delete tombstones past retention in batches small enough not to hold locks for long."""
+    purged = 0
+    while True:
+        batch = (
+            select(SyncTombstone.id)
+            .where(SyncTombstone.deleted_at < func.now() - TOMBSTONE_RETENTION)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        deleted = db.execute(delete(SyncTombstone).where(SyncTombstone.id.in_(batch))).rowcount
+        db.commit()
+        purged += deleted
+        if deleted < batch_size:
+            return purged
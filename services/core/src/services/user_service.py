@@ -1,6 +1,7 @@
 from sqlalchemy.orm import Session
 
 from models.user import User
+from services.writes import commit_created
 
 
 def get_user_by_cognito_sub(db: Session, cognito_sub: str) -> User | None:
@@ -12,8 +13,7 @@ def create_user(db: Session, cognito_sub: str, display_name: str) -> User:
     """Create a new user profile."""
     user = User(cognito_sub=cognito_sub, display_name=display_name)
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    commit_created(db, user)
     return user
 
 
@@ -0,0 +1,86 @@
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+
+def parse_if_match(header: str | None) -> int | None:
+    """Extract the expected row_version from an If-Match header.
+
+    Accepts `"3"`, `W/"3"` and a bare `3`; a missing header or `*` means the
+    update is unconditional.
+    """
+    if header is None:
+        return None
+    value = header.strip()
+    if value == "*":
+        return None
+    if value.startswith("W/"):
+        value = value[2:]
+    try:
+        return int(value.strip('"'))
+    except ValueError as exc:
+        raise ValueError("invalid_if_match") from exc
+
+
+def format_etag(row_version: int) -> str:
+    return f'"{row_version}"'
+
+
+def versioned_update(
+    db: Session,
+    model: Any,
+    item_id: UUID,
+    guards: list[Any],
+    expected_version: int | None,
+    values: dict[str, Any],
+) -> Any | None:
+    """Apply `values` with one UPDATE ... RETURNING and commit.
+
+    `guards` carry the authorization conditions, so the happy path needs no
+    pre-read and no refresh. Returns None (after rolling back) when no row
+    matched; the caller then works out whether that was a 404, 403 or 412.
+    """
+    conditions = [model.id == item_id, *guards]
+    if expected_version is not None:
+        conditions.append(model.row_version == expected_version)
+
+    item = db.scalar(
+        update(model)
+        .where(*conditions)
+        .values(**values, row_version=model.row_version + 1)
+        .returning(model)
+        .execution_options(synchronize_session=False)
+    )
+    if item is None:
+        db.rollback()
+        return None
+
+    # Detach before committing so the returned state is not expired and
+    # reloaded when the response is serialized.
+    db.expunge(item)
+    db.commit()
+    return item
+
+
+def update_authored(
+    db: Session,
+    model: Any,
+    item_id: UUID,
+    user_sub: str,
+    expected_version: int | None,
+    values: dict[str, Any],
+) -> Any:
+    """Versioned update of a live (not soft-deleted) row that only its author may change."""
+    guards = [model.user_sub == user_sub, model.deleted_at.is_(None)]
+    item = versioned_update(db, model, item_id, guards, expected_version, values)
+    if item is not None:
+        return item
+
+    existing = db.get(model, item_id)
+    if existing is None or existing.deleted_at is not None:
+        raise ValueError("not_found")
+    if existing.user_sub != user_sub:
+        raise ValueError("forbidden")
+    raise ValueError("version_conflict")
@@ -0,0 +1,17 @@
+from typing import Any
+
+from sqlalchemy.orm import Session
+
+
+def commit_created(db: Session, *items: Any) -> None:
+    """Insert pending `items` and commit without reading them back.
+
+    The flush sends each row as one INSERT ... RETURNING (mappers use
+    eager_defaults), so server defaults are already loaded. Detaching the rows
+    before the commit keeps them from being expired, which would otherwise
+    cost a SELECT per row when the response is serialized.
+    """
+    db.flush()
+    for item in items:
+        db.expunge(item)
+    db.commit()